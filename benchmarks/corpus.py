@@ -0,0 +1,154 @@
+import json
+import os
+import random
+
+from docx import Document as DocxWriter
+
+# Vocabulario base: mezcla de palabras con sinónimos en WordNet (para que la
+# expansión de consultas trabaje de verdad) y relleno genérico.
+VOCABULARY = (
+    "car automobile vehicle machine engine speed track driver race fast "
+    "dog canine hound pooch puppy animal pet shelter loyal companion "
+    "computer processor data server language code network quantum memory "
+    "happy glad joy bliss feeling health mind painting artist soul "
+    "bank river water money loan economy crisis recession finance market "
+    "goose bird winter south flying child school sandbox playing running "
+    "report study city traffic bus planning science journal patient rest "
+    "house garden tree flower light night morning year people world "
+    "government company system program problem question number group "
+    "country state family student teacher book story history music film"
+).split()
+
+FORMATS = ("txt", "html", "pdf", "docx")
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """'txt=0.4,html=0.3,pdf=0.2,docx=0.1' -> {'txt': 0.4, ...}"""
+    weights: dict[str, float] = {}
+    for part in mix.split(","):
+        fmt, _, value = part.partition("=")
+        fmt = fmt.strip().lower()
+        if fmt not in FORMATS:
+            raise ValueError(f"Formato no soportado en la mezcla: {fmt}")
+        weights[fmt] = float(value or 1)
+    return weights
+
+
+def zipf_weights(size: int) -> list[float]:
+    """Frecuencias tipo Zipf: la palabra de rango r aparece ~1/r veces."""
+    return [1.0 / rank for rank in range(1, size + 1)]
+
+
+def random_text(rng: random.Random, words: int) -> str:
+    tokens = rng.choices(VOCABULARY, weights=zipf_weights(len(VOCABULARY)), k=words)
+    # Frases de ~12 palabras para que los extractores vean texto realista
+    sentences = [" ".join(tokens[i:i + 12]).capitalize() + "." for i in range(0, len(tokens), 12)]
+    return " ".join(sentences)
+
+
+def _write_txt(path: str, title: str, text: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"{title}\n\n{text}")
+
+
+def _write_html(path: str, title: str, text: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            f"<html><head><title>{title}</title></head>"
+            f"<body><h1>{title}</h1><p>{text}</p></body></html>"
+        )
+
+
+def _write_docx(path: str, title: str, text: str) -> None:
+    doc = DocxWriter()
+    doc.add_heading(title, level=1)
+    doc.add_paragraph(text)
+    doc.save(path)
+
+
+def _write_pdf(path: str, title: str, text: str) -> None:
+    """
+    PDF mínimo de una página con fuente Helvetica estándar, escrito a mano
+    para no depender de librerías de generación de PDF.
+    """
+    words = f"{title} {text}".split()
+    lines = [" ".join(words[i:i + 14]) for i in range(0, len(words), 14)][:60]
+
+    def escape(s: str) -> str:
+        return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    stream = "BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(f"({escape(line)}) Tj T*" for line in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+
+    xref_at = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode("latin-1")
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+_WRITERS = {"txt": _write_txt, "html": _write_html, "pdf": _write_pdf, "docx": _write_docx}
+
+
+def generate_corpus(
+    target_dir: str,
+    num_docs: int,
+    mix: dict[str, float],
+    words_per_doc: int = 300,
+    seed: int = 42,
+) -> dict:
+    """
+    Genera `num_docs` ficheros sintéticos en `target_dir`.
+
+    Es determinista para una misma semilla y se reutiliza si ya existe un
+    corpus con los mismos parámetros (ver manifest.json).
+    """
+    manifest = {"num_docs": num_docs, "mix": mix, "words_per_doc": words_per_doc, "seed": seed}
+    manifest_path = os.path.join(target_dir, "manifest.json")
+
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            if json.load(f) == manifest:
+                return manifest
+
+    os.makedirs(target_dir, exist_ok=True)
+    rng = random.Random(seed)
+    formats = list(mix)
+    weights = [mix[fmt] for fmt in formats]
+
+    for i in range(num_docs):
+        fmt = rng.choices(formats, weights=weights)[0]
+        title = " ".join(rng.sample(VOCABULARY, 3)).title()
+        # Longitud variable (±50%) para que la normalización BM25 tenga efecto
+        words = max(20, int(words_per_doc * rng.uniform(0.5, 1.5)))
+        _WRITERS[fmt](os.path.join(target_dir, f"doc_{i:07d}.{fmt}"), title, random_text(rng, words))
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+def sample_queries(num_queries: int, seed: int = 7, max_words: int = 3) -> list[str]:
+    """Consultas de 1-3 palabras con la misma distribución Zipf del corpus."""
+    rng = random.Random(seed)
+    weights = zipf_weights(len(VOCABULARY))
+    return [
+        " ".join(rng.choices(VOCABULARY, weights=weights, k=rng.randint(1, max_words)))
+        for _ in range(num_queries)
+    ]
@@ -0,0 +1,286 @@
+import argparse
+import datetime
+import glob
+import hashlib
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+# --- CONFIGURACIÓN DE RUTAS ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from whoosh.index import exists_in
+
+from benchmarks.relevance import evaluate_run, load_qrels, load_queries
+from benchmarks.run_benchmarks import git_revision, percentile_summary, quiet
+from src.core.models import ExpandedQuery
+from src.domain_nlp.pipeline import ExpansionMode, MultilingualPipeline, NLPPipeline
+from src.infrastructure.search_engine.adapter import WhooshAdapter
+from src.infrastructure.search_engine.language import LanguageDetector
+from src.infrastructure.search_engine.reader import WhooshReader
+from src.services.search_service import SearchService
+
+DEFAULT_INDEX_DIR = os.path.join(project_root, "data", "index_storage")
+DEFAULT_CACHE_DIR = os.path.join(project_root, "data", "benchmarks", "eval_cache")
+JUDGMENTS_DIR = os.path.join(current_dir, "judgments")
+
+
+# Además del código, los ficheros de datos que cargan los paquetes (ej: el
+# léxico de src/domain_nlp/pos_lexicon.json)
+_FINGERPRINT_PATTERNS = ("*.py", "*.json")
+
+
+def code_fingerprint(*packages: str) -> str:
+    """
+    Huella del código y los datos de `src/<package>`: si cambian, lo
+    cacheado deja de valer.
+    """
+    digest = hashlib.sha1()
+    for package in packages:
+        package_dir = os.path.join(project_root, "src", package)
+        paths = {path for pattern in _FINGERPRINT_PATTERNS for path in glob.glob(os.path.join(package_dir, pattern))}
+        for path in sorted(paths):
+            # También el nombre: renombrar o añadir un fichero cambia la huella
+            digest.update(os.path.relpath(path, package_dir).encode("utf-8"))
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def cache_key(**params: Any) -> str:
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class JsonCache:
+    """Diccionario persistido en un fichero JSON (se escribe entero al guardar)."""
+
+    def __init__(self, path: str, enabled: bool = True):
+        self.path = path
+        self.entries: dict[str, Any] = {}
+        if enabled and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+class CachingPipeline:
+    """
+    Envuelve el pipeline NLP: las consultas con expansión conocida no pasan
+    por NLTK. Las nuevas se miden y quedan en `fresh` para guardarlas.
+    """
+
+    def __init__(self, pipeline: NLPPipeline | MultilingualPipeline):
+        self.pipeline = pipeline
+        self.expansion_mode = pipeline.expansion_mode
+        self.known: dict[str, ExpandedQuery] = {}
+        self.fresh: dict[str, dict] = {}
+
+    def remember(self, text: str, entry: dict) -> None:
+        self.known[text] = ExpandedQuery(
+            original_text=text, expanded_terms=entry["terms"], language=entry["language"]
+        )
+
+    def process(self, raw_query: str) -> ExpandedQuery:
+        query = self.known.get(raw_query)
+        if query is not None:
+            return query
+
+        started = time.perf_counter()
+        query = self.pipeline.process(raw_query)
+        self.fresh[raw_query] = {
+            "terms": query.expanded_terms,
+            "language": query.language,
+            "seconds": time.perf_counter() - started,
+        }
+        return query
+
+    def without_expansion(self) -> NLPPipeline | MultilingualPipeline:
+        return self.pipeline.without_expansion()
+
+
+def build_pipeline(expansion_mode: str, multilingual: bool) -> NLPPipeline | MultilingualPipeline:
+    if multilingual:
+        return MultilingualPipeline(LanguageDetector(min_hits=1), expansion_mode=expansion_mode)
+    return NLPPipeline(expansion_mode=expansion_mode)
+
+
+# --- Proceso de trabajo: un SearchService por proceso ---
+_service: SearchService | None = None
+_pipeline: CachingPipeline | None = None
+
+
+def _init_worker(index_dir: str, expansion_mode: str, multilingual: bool, depth: int) -> None:
+    global _service, _pipeline
+    _pipeline = CachingPipeline(build_pipeline(expansion_mode, multilingual))
+    reader = WhooshReader(WhooshAdapter(index_dir), limit=depth, snippets=False)
+    _service = SearchService(reader, _pipeline)  # type: ignore[arg-type]
+
+
+def _run_query(task: tuple[str, str, dict | None]) -> dict:
+    qid, text, expansion = task
+    assert _service is not None and _pipeline is not None
+    if expansion is not None:
+        _pipeline.remember(text, expansion)
+
+    with quiet():
+        started = time.perf_counter()
+        results = _service.execute_search(text)
+        elapsed = time.perf_counter() - started
+
+    fresh = _pipeline.fresh.pop(text, None)
+    if fresh is not None:
+        _pipeline.remember(text, fresh)
+    nlp_seconds = fresh["seconds"] if fresh else 0.0
+    return {
+        "qid": qid,
+        "text": text,
+        "paths": [r.path for r in results],
+        "search_seconds": max(elapsed - nlp_seconds, 0.0),
+        "expansion": fresh,
+    }
+
+
+def evaluate_config(
+    name: str,
+    queries: dict[str, str],
+    qrels: dict[str, dict[str, int]],
+    args: argparse.Namespace,
+    index_generation: int,
+) -> dict:
+    """
+    Ejecuta (o recupera de la caché) todas las consultas con una
+    configuración y calcula sus métricas de relevancia y latencia.
+    """
+    use_cache = not args.refresh
+    nlp_key = cache_key(mode=name, multilingual=args.multilingual, code=code_fingerprint("domain_nlp"))
+    run_key = cache_key(
+        nlp=nlp_key,
+        code=code_fingerprint("infrastructure/search_engine", "services"),
+        index=os.path.abspath(args.index_dir),
+        generation=index_generation,
+        depth=args.depth,
+    )
+    expansions = JsonCache(os.path.join(args.cache_dir, "expansions", f"{name}_{nlp_key}.json"), use_cache)
+    runs = JsonCache(os.path.join(args.cache_dir, "runs", f"{name}_{run_key}.json"), use_cache)
+
+    pending = [
+        (qid, text, expansions.entries.get(text))
+        for qid, text in queries.items()
+        if runs.entries.get(qid, {}).get("text") != text
+    ]
+    cached_runs = len(queries) - len(pending)
+    cached_expansions = sum(1 for _, _, expansion in pending if expansion is not None)
+    print(f"🔍 [{name}] {len(pending)} consultas por ejecutar "
+          f"({cached_runs} en caché de runs, {cached_expansions} con expansión en caché)...")
+
+    started = time.perf_counter()
+    if pending:
+        chunksize = max(1, len(pending) // (args.workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=_init_worker,
+            initargs=(args.index_dir, name, args.multilingual, args.depth),
+        ) as pool:
+            for row in pool.map(_run_query, pending, chunksize=chunksize):
+                if row["expansion"] is not None:
+                    expansions.entries[row["text"]] = row["expansion"]
+                runs.entries[row["qid"]] = {
+                    "text": row["text"],
+                    "paths": row["paths"],
+                    "search_seconds": row["search_seconds"],
+                }
+        expansions.save()
+        runs.save()
+    wall = time.perf_counter() - started
+
+    run = {qid: runs.entries[qid]["paths"] for qid in queries}
+    nlp_seconds = [expansions.entries.get(text, {}).get("seconds", 0.0) for text in queries.values()]
+    search_seconds = [runs.entries[qid]["search_seconds"] for qid in queries]
+    terms = [len(expansions.entries.get(text, {}).get("terms", [])) for text in queries.values()]
+
+    return {
+        "config": name,
+        **evaluate_run(run, qrels, k=args.k),
+        # Latencia de cada consulta = NLP (medido al expandirla) + búsqueda
+        **percentile_summary([n + s for n, s in zip(nlp_seconds, search_seconds)]),
+        "mean_nlp_ms": round(statistics.fmean(nlp_seconds) * 1000, 3) if queries else 0.0,
+        "mean_search_ms": round(statistics.fmean(search_seconds) * 1000, 3) if queries else 0.0,
+        "mean_expanded_terms": round(statistics.fmean(terms), 2) if terms else 0.0,
+        "executed_queries": len(pending),
+        "wall_seconds": round(wall, 3),
+    }
+
+
+def print_table(rows: list[dict], k: int) -> None:
+    columns = [f"ndcg@{k}", "map", f"recall@{k}", "p50_ms", "p95_ms", "mean_expanded_terms"]
+    print("\n" + f"{'config':<10}" + "".join(f"{c:>22}" for c in columns))
+    base = rows[0]
+    for row in rows:
+        cells = []
+        for column in columns:
+            value = row[column]
+            delta = value - base[column]
+            cells.append(f"{value:>12.4f}" + (f" ({delta:+.4f})" if row is not base else " " * 10))
+        print(f"{row['config']:<10}" + "".join(cells))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Evaluación de relevancia por configuración del pipeline.")
+    parser.add_argument("--queries", default=os.path.join(JUDGMENTS_DIR, "seed_queries.tsv"),
+                        help="Consultas en TSV (<id>\\t<texto>).")
+    parser.add_argument("--qrels", default=os.path.join(JUDGMENTS_DIR, "seed_qrels.txt"),
+                        help="Juicios de relevancia en formato TREC.")
+    parser.add_argument("--index-dir", default=DEFAULT_INDEX_DIR)
+    parser.add_argument("--configs", nargs="+", default=["none", "light", "full"],
+                        choices=[mode.value for mode in ExpansionMode],
+                        help="Modos de expansión a comparar (el primero es la referencia).")
+    parser.add_argument("--multilingual", action="store_true", help="Usar MultilingualPipeline.")
+    parser.add_argument("--k", type=int, default=10, help="Corte de nDCG y recall.")
+    parser.add_argument("--depth", type=int, default=100, help="Resultados recuperados por consulta (MAP).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--refresh", action="store_true", help="Ignorar las cachés y volver a ejecutar todo.")
+    parser.add_argument("--output", help="Fichero JSON de resultados.")
+    args = parser.parse_args()
+
+    if not exists_in(args.index_dir):
+        print(f"❌ No hay índice en {args.index_dir} (ejecuta antes seed_index.py o la indexación).")
+        return 1
+    generation = WhooshAdapter(args.index_dir).get_index().latest_generation()
+
+    queries = load_queries(args.queries)
+    qrels = load_qrels(args.qrels)
+    print(f"📋 {len(queries)} consultas, {sum(len(j) for j in qrels.values())} juicios, "
+          f"índice en generación {generation}.")
+
+    rows = [evaluate_config(name, queries, qrels, args, generation) for name in args.configs]
+    print_table(rows, args.k)
+
+    if args.output:
+        result = {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "revision": git_revision(),
+            "params": {k: v for k, v in vars(args).items() if k != "output"},
+            "configs": rows,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"📝 Resultados guardados en {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+# --- CONFIGURACIÓN DE RUTAS ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from benchmarks.corpus import sample_queries
+from benchmarks.run_benchmarks import DEFAULT_WORKDIR, quiet
+from src.core.models import Document, ExpandedQuery, SearchResult
+from src.infrastructure.search_engine.adapter import WhooshAdapter
+from src.infrastructure.search_engine.reader import WhooshReader
+
+
+# Modelos tal y como eran antes (dataclasses con __dict__ por instancia)
+@dataclass
+class LegacyDocument:
+    title: str
+    content: str
+    path: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class LegacySearchResult:
+    title: str
+    path: str
+    score: float
+    snippet: str = ""
+    page: int | None = None
+    offset: int | None = None
+
+
+def measure(build: Callable[[], list]) -> tuple[int, float]:
+    """Memoria retenida (bytes) por los objetos que crea `build` y su duración."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    objects = build()
+    elapsed = time.perf_counter() - started
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return retained, elapsed
+
+
+def compare(name: str, count: int, legacy: Callable[[int], Any], compact: Callable[[int], Any]) -> dict:
+    # Los textos son compartidos: se mide el coste de los objetos, no del corpus
+    legacy_bytes, legacy_s = measure(lambda: [legacy(i) for i in range(count)])
+    compact_bytes, compact_s = measure(lambda: [compact(i) for i in range(count)])
+    return {
+        "model": name,
+        "count": count,
+        "legacy_mb": round(legacy_bytes / 2**20, 1),
+        "compact_mb": round(compact_bytes / 2**20, 1),
+        "bytes_per_object_saved": round((legacy_bytes - compact_bytes) / count, 1),
+        "reduction": round(1 - compact_bytes / legacy_bytes, 3) if legacy_bytes else 0.0,
+        "legacy_build_s": round(legacy_s, 3),
+        "compact_build_s": round(compact_s, 3),
+    }
+
+
+def bench_models(count: int) -> list[dict]:
+    title, content, path, snippet = "informe", "texto " * 50, "docs/informe.txt", "...texto..."
+    return [
+        compare(
+            "Document", count,
+            lambda i: LegacyDocument(title, content, path, {"type": ".txt"}),
+            lambda i: Document(title, content, path, {"type": ".txt"}),
+        ),
+        compare(
+            "SearchResult", count,
+            lambda i: LegacySearchResult(title, path, float(i), snippet),
+            lambda i: SearchResult(title, path, float(i), snippet),
+        ),
+    ]
+
+
+def bench_reader(index_dir: str, queries: list[str]) -> list[dict]:
+    """Pico de memoria y latencia por consulta: con snippets y solo metadatos."""
+    adapter = WhooshAdapter(index_dir)
+    rows = []
+    for snippets in (True, False):
+        reader = WhooshReader(adapter, snippets=snippets)
+        peaks = []
+        started = time.perf_counter()
+        with quiet():
+            for query in queries:
+                tracemalloc.start()
+                reader.search(ExpandedQuery(original_text=query, expanded_terms=query.split()))
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+        elapsed = time.perf_counter() - started
+        rows.append({
+            "mode": "snippets" if snippets else "metadata_only",
+            "queries": len(queries),
+            "mean_peak_kb": round(sum(peaks) / len(peaks) / 1024, 1),
+            "mean_ms": round(elapsed / len(queries) * 1000, 3),
+        })
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de memoria de los modelos y del lector.")
+    parser.add_argument("--count", type=int, default=1_000_000, help="Objetos simultáneos en memoria.")
+    parser.add_argument("--index-dir", default=os.path.join(DEFAULT_WORKDIR, "index"),
+                        help="Índice generado por run_benchmarks.py (se omite si no existe).")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--output", help="Fichero JSON de resultados.")
+    args = parser.parse_args()
+
+    print(f"🧮 Midiendo {args.count} objetos por modelo (tracemalloc)...")
+    result: dict = {"models": bench_models(args.count)}
+    for row in result["models"]:
+        print(f"   {row}")
+
+    if os.path.isdir(args.index_dir):
+        print(f"🔍 Midiendo el lector sobre {args.index_dir}...")
+        result["reader"] = bench_reader(args.index_dir, sample_queries(args.queries))
+        for row in result["reader"]:
+            print(f"   {row}")
+    else:
+        print(f"ℹ️  Sin índice en {args.index_dir}: ejecuta antes run_benchmarks.py para medir el lector.")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"📝 Resultados guardados en {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
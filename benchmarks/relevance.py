@@ -0,0 +1,84 @@
+import math
+import statistics
+
+# Juicios de relevancia: {id_consulta: {path: grado}}; grado 0 = no relevante
+Qrels = dict[str, dict[str, int]]
+
+
+def load_queries(path: str) -> dict[str, str]:
+    """Consultas en TSV: `<id>\\t<texto>` por línea (las líneas con # se ignoran)."""
+    queries: dict[str, str] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            qid, _, text = line.rstrip("\n").partition("\t")
+            queries[qid.strip()] = text.strip()
+    return queries
+
+
+def load_qrels(path: str) -> Qrels:
+    """Juicios en formato TREC: `<id> <iter> <path> <grado>` por línea."""
+    qrels: Qrels = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) != 4 or line.startswith("#"):
+                continue
+            qid, _, doc, grade = parts
+            qrels.setdefault(qid, {})[doc] = int(grade)
+    return qrels
+
+
+def dcg(gains: list[int]) -> float:
+    return sum(gain / math.log2(rank + 2) for rank, gain in enumerate(gains))
+
+
+def ndcg_at_k(ranking: list[str], judgments: dict[str, int], k: int) -> float:
+    """nDCG@k con ganancia lineal (el grado del juicio) y descuento log2."""
+    ideal = dcg(sorted(judgments.values(), reverse=True)[:k])
+    if ideal == 0:
+        return 0.0
+    return dcg([judgments.get(doc, 0) for doc in ranking[:k]]) / ideal
+
+
+def average_precision(ranking: list[str], judgments: dict[str, int]) -> float:
+    """AP sobre todo el ranking devuelto; los relevantes no recuperados cuentan como fallo."""
+    relevant = sum(1 for grade in judgments.values() if grade > 0)
+    if relevant == 0:
+        return 0.0
+
+    hits = 0
+    precision_sum = 0.0
+    for rank, doc in enumerate(ranking, start=1):
+        if judgments.get(doc, 0) > 0:
+            hits += 1
+            precision_sum += hits / rank
+    return precision_sum / relevant
+
+
+def recall_at_k(ranking: list[str], judgments: dict[str, int], k: int) -> float:
+    relevant = {doc for doc, grade in judgments.items() if grade > 0}
+    if not relevant:
+        return 0.0
+    return len(relevant.intersection(ranking[:k])) / len(relevant)
+
+
+def evaluate_run(run: dict[str, list[str]], qrels: Qrels, k: int = 10) -> dict[str, float]:
+    """
+    Media de las métricas sobre las consultas con algún relevante. Las
+    consultas sin resultados en `run` cuentan con ranking vacío.
+    """
+    judged = [qid for qid, judgments in qrels.items() if any(g > 0 for g in judgments.values())]
+    if not judged:
+        return {f"ndcg@{k}": 0.0, "map": 0.0, f"recall@{k}": 0.0, "judged_queries": 0}
+
+    def mean(metric) -> float:
+        return round(statistics.fmean(metric(run.get(qid, []), qrels[qid]) for qid in judged), 4)
+
+    return {
+        f"ndcg@{k}": mean(lambda ranking, j: ndcg_at_k(ranking, j, k)),
+        "map": mean(average_precision),
+        f"recall@{k}": mean(lambda ranking, j: recall_at_k(ranking, j, k)),
+        "judged_queries": len(judged),
+    }
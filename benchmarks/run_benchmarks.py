@@ -0,0 +1,243 @@
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# --- CONFIGURACIÓN DE RUTAS ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from benchmarks.corpus import generate_corpus, parse_mix, sample_queries
+from src.domain_nlp.pipeline import NLPPipeline
+from src.infrastructure.fs.loader import FileDocumentLoader
+from src.infrastructure.search_engine.adapter import WhooshAdapter
+from src.infrastructure.search_engine.reader import WhooshReader
+from src.infrastructure.search_engine.writer import WhooshWriter
+from src.services.search_service import SearchService
+
+DEFAULT_WORKDIR = os.path.join(project_root, "data", "benchmarks")
+DEFAULT_RESULTS_DIR = os.path.join(current_dir, "results")
+
+# Métricas comparadas con la línea base: (sección, clave, True si "más alto es mejor")
+TRACKED_METRICS = [
+    ("ingest", "load_docs_per_sec", True),
+    ("ingest", "index_docs_per_sec", True),
+    ("ingest", "total_docs_per_sec", True),
+    ("query", "qps", True),
+    ("query", "p50_ms", False),
+    ("query", "p95_ms", False),
+    ("query", "p99_ms", False),
+]
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silencia los print de depuración del código de la aplicación."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def percentile_summary(latencies: list[float]) -> dict[str, float]:
+    if len(latencies) < 2:
+        only = latencies[0] * 1000 if latencies else 0.0
+        return {"p50_ms": only, "p95_ms": only, "p99_ms": only, "mean_ms": only}
+
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+    }
+
+
+def bench_ingestion(docs_dir: str, index_dir: str, batch_size: int, stream_batch: int) -> dict:
+    """
+    Mide la ingesta en streaming, como IndexingService: los documentos se
+    extraen de uno en uno y se escriben en tandas de `stream_batch`, así que
+    la memoria no crece con el tamaño del corpus. La extracción y la
+    escritura se cronometran por separado.
+    """
+    if os.path.exists(index_dir):
+        shutil.rmtree(index_dir)
+
+    adapter = WhooshAdapter(index_dir)
+    writer = WhooshWriter(adapter, batch_size=batch_size)
+    loader = FileDocumentLoader(docs_dir)
+
+    load_seconds = index_seconds = 0.0
+    count = 0
+    formats: dict[str, int] = {}
+
+    def write(batch: list) -> float:
+        started = time.perf_counter()
+        writer.add_documents(batch)
+        return time.perf_counter() - started
+
+    with quiet():
+        batch = []
+        documents = loader.iter_documents()
+        while True:
+            t0 = time.perf_counter()
+            doc = next(documents, None)
+            load_seconds += time.perf_counter() - t0
+            if doc is None:
+                break
+
+            count += 1
+            ext = doc.metadata.get("type", "?")
+            formats[ext] = formats.get(ext, 0) + 1
+            batch.append(doc)
+            if len(batch) >= stream_batch:
+                index_seconds += write(batch)
+                batch = []
+
+        if batch:
+            index_seconds += write(batch)
+        t0 = time.perf_counter()
+        writer.commit()
+        index_seconds += time.perf_counter() - t0
+
+    total_seconds = load_seconds + index_seconds
+    return {
+        "docs": count,
+        "formats": formats,
+        "load_seconds": round(load_seconds, 3),
+        "index_seconds": round(index_seconds, 3),
+        "load_docs_per_sec": round(count / load_seconds, 2) if load_seconds else 0.0,
+        "index_docs_per_sec": round(count / index_seconds, 2) if index_seconds else 0.0,
+        "total_docs_per_sec": round(count / total_seconds, 2) if total_seconds else 0.0,
+    }
+
+
+def bench_queries(index_dir: str, queries: list[str], concurrency: int, expansion_mode: str) -> dict:
+    adapter = WhooshAdapter(index_dir)
+    service = SearchService(WhooshReader(adapter), NLPPipeline(expansion_mode=expansion_mode))
+
+    def timed(query: str) -> tuple[float, int]:
+        start = time.perf_counter()
+        results = service.execute_search(query)
+        return time.perf_counter() - start, len(results)
+
+    with quiet():
+        # Calentamiento: carga perezosa de corpus NLTK y cachés del índice
+        for query in queries[: min(20, len(queries))]:
+            service.execute_search(query)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            start = time.perf_counter()
+            measurements = list(pool.map(timed, queries))
+            wall = time.perf_counter() - start
+
+    latencies = [lat for lat, _ in measurements]
+    return {
+        "queries": len(queries),
+        "concurrency": concurrency,
+        "expansion_mode": expansion_mode,
+        "wall_seconds": round(wall, 3),
+        "qps": round(len(queries) / wall, 2) if wall else 0.0,
+        "mean_hits": round(statistics.fmean(hits for _, hits in measurements), 2) if measurements else 0.0,
+        **percentile_summary(latencies),
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=project_root, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Lista de regresiones que superan la tolerancia relativa."""
+    regressions = []
+    for section, key, higher_is_better in TRACKED_METRICS:
+        old = baseline.get(section, {}).get(key)
+        new = current.get(section, {}).get(key)
+        if not old or new is None:
+            continue
+
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+        if worse > tolerance:
+            regressions.append(f"{section}.{key}: {old} -> {new} ({change:+.1%})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de ingesta y consultas.")
+    parser.add_argument("--docs", type=int, default=10000, help="Nº de documentos sintéticos (10k-1M).")
+    parser.add_argument("--mix", default="txt=0.4,html=0.3,pdf=0.2,docx=0.1", help="Mezcla de formatos.")
+    parser.add_argument("--words", type=int, default=300, help="Palabras medias por documento.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=0, help="Análisis por lotes en WhooshWriter (0 = desactivado).")
+    parser.add_argument("--stream-batch", type=int, default=1000, help="Documentos por tanda de escritura en la ingesta.")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--expansion-mode", default="full", choices=["none", "light", "full"])
+    parser.add_argument("--workdir", default=DEFAULT_WORKDIR, help="Dónde generar corpus e índice.")
+    parser.add_argument("--output", help="Fichero JSON de resultados (por defecto benchmarks/results/<fecha>.json).")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior con la que comparar.")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Regresión relativa permitida.")
+    parser.add_argument("--skip-ingest", action="store_true", help="Reutilizar el índice existente.")
+    args = parser.parse_args()
+
+    docs_dir = os.path.join(args.workdir, f"corpus_{args.docs}_{args.seed}")
+    index_dir = os.path.join(args.workdir, "index")
+
+    print(f"📦 Generando corpus ({args.docs} docs, mezcla {args.mix})...")
+    manifest = generate_corpus(docs_dir, args.docs, parse_mix(args.mix), args.words, args.seed)
+
+    result: dict = {
+        "timestamp": datetime.datetime.now().isoformat(),
+        "revision": git_revision(),
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "params": {**manifest, **{k: v for k, v in vars(args).items() if k not in ("output", "baseline")}},
+    }
+
+    if not args.skip_ingest:
+        print("💾 Midiendo ingesta (FileDocumentLoader + WhooshWriter)...")
+        result["ingest"] = bench_ingestion(docs_dir, index_dir, args.batch_size, args.stream_batch)
+        print(f"   {result['ingest']}")
+
+    print(f"🔍 Midiendo consultas ({args.queries} con concurrencia {args.concurrency})...")
+    result["query"] = bench_queries(
+        index_dir, sample_queries(args.queries, seed=args.seed), args.concurrency, args.expansion_mode
+    )
+    print(f"   {result['query']}")
+
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, f"{datetime.datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"📝 Resultados guardados en {output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        if regressions:
+            print("❌ Regresiones detectadas:")
+            for line in regressions:
+                print(f"   - {line}")
+            return 1
+        print("✅ Sin regresiones respecto a la línea base.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
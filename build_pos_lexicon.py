@@ -0,0 +1,47 @@
+import argparse
+import os
+import sys
+
+# --- CONFIGURACIÓN DE RUTAS ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+
+import nltk
+
+from src.domain_nlp.components import DEFAULT_LEXICON_PATH, LexiconPOSTagger
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Amplía el léxico del etiquetador con un corpus etiquetado (Penn Treebank)."
+    )
+    parser.add_argument("--output", default=DEFAULT_LEXICON_PATH, help="Fichero JSON del léxico.")
+    parser.add_argument("--min-count", type=int, default=3,
+                        help="Apariciones mínimas de una palabra en el corpus para incluirla.")
+    args = parser.parse_args()
+
+    try:
+        tagged_words = nltk.corpus.treebank.tagged_words()
+        corpus = LexiconPOSTagger.from_tagged_corpus(tagged_words, min_count=args.min_count)
+    except LookupError:
+        print("❌ Falta el corpus: python -m nltk.downloader treebank")
+        return 1
+
+    # Las entradas ya guardadas (el léxico incluido se revisa a mano) tienen prioridad
+    existing = LexiconPOSTagger.load(args.output).lexicon if os.path.exists(args.output) else {}
+    lexicon = {
+        word: tag
+        for word, tag in corpus.lexicon.items()
+        # Sin signos de puntuación ni etiquetas vacías del Treebank (-NONE-)
+        if word.isalpha() and tag[0].isalpha()
+    }
+    lexicon.update(existing)
+
+    LexiconPOSTagger(lexicon=lexicon).save(args.output)
+    print(f"📝 Léxico guardado en {args.output}: {len(lexicon)} palabras "
+          f"({len(lexicon) - len(existing)} nuevas del corpus).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
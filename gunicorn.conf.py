@@ -0,0 +1,33 @@
+import gc
+import os
+
+# Servidor de producción: gunicorn -c gunicorn.conf.py
+# (run_server.py sigue siendo el servidor de desarrollo de Flask)
+bind = os.environ.get("CELENE_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+wsgi_app = "run_server:app"
+
+# La app (índice, pipeline NLP, WordNet...) se carga una vez en el maestro y
+# los workers la heredan por fork, compartiendo la memoria (copy-on-write).
+preload_app = True
+
+# El índice admite un único escritor. Con varios workers cada uno tendría su
+# propio AsyncIndexingService (y su hilo escritor), así que la ingesta web
+# solo queda activa con un worker; si no, se indexa desde un proceso aparte
+# (seed_index.py, IndexingService o run_server.py).
+if workers > 1:
+    os.environ["CELENE_WEB_INGESTION"] = "0"
+
+# Sin recolecciones en el maestro hasta congelar el heap: el GC no debe
+# reordenar ni tocar los objetos que heredarán los workers.
+gc.disable()
+
+
+def when_ready(server):
+    from src.web import prepare_for_fork
+    prepare_for_fork()
+    gc.enable()
+
+
+def post_fork(server, worker):
+    gc.enable()
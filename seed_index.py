@@ -11,6 +11,8 @@ sys.path.append(current_dir)
 from src.core.models import Document
 from src.infrastructure.search_engine.adapter import WhooshAdapter
 from src.infrastructure.search_engine.writer import WhooshWriter
+from src.infrastructure.search_engine.suggester import CompletionIndexBuilder
+from src.infrastructure.search_engine.vectors import VectorIndexBuilder
 
 # Ruta del índice
 INDEX_DIR = os.path.join(current_dir, 'data', 'index_storage')
@@ -173,6 +175,15 @@ def main():
     writer.add_documents(docs_to_index)
     writer.commit()
 
+    # 6. Índice de autocompletado (títulos + términos frecuentes)
+    completion_path = os.path.join(INDEX_DIR, 'completions.bin')
+    entries = CompletionIndexBuilder(adapter, completion_path).build()
+    print(f"🔤 Autocompletado generado con {entries} entradas.")
+
+    # 7. Vectores semánticos (LSA) para la reordenación opcional
+    vectors = VectorIndexBuilder(adapter, os.path.join(INDEX_DIR, 'vectors'), min_df=1).build()
+    print(f"🧭 Vectores semánticos generados para {vectors} documentos.")
+
     print("✅ Indexación finalizada.")
     print("=========================================================")
     print("🚀 GUÍA DE PRUEBAS PARA LA WEB (http://localhost:5000)")
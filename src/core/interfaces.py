@@ -1,7 +1,7 @@
 import abc
 from typing import Any
 
-from src.core.models import Document, ExpandedQuery, SearchResult
+from src.core.models import Document, ExpandedQuery, QueryProfile, SearchResult
 
 
 class IIndexWriter(abc.ABC):
@@ -11,23 +11,78 @@ class IIndexWriter(abc.ABC):
     def add_documents(self, docs: list[Document]) -> None:
         pass
 
+    @abc.abstractmethod
+    def update_documents(self, docs: list[Document]) -> None:
+        """Reemplaza los documentos con el mismo `path` (o los añade si no existen)."""
+        pass
+
+    @abc.abstractmethod
+    def delete_documents(self, paths: list[str]) -> None:
+        pass
+
     @abc.abstractmethod
     def commit(self) -> None:
-        """Garantiza que todos los documentos se escriban persistentemente en el índice."""
+        """
+        Garantiza que todos los documentos se escriban persistentemente en el índice.
+        Si falla, lanza la excepción: los cambios pendientes no se han guardado.
+        """
         pass
 
+    def cancel(self) -> None:
+        """Descarta los cambios pendientes sin confirmar (por defecto no hace nada)."""
+
+    def generation(self) -> int | None:
+        """Generación del último commit, si el motor la expone."""
+        return None
+
 
 class IIndexReader(abc.ABC):
     """Contrato para buscar en el índice."""
 
     @abc.abstractmethod
-    def search(self, query: ExpandedQuery) -> list[SearchResult]:
+    def search(
+        self, query: ExpandedQuery, profile: QueryProfile | None = None
+    ) -> list[SearchResult]:
+        """Si se pasa `profile`, el lector lo rellena con sus estadísticas."""
+        pass
+
+    def search_within(
+        self,
+        query: ExpandedQuery,
+        time_limit: float | None,
+        profile: QueryProfile | None = None,
+    ) -> tuple[list[SearchResult], bool]:
+        """
+        Búsqueda con límite de tiempo (segundos). Retorna los resultados y
+        True si se agotó el tiempo y son parciales. Por defecto, sin límite.
+        """
+        return self.search(query, profile=profile), False
+
+
+class IReranker(abc.ABC):
+    """Contrato para reordenar los resultados de una búsqueda."""
+
+    @abc.abstractmethod
+    def rerank(self, query: ExpandedQuery, results: list[SearchResult]) -> list[SearchResult]:
+        pass
+
+
+class ILanguageDetector(abc.ABC):
+    """Contrato para detectar el idioma de un texto."""
+
+    @abc.abstractmethod
+    def detect(self, text: str) -> str | None:
+        """Nombre del idioma (ej: 'spanish') o None si no se puede decidir."""
         pass
 
 
 class INLPComponent(abc.ABC):
     """Contrato para un paso del pipeline de procesamiento de lenguaje."""
 
+    # Los pasos de enriquecimiento (etiquetado, expansión) son opcionales:
+    # el pipeline puede omitirlos cuando no aportan nada a la consulta.
+    skippable: bool = False
+
     @abc.abstractmethod
     def process(self, data: Any) -> Any:
         pass
@@ -43,3 +98,16 @@ class BaseExtractor(abc.ABC):
         Uso de sintaxis moderna 'str | None' en lugar de 'Optional[str]'.
         """
         pass
+
+
+class IMetricsSink(abc.ABC):
+    """Contrato para un destino de métricas (contadores e histogramas)."""
+
+    @abc.abstractmethod
+    def increment(self, name: str, value: float, labels: dict[str, str]) -> None:
+        pass
+
+    @abc.abstractmethod
+    def observe(self, name: str, value: float, labels: dict[str, str]) -> None:
+        """Registra una observación (ej: una duración en segundos) en un histograma."""
+        pass
@@ -0,0 +1,59 @@
+import time
+from contextlib import nullcontext
+from typing import ContextManager
+
+from src.core.interfaces import IMetricsSink
+
+# Fachada de instrumentación: los módulos llaman a `timed`, `increment` y
+# `observe` sin saber a dónde van las métricas. Mientras no se configure un
+# sink con `set_sink`, todas las llamadas son no-ops de coste despreciable.
+_sink: IMetricsSink | None = None
+_NULL_TIMER = nullcontext()
+
+
+def set_sink(sink: IMetricsSink | None) -> None:
+    global _sink
+    _sink = sink
+
+
+def get_sink() -> IMetricsSink | None:
+    return _sink
+
+
+def increment(name: str, value: float = 1.0, **labels: str) -> None:
+    if _sink is not None:
+        _sink.increment(name, value, labels)
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    if _sink is not None:
+        _sink.observe(name, value, labels)
+
+
+class _Timer:
+    __slots__ = ("sink", "name", "labels", "start")
+
+    def __init__(self, sink: IMetricsSink, name: str, labels: dict[str, str]):
+        self.sink = sink
+        self.name = name
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.sink.observe(self.name, time.perf_counter() - self.start, self.labels)
+
+
+def timed(name: str, **labels: str) -> ContextManager:
+    """
+    Mide la duración del bloque en segundos:
+
+        with metrics.timed("index_search_seconds"):
+            ...
+    """
+    if _sink is None:
+        return _NULL_TIMER
+    return _Timer(_sink, name, labels)
@@ -2,10 +2,15 @@ from dataclasses import dataclass, field
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Document:
     """
     Representa un archivo procesado listo para ser indexado.
+
+    Los modelos que se crean por millones (documentos en ingesta, resultados
+    por consulta) usan __slots__ (sin __dict__ por instancia) y son
+    inmutables: para cambiar un campo se crea una copia con
+    dataclasses.replace. `metadata` sigue siendo un dict mutable.
     """
 
     title: str
@@ -14,7 +19,7 @@ class Document:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SearchResult:
     """
     Representa un documento encontrado en la búsqueda.
@@ -24,9 +29,33 @@ class SearchResult:
     path: str
     score: float
     snippet: str = ""
+    # Solo en documentos troceados: dónde está el pasaje que coincidió
+    page: int | None = None
+    offset: int | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class SearchResponse:
+    """
+    Resultados de una búsqueda y cómo se obtuvieron. Si la consulta superó
+    su presupuesto de tiempo o el servidor estaba saturado, los flags
+    indican que la respuesta está degradada.
+    """
+
+    results: list[SearchResult]
+    # Se agotó el tiempo de búsqueda: top-k de lo recorrido hasta entonces
+    partial: bool = False
+    # Se buscó la consulta sin expandir (la expansión era demasiado costosa)
+    expansion_skipped: bool = False
+    # Rechazada sin buscar: demasiadas consultas en curso
+    shed: bool = False
+
+    @property
+    def degraded(self) -> bool:
+        return self.partial or self.expansion_skipped or self.shed
+
+
+@dataclass(slots=True, frozen=True)
 class ExpandedQuery:
     """
     Representa la consulta del usuario enriquecida con NLP.
@@ -34,6 +63,9 @@ class ExpandedQuery:
 
     original_text: str
     expanded_terms: list[str]
+    # Idioma de la consulta; None si no se pudo detectar (se busca en el
+    # contenido de todos los idiomas)
+    language: str | None = None
 
     def to_boolean_query(self) -> str:
         """
@@ -57,3 +89,20 @@ class ExpandedQuery:
             return self.original_text
 
         return " OR ".join(f'"{term}"' for term in clean_terms)
+
+
+@dataclass
+class QueryProfile:
+    """
+    Radiografía de una consulta: tamaño de la expansión, del árbol
+    parseado, documentos encontrados y tiempo de cada etapa (en segundos).
+    """
+
+    query: str
+    expanded_term_count: int = 0
+    parsed_node_count: int = 0
+    matched_docs: int = 0
+    returned_docs: int = 0
+    timings: dict[str, float] = field(default_factory=dict)
+    total_seconds: float = 0.0
+    sampled_profile: str | None = None
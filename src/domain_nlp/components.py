@@ -1,16 +1,36 @@
+import json
+import os
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Any, Iterable, List, Tuple, cast
+
 import nltk
 from nltk.corpus import wordnet, stopwords
-from typing import Any, List, Tuple, cast
 from src.core.interfaces import INLPComponent
 
 ### Añadir un mecanismo de verificación en tiempo de ejecución
 
+# Léxico incluido con el paquete: palabras de clase cerrada (preposiciones,
+# determinantes, modales, numerales...) que WordNet no cubre o etiqueta mal
+# (ej: "may" como el mes). build_pos_lexicon.py lo amplía con un corpus etiquetado.
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pos_lexicon.json')
+
+
+@lru_cache(maxsize=None)
+def _read_lexicon(path: str) -> dict[str, str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 # Tokenizador 
 class TokenizerComponent(INLPComponent):
     """Divide el texto en palabras individuales."""
+
+    def __init__(self, language: str = 'english'):
+        self.language = language
     
     def process(self, text: str) -> list[str]:
-        return nltk.word_tokenize(text.lower())
+        return nltk.word_tokenize(text.lower(), language=self.language)
 
 # Filtro de Stopwords
 class StopwordFilter(INLPComponent):
@@ -25,13 +45,124 @@ class StopwordFilter(INLPComponent):
 # Etiquetador Gramatical
 class POSTagger(INLPComponent):
     """Identifica sustantivos, verbos, etc."""
+
+    skippable = True
     
     def process(self, tokens: list[str]) -> list[Tuple[str, str]]:
         return nltk.pos_tag(tokens)
 
+# Etiquetador por léxico
+class LexiconPOSTagger(INLPComponent):
+    """
+    Etiqueta cada palabra con su categoría más frecuente consultando un léxico
+    precalculado y, en su defecto, los recuentos de WordNet. El perceptrón de
+    NLTK solo se usa como respaldo para palabras desconocidas.
+
+    Las consultas tienen 1-5 palabras y casi ningún contexto sintáctico, así
+    que la etiqueta más frecuente acierta lo mismo que el perceptrón y con
+    memoización cuesta microsegundos.
+    """
+
+    skippable = True
+
+    # Claves literales (n, v, a, s, r): acceder a wordnet.NOUN aquí
+    # forzaría la carga del corpus al importar el módulo.
+    _WORDNET_TO_TREEBANK = {'n': 'NN', 'v': 'VB', 'a': 'JJ', 's': 'JJ', 'r': 'RB'}
+
+    def __init__(
+        self,
+        lexicon: dict[str, str] | None = None,
+        use_fallback: bool = True,
+        cache_size: int = 50000,
+    ):
+        self.lexicon = lexicon or {}
+        self.use_fallback = use_fallback
+        self._lookup = lru_cache(maxsize=cache_size)(self._resolve)
+        self._fallback = lru_cache(maxsize=cache_size)(self._perceptron)
+
+    @classmethod
+    def from_tagged_corpus(
+        cls, tagged_words: Iterable[Tuple[str, str]], min_count: int = 1, **kwargs: Any
+    ) -> "LexiconPOSTagger":
+        """
+        Deriva el léxico palabra -> etiqueta más frecuente de un corpus etiquetado
+        con etiquetas Penn Treebank (ej: nltk.corpus.treebank.tagged_words()).
+        Las palabras vistas menos de `min_count` veces se dejan a WordNet.
+        """
+        counts: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        for word, tag in tagged_words:
+            counts[word.lower()][tag] += 1
+        lexicon = {
+            word: tags.most_common(1)[0][0]
+            for word, tags in counts.items()
+            if sum(tags.values()) >= min_count
+        }
+        return cls(lexicon=lexicon, **kwargs)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_LEXICON_PATH, **kwargs: Any) -> "LexiconPOSTagger":
+        """
+        Carga un léxico guardado con `save`. Cada fichero se lee una sola vez
+        y los etiquetadores que lo cargan comparten el diccionario.
+        """
+        return cls(lexicon=_read_lexicon(os.path.abspath(path)), **kwargs)
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            # Una entrada por línea y ordenadas: diffs legibles al regenerarlo
+            json.dump(self.lexicon, f, ensure_ascii=False, indent=0, sort_keys=True)
+            f.write("\n")
+
+    def process(self, tokens: list[str]) -> list[Tuple[str, str]]:
+        tags = [self._lookup(token) for token in tokens]
+
+        if self.use_fallback and None in tags:
+            # Respaldo: el perceptrón etiqueta la consulta completa (conserva
+            # el contexto) pero solo usamos su etiqueta para las desconocidas.
+            fallback = self._fallback(tuple(tokens))
+            tags = [tag or fallback[i][1] for i, tag in enumerate(tags)]
+
+        return [(token, tag or 'NN') for token, tag in zip(tokens, tags)]
+
+    def _resolve(self, word: str) -> str | None:
+        if word in self.lexicon:
+            return self.lexicon[word]
+        if word.isdigit():
+            return 'CD'
+
+        # Frecuencia de uso de la palabra en cada categoría según WordNet
+        usage: Counter[str] = Counter()
+        for syn in wordnet.synsets(word):
+            syn_obj = cast(Any, syn)
+            tag = self._WORDNET_TO_TREEBANK.get(syn_obj.pos())
+            if tag is None:
+                continue
+            # +1 para que los sentidos sin recuento también desempaten
+            usage[tag] += 1 + sum(
+                lemma.count() for lemma in syn_obj.lemmas() if lemma.name().lower() == word
+            )
+
+        if not usage:
+            return None
+        return usage.most_common(1)[0][0]
+
+    def _perceptron(self, tokens: Tuple[str, ...]) -> list[Tuple[str, str]]:
+        return nltk.pos_tag(list(tokens))
+
 # Expansor de WordNet
 class WordNetExpander(INLPComponent):
-    """Busca sinónimos en WordNet."""
+    """
+    Busca sinónimos en WordNet. Con `lang` distinto de 'eng' usa el WordNet
+    multilingüe (omw-1.4), p. ej. 'spa'. Acepta tokens etiquetados o sin
+    etiquetar (sin etiqueta se buscan todas las categorías gramaticales).
+    """
+
+    skippable = True
+
+    def __init__(self, max_synsets: int | None = None, lang: str = 'eng'):
+        # None = todos los sentidos; 1 = solo el sentido más frecuente (modo ligero)
+        self.max_synsets = max_synsets
+        self.lang = lang
 
     def _get_wordnet_pos(self, treebank_tag: str) -> str | None:
         if treebank_tag.startswith('J'): return wordnet.ADJ
@@ -40,27 +171,35 @@ class WordNetExpander(INLPComponent):
         elif treebank_tag.startswith('R'): return wordnet.ADV
         else: return None
 
-    def process(self, tagged_tokens: list[Tuple[str, str]]) -> list[str]:
+    def process(self, tagged_tokens: list[Tuple[str, str]] | list[str]) -> list[str]:
         expanded_terms: set[str] = set()
         
-        for word, tag in tagged_tokens:
+        for token in tagged_tokens:
+            word, tag = token if isinstance(token, tuple) else (token, '')
             expanded_terms.add(word)
             
             wn_tag = self._get_wordnet_pos(tag)
-            
+            if tag and wn_tag is None:
+                # Clase cerrada (modal, preposición, numeral...): sus entradas
+                # de WordNet son otras palabras (ej: "may" -> el mes de mayo)
+                continue
+
             # Intento Principal: Buscar respetando la categoría gramatical detectada
-            synsets = wordnet.synsets(word, pos=wn_tag)
+            synsets = wordnet.synsets(word, pos=wn_tag, lang=self.lang)
             
             # Plan B: 
             # Si la búsqueda estricta no trajo nada (quizás el POS tagger se equivocó),
             # buscamos la palabra en CUALQUIER categoría (verbo, sustantivo, adj...)
             if not synsets and wn_tag is None:
-                synsets = wordnet.synsets(word)
+                synsets = wordnet.synsets(word, lang=self.lang)
+
+            if self.max_synsets is not None:
+                synsets = synsets[:self.max_synsets]
 
             for syn in synsets:
                 # Casteamos a Any para evitar error de Pylance
                 syn_obj = cast(Any, syn)
-                for lemma in syn_obj.lemmas():
+                for lemma in syn_obj.lemmas(lang=self.lang):
                     clean_lemma = lemma.name().replace('_', ' ')
                     expanded_terms.add(clean_lemma)
         
@@ -1,42 +1,193 @@
+import re
+from dataclasses import replace
+from enum import Enum
+from typing import Any
+
+from src.core import metrics
+from src.core.interfaces import ILanguageDetector, INLPComponent
 from src.core.models import ExpandedQuery
 from src.domain_nlp.components import (
     TokenizerComponent, 
     StopwordFilter, 
-    POSTagger, 
+    LexiconPOSTagger, 
     WordNetExpander
 )
 
+# Frases entre comillas: se buscan literalmente, sin NLP
+_QUOTED_PHRASE = re.compile(r'"([^"]*)"')
+
+# Código de cada idioma en el WordNet multilingüe (omw-1.4)
+WORDNET_LANGS = {'english': 'eng', 'spanish': 'spa'}
+
+
+class ExpansionMode(str, Enum):
+    """Nivel de expansión semántica de la consulta."""
+
+    NONE = "none"    # Solo tokenizar y filtrar
+    LIGHT = "light"  # Sinónimos del sentido más frecuente
+    FULL = "full"    # Sinónimos de todos los sentidos
+
+
 class NLPPipeline:
     """
     Orquesta el flujo de procesamiento de lenguaje natural.
     Convierte un string crudo en una ExpandedQuery.
+
+    Los pasos se configuran como una lista de INLPComponent. Los pasos
+    marcados como `skippable` (etiquetado y expansión) se omiten cuando no
+    pueden ayudar: modo sin expansión, consultas demasiado largas o tokens
+    numéricos, que pasan tal cual.
+
+    `language` (nombre de NLTK: 'english', 'spanish') elige las stopwords y
+    el WordNet de la expansión, y se anota en la consulta resultante para
+    que el lector busque en el campo de ese idioma.
     """
     
-    def __init__(self):
-        # Inicializamos los pasos del pipeline en orden estricto
-        self.tokenizer = TokenizerComponent()
-        self.sw_filter = StopwordFilter(language='english')
-        self.tagger = POSTagger()
-        self.expander = WordNetExpander()
+    def __init__(
+        self,
+        components: list[INLPComponent] | None = None,
+        expansion_mode: ExpansionMode | str = ExpansionMode.FULL,
+        max_expand_tokens: int = 8,
+        language: str = 'english',
+    ):
+        self.expansion_mode = ExpansionMode(expansion_mode)
+        # Por encima de este nº de tokens la expansión solo añade ruido y coste
+        self.max_expand_tokens = max_expand_tokens
+        self.language = language
+        self.components = (
+            components
+            if components is not None
+            else self.default_components(self.expansion_mode, language)
+        )
+
+    @staticmethod
+    def default_components(mode: ExpansionMode, language: str = 'english') -> list[INLPComponent]:
+        """
+        Pipeline estándar: tokenizar -> filtrar -> etiquetar -> expandir.
+        El etiquetador por léxico solo conoce el inglés: en otros idiomas se
+        expande sin etiqueta gramatical.
+        """
+        components: list[INLPComponent] = [
+            TokenizerComponent(language=language),
+            StopwordFilter(language=language),
+        ]
+        if mode is not ExpansionMode.NONE:
+            max_synsets = 1 if mode is ExpansionMode.LIGHT else None
+            if language == 'english':
+                components.append(LexiconPOSTagger.load())
+            components.append(
+                WordNetExpander(max_synsets=max_synsets, lang=WORDNET_LANGS.get(language, 'eng'))
+            )
+        return components
+
+    def without_expansion(self) -> "NLPPipeline":
+        """Mismo idioma, solo tokenizar y filtrar (consulta literal)."""
+        return NLPPipeline(
+            expansion_mode=ExpansionMode.NONE,
+            max_expand_tokens=self.max_expand_tokens,
+            language=self.language,
+        )
 
     def process(self, raw_query: str) -> ExpandedQuery:
         """
         Ejecuta el pipeline paso a paso.
         """
-        # 1. Tokenizar: "El coche veloz" -> ["el", "coche", "veloz"]
-        tokens = self.tokenizer.process(raw_query)
-        
-        # 2. Filtrar: ["el", "coche", "veloz"] -> ["coche", "veloz"]
-        clean_tokens = self.sw_filter.process(tokens)
-        
-        # 3. Etiquetar: ["coche", "veloz"] -> [("coche", "NN"), ("veloz", "ADJ")]
-        tagged_tokens = self.tagger.process(clean_tokens)
-        
-        # 4. Expandir: -> ["coche", "auto", "carro", "veloz", "rápido"...]
-        expanded_terms = self.expander.process(tagged_tokens)
-        
-        # 5. Empaquetar en el DTO
+        # 1. Extraer frases entre comillas: '"red car" fast' -> ["red car"], ' fast'
+        phrases = [p.strip() for p in _QUOTED_PHRASE.findall(raw_query) if p.strip()]
+        free_text = _QUOTED_PHRASE.sub(" ", raw_query)
+
+        # 2. Procesar el texto libre con los componentes configurados
+        terms = self._run_components(free_text) if free_text.strip() else []
+
+        # 3. Empaquetar en el DTO (las frases van tal cual, sin expandir)
         return ExpandedQuery(
             original_text=raw_query,
-            expanded_terms=expanded_terms
-        )
\ No newline at end of file
+            expanded_terms=phrases + [t for t in terms if t not in phrases],
+            language=self.language,
+        )
+
+    def _run_components(self, text: str) -> list[str]:
+        data: Any = text
+        passthrough: list[str] = []
+        gated = False
+
+        for component in self.components:
+            if component.skippable and not gated:
+                # Punto de corte: a partir de aquí solo hay enriquecimiento.
+                # Los tokens numéricos no tienen sinónimos ni etiqueta útil.
+                gated = True
+                passthrough = [t for t in data if _is_numeric(t)]
+                data = [t for t in data if not _is_numeric(t)]
+                if not self._should_enrich(data):
+                    metrics.increment("nlp_enrichment_skipped_total")
+                    break
+
+            # "El coche veloz" -> ["el", "coche", "veloz"] -> ["coche", "veloz"]
+            # -> [("coche", "NN"), ("veloz", "JJ")] -> ["coche", "auto", "carro"...]
+            with metrics.timed("nlp_stage_seconds", stage=type(component).__name__):
+                data = component.process(data)
+
+        return passthrough + list(data)
+
+    def _should_enrich(self, tokens: list[str]) -> bool:
+        if self.expansion_mode is ExpansionMode.NONE:
+            return False
+        return 0 < len(tokens) <= self.max_expand_tokens
+
+
+
+class MultilingualPipeline:
+    """
+    Un NLPPipeline por idioma. Detecta el idioma de cada consulta y la
+    procesa con el pipeline correspondiente, de modo que el lector solo
+    busca en el campo de contenido de ese idioma.
+
+    Las consultas cortas a menudo no tienen palabras que delaten el idioma:
+    entonces se procesan con `default_language` y se marcan sin idioma
+    (`language=None`) para buscar en el contenido de todos los idiomas.
+    """
+
+    def __init__(
+        self,
+        detector: ILanguageDetector,
+        languages: tuple[str, ...] = ('english', 'spanish'),
+        expansion_mode: ExpansionMode | str = ExpansionMode.FULL,
+        max_expand_tokens: int = 8,
+        default_language: str = 'english',
+    ):
+        if default_language not in languages:
+            raise ValueError("default_language debe estar en languages")
+        self.detector = detector
+        self.expansion_mode = ExpansionMode(expansion_mode)
+        self.default_language = default_language
+        self.pipelines = {
+            language: NLPPipeline(
+                expansion_mode=self.expansion_mode,
+                max_expand_tokens=max_expand_tokens,
+                language=language,
+            )
+            for language in languages
+        }
+
+    def process(self, raw_query: str) -> ExpandedQuery:
+        language = self.detector.detect(_QUOTED_PHRASE.sub(" ", raw_query))
+        pipeline = self.pipelines.get(language or "")
+        if pipeline is not None:
+            return pipeline.process(raw_query)
+
+        query = self.pipelines[self.default_language].process(raw_query)
+        return replace(query, language=None)
+
+    def without_expansion(self) -> "MultilingualPipeline":
+        default = self.pipelines[self.default_language]
+        return MultilingualPipeline(
+            self.detector,
+            languages=tuple(self.pipelines),
+            expansion_mode=ExpansionMode.NONE,
+            max_expand_tokens=default.max_expand_tokens,
+            default_language=self.default_language,
+        )
+
+
+def _is_numeric(token: str) -> bool:
+    return any(ch.isdigit() for ch in token)
@@ -0,0 +1,80 @@
+import gc
+import time
+from typing import Any
+
+import nltk
+from nltk.corpus import stopwords, wordnet
+from nltk.stem import WordNetLemmatizer
+
+from src.domain_nlp.pipeline import WORDNET_LANGS, MultilingualPipeline, NLPPipeline
+
+# Consultas que recorren todos los caminos del pipeline: palabras con y sin
+# sinónimos, plurales, verbos, números y frases entre comillas.
+WARMUP_QUERIES = [
+    "fast red car",
+    "dogs running in the park",
+    "quantum computer data processing",
+    "happy children playing",
+    '"bank of the river" 2024',
+    "el coche más rápido de la ciudad",
+]
+
+
+def preload_nlp_resources(languages: tuple[str, ...] = ("english",)) -> None:
+    """
+    Carga en memoria los recursos de NLTK que, si no, se cargan de forma
+    perezosa en la primera consulta: listas de stopwords, WordNet (índices y
+    excepciones de morfología), el lematizador y el perceptrón de pos_tag.
+    Para los idiomas distintos del inglés, también su WordNet multilingüe.
+
+    Pensado para ejecutarse en el proceso maestro antes de crear los workers:
+    las páginas quedan compartidas (copy-on-write) en lugar de duplicarse.
+    """
+    wordnet.synsets("warm")
+    for language in languages:
+        stopwords.words(language)
+        lang = WORDNET_LANGS.get(language, "eng")
+        if lang != "eng":
+            wordnet.synsets("calor", lang=lang)
+    WordNetLemmatizer().lemmatize("resources")
+    nltk.pos_tag(["warm", "up"])
+
+
+def warm_up(pipeline: NLPPipeline | MultilingualPipeline, queries: list[str] | None = None) -> float:
+    """
+    Ejecuta el pipeline sobre consultas de prueba para llenar sus cachés y
+    cargar lo que quede pendiente. Retorna los segundos empleados.
+    """
+    started = time.perf_counter()
+    for query in queries or WARMUP_QUERIES:
+        pipeline.process(query)
+    return time.perf_counter() - started
+
+
+def release_file_handles() -> None:
+    """
+    WordNet lee sus ficheros de datos con seek + readline sobre descriptores
+    que mantiene abiertos. Tras un fork los workers compartirían la posición
+    de lectura, así que se cierran: cada proceso los reabrirá al usarlos.
+    """
+    reader: Any = wordnet
+    data_files = getattr(reader, "_data_file_map", None)
+    if data_files:
+        for handle in data_files.values():
+            handle.close()
+        data_files.clear()
+
+    count_file = getattr(reader, "_key_count_file", None)
+    if count_file is not None:
+        count_file.close()
+        reader._key_count_file = None
+
+
+def freeze_heap() -> None:
+    """
+    Mueve todos los objetos vivos a la generación permanente del GC. Así las
+    recolecciones de los workers no tocan sus cabeceras y las páginas
+    heredadas del maestro no se copian.
+    """
+    gc.collect()
+    gc.freeze()
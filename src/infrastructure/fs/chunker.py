@@ -0,0 +1,59 @@
+import bisect
+import re
+
+from src.core.models import Document
+
+_WORD = re.compile(r"\S+")
+# PDFExtractor separa las páginas con un salto de página
+PAGE_BREAK = "\f"
+
+
+class PassageChunker:
+    """
+    Divide los documentos largos en pasajes solapados antes de indexarlos.
+
+    Cada pasaje es un Document propio (`<path>#p<n>`) con el documento de
+    origen en `metadata["parent"]`, la posición del primer carácter en
+    `metadata["offset"]` y, si el texto trae saltos de página, la página en
+    `metadata["page"]`. Los documentos cortos pasan sin cambios.
+    """
+
+    def __init__(self, max_words: int = 300, overlap: int = 50):
+        if not 0 <= overlap < max_words:
+            raise ValueError("overlap debe ser menor que max_words")
+        self.max_words = max_words
+        self.overlap = overlap
+
+    def process(self, docs: list[Document]) -> list[Document]:
+        passages: list[Document] = []
+        for doc in docs:
+            passages.extend(self.split(doc))
+        return passages
+
+    def split(self, doc: Document) -> list[Document]:
+        spans = [m.span() for m in _WORD.finditer(doc.content)]
+        if len(spans) <= self.max_words:
+            return [doc]
+
+        page_breaks = [i for i, ch in enumerate(doc.content) if ch == PAGE_BREAK]
+        step = self.max_words - self.overlap
+        passages: list[Document] = []
+
+        for n, first in enumerate(range(0, len(spans) - self.overlap, step)):
+            last = min(first + self.max_words, len(spans)) - 1
+            start, end = spans[first][0], spans[last][1]
+
+            metadata = {**doc.metadata, "parent": doc.path, "offset": start}
+            if page_breaks:
+                metadata["page"] = bisect.bisect_right(page_breaks, start) + 1
+
+            passages.append(
+                Document(
+                    title=doc.title,
+                    content=doc.content[start:end],
+                    path=f"{doc.path}#p{n}",
+                    metadata=metadata,
+                )
+            )
+
+        return passages
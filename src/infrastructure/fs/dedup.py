@@ -0,0 +1,139 @@
+import random
+import re
+import zlib
+from collections import defaultdict
+from dataclasses import replace
+
+from src.core.models import Document
+
+_WORD = re.compile(r"\w+")
+# Primo de Mersenne 2^61 - 1: permutaciones universales (a*x + b) mod p
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+class MinHasher:
+    """
+    Calcula firmas MinHash sobre shingles de palabras. La fracción de
+    posiciones iguales entre dos firmas estima la similitud de Jaccard
+    entre los textos.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randint(1, _PRIME - 1), rng.randint(0, _PRIME - 1)) for _ in range(num_perm)
+        ]
+
+    def shingles(self, text: str) -> set[int]:
+        words = _WORD.findall(text.lower())
+        k = self.shingle_size
+        if len(words) <= k:
+            return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+        return {
+            zlib.crc32(" ".join(words[i:i + k]).encode("utf-8"))
+            for i in range(len(words) - k + 1)
+        }
+
+    def signature(self, text: str) -> tuple[int, ...] | None:
+        """None si el texto no tiene palabras: no es comparable con ningún otro."""
+        hashes = self.shingles(text)
+        if not hashes:
+            return None
+        return tuple(
+            min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes) for a, b in self._perms
+        )
+
+
+def estimate_similarity(sig_a: tuple[int, ...], sig_b: tuple[int, ...]) -> float:
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+class LSHIndex:
+    """
+    Locality-Sensitive Hashing por bandas: dos firmas son candidatas si
+    coinciden por completo en al menos una banda. Buscar candidatos cuesta
+    O(bandas), no O(documentos indexados).
+    """
+
+    def __init__(self, bands: int, rows: int):
+        self.bands = bands
+        self.rows = rows
+        self._buckets: defaultdict[tuple[int, tuple[int, ...]], list[int]] = defaultdict(list)
+
+    def _keys(self, signature: tuple[int, ...]) -> list[tuple[int, tuple[int, ...]]]:
+        r = self.rows
+        return [(band, signature[band * r:(band + 1) * r]) for band in range(self.bands)]
+
+    def candidates(self, signature: tuple[int, ...]) -> set[int]:
+        found: set[int] = set()
+        for key in self._keys(signature):
+            found.update(self._buckets.get(key, ()))
+        return found
+
+    def insert(self, item_id: int, signature: tuple[int, ...]) -> None:
+        for key in self._keys(signature):
+            self._buckets[key].append(item_id)
+
+
+class NearDuplicateFilter:
+    """
+    Etapa de ingesta entre la extracción y el escritor: agrupa documentos
+    casi idénticos (ej: el mismo informe en PDF, DOCX y HTML), conserva uno
+    canónico por grupo y anota las rutas de los demás en
+    `metadata["aliases"]` de una copia (con `replace`).
+
+    El canónico es el de texto más largo (la extracción más completa).
+    Los documentos sin palabras no se agrupan: se conservan tal cual.
+    """
+
+    def __init__(self, threshold: float = 0.85, bands: int = 16, rows: int = 4, shingle_size: int = 5):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm=bands * rows, shingle_size=shingle_size)
+        self.bands = bands
+        self.rows = rows
+
+    def process(self, docs: list[Document]) -> list[Document]:
+        signatures = [self.hasher.signature(doc.content) for doc in docs]
+        lsh = LSHIndex(self.bands, self.rows)
+        parent = list(range(len(docs)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # 1. Agrupar: candidatos por LSH, confirmados con la similitud estimada
+        for i, signature in enumerate(signatures):
+            if signature is None:
+                continue
+            for j in lsh.candidates(signature):
+                candidate = signatures[j]
+                assert candidate is not None
+                if estimate_similarity(signature, candidate) >= self.threshold:
+                    parent[find(i)] = find(j)
+            lsh.insert(i, signature)
+
+        groups: defaultdict[int, list[int]] = defaultdict(list)
+        for i in range(len(docs)):
+            groups[find(i)].append(i)
+
+        # 2. Elegir el canónico de cada grupo y registrar los alias
+        # (en una copia: los documentos del llamante no se modifican)
+        keep: dict[int, Document] = {}
+        for members in groups.values():
+            canonical = max(members, key=lambda i: len(docs[i].content))
+            aliases = [docs[i].path for i in members if i != canonical]
+            doc = docs[canonical]
+            if aliases:
+                doc = replace(doc, metadata={**doc.metadata, "aliases": doc.metadata.get("aliases", []) + aliases})
+            keep[canonical] = doc
+
+        dropped = len(docs) - len(keep)
+        if dropped:
+            print(f"Duplicados descartados: {dropped} de {len(docs)} documentos.")
+
+        return [keep[i] for i in sorted(keep)]
@@ -26,12 +26,13 @@ class PDFExtractor(BaseExtractor):
     def get_text(self, file_path: str) -> str | None:
         try:
             reader = PdfReader(file_path)
-            text_parts = []
-            for page in reader.pages:
-                extracted = page.extract_text()
-                if extracted:
-                    text_parts.append(extracted)
-            return "\n".join(text_parts)
+            # Una entrada por página (aunque esté vacía) y separadas con
+            # salto de página: el chunker deduce de ahí el número de página
+            text_parts = [page.extract_text() or "" for page in reader.pages]
+            if not any(part.strip() for part in text_parts):
+                # PDF escaneado (solo imágenes): no hay texto que indexar
+                return None
+            return "\f".join(text_parts)
         except Exception as e:
             print(f"Error leyendo PDF {file_path}: {e}")
             return None
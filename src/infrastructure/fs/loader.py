@@ -1,5 +1,7 @@
 import os
+from collections.abc import Iterator
 
+from src.core import metrics
 from src.core.interfaces import BaseExtractor
 from src.core.models import Document
 
@@ -36,11 +38,16 @@ class FileDocumentLoader:
         """
         Recorre la carpeta configurada y devuelve una lista de documentos procesados.
         """
+        return list(self.iter_documents())
+
+    def iter_documents(self) -> Iterator[Document]:
+        """
+        Igual que load_all, pero entrega los documentos de uno en uno: solo
+        el texto del documento en curso está en memoria.
+        """
         if not os.path.exists(self.source_dir):
             print(f"Advertencia: El directorio {self.source_dir} no existe.")
-            return []
-
-        documents: list[Document] = []
+            return
 
         print(f"Escaneando directorio: {self.source_dir} ...")
 
@@ -60,7 +67,8 @@ class FileDocumentLoader:
                 extractor = self._extractors[ext]
 
                 # Usamos el extractor
-                content = extractor.get_text(file_path)
+                with metrics.timed("extraction_seconds", format=ext):
+                    content = extractor.get_text(file_path)
 
                 if content:
                     doc = Document(
@@ -69,14 +77,14 @@ class FileDocumentLoader:
                         path=file_path,
                         metadata={"type": ext},
                     )
-                    documents.append(doc)
+                    yield doc
+                    metrics.increment("documents_loaded_total", format=ext)
                     print(f"✅ Cargado: {filename}")
                 else:
+                    metrics.increment("extraction_failures_total", format=ext)
                     print(f"⚠️  Archivo vacío o corrupto: {filename}")
             else:
                 # Cositas para hacer luego
                 # Avisar de archivos ignorados
                 # print(f"Ignorando formato no soportado: {filename}")
                 pass
-
-        return documents
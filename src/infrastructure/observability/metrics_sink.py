@@ -0,0 +1,92 @@
+import bisect
+import threading
+
+from src.core.interfaces import IMetricsSink
+
+# Límites (en segundos) de los histogramas: de 100µs a 10s
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_LabelKey = tuple[tuple[str, str], ...]
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * (size + 1)  # El último es +Inf
+        self.total = 0.0
+        self.count = 0
+
+
+class InMemoryMetricsSink(IMetricsSink):
+    """
+    Acumula contadores e histogramas en memoria del proceso y los exporta
+    en el formato de texto de Prometheus (endpoint /metrics).
+    Cada worker tiene su propio sink: el scraper debe agregar por instancia.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS, prefix: str = "celene_"):
+        self.buckets = buckets
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[_LabelKey, float]] = {}
+        self._histograms: dict[str, dict[_LabelKey, _Histogram]] = {}
+
+    def increment(self, name: str, value: float, labels: dict[str, str]) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: dict[str, str]) -> None:
+        key = tuple(sorted(labels.items()))
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = _Histogram(len(self.buckets))
+            hist.counts[slot] += 1
+            hist.total += value
+            hist.count += 1
+
+    def snapshot(self) -> dict:
+        """Resumen legible: {nombre: {labels: valor | {count, sum}}}."""
+        with self._lock:
+            data: dict = {}
+            for name, series in self._counters.items():
+                data[name] = {_format_labels(k): v for k, v in series.items()}
+            for name, series in self._histograms.items():
+                data[name] = {
+                    _format_labels(k): {"count": h.count, "sum": h.total} for k, h in series.items()
+                }
+            return data
+
+    def render_prometheus(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full = f"{self.prefix}{name}"
+                lines.append(f"# TYPE {full} counter")
+                for key, value in series.items():
+                    lines.append(f"{full}{_format_labels(key)} {value}")
+
+            for name, series in sorted(self._histograms.items()):
+                full = f"{self.prefix}{name}"
+                lines.append(f"# TYPE {full} histogram")
+                for key, hist in series.items():
+                    cumulative = 0
+                    for bound, count in zip((*self.buckets, "+Inf"), hist.counts):
+                        cumulative += count
+                        le_key = (*key, ("le", str(bound)))
+                        lines.append(f"{full}_bucket{_format_labels(le_key)} {cumulative}")
+                    lines.append(f"{full}_sum{_format_labels(key)} {hist.total}")
+                    lines.append(f"{full}_count{_format_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(key: _LabelKey) -> str:
+    if not key:
+        return ""
+    body = ",".join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in key)
+    return "{" + body + "}"
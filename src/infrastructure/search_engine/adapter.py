@@ -1,32 +1,82 @@
 import os
 import shutil
-from whoosh.fields import ID, TEXT, Schema
-from whoosh.index import Index, create_in, exists_in, open_dir
-from src.infrastructure.search_engine.analyzer import NLTKAnalyzer 
+from typing import Any
+from dataclasses import dataclass
+from whoosh.fields import ID, STORED, TEXT, Schema
+from whoosh.filedb.filestore import FileStorage, RamStorage, Storage
+from whoosh.index import Index, LockError, create_in, exists_in, open_dir
+from src.infrastructure.search_engine.analyzer import NLTKAnalyzer, SpanishAnalyzer
+
+
+@dataclass
+class IndexStats:
+    """
+    Estado físico del índice, usado para decidir cuándo compactarlo.
+    """
+
+    segment_count: int
+    doc_count: int
+    deleted_count: int
+    size_bytes: int
+    generation: int
+
+    @property
+    def deleted_ratio(self) -> float:
+        total = self.doc_count + self.deleted_count
+        return self.deleted_count / total if total else 0.0
 
 
 class WhooshAdapter:
     """
     Gestiona el acceso físico al índice de Whoosh.
     Encapsula la configuración del Schema y la creación del directorio.
+
+    Con `in_memory=True` el índice vive en RAM (sin E/S de disco ni
+    ficheros de bloqueo), pensado para colecciones pequeñas y tests. En ese
+    modo `index_dir` es opcional y sirve de ubicación para `snapshot()` y
+    para cargar el índice al arrancar (reinicio en caliente).
     """
 
-    def __init__(self, index_dir: str):
+    def __init__(self, index_dir: str | None, in_memory: bool = False):
+        if index_dir is None and not in_memory:
+            raise ValueError("index_dir es obligatorio para un índice en disco.")
         self.index_dir = index_dir
+        self.in_memory = in_memory
+        self._ram_index: Index | None = None
         # Definimos el esquema de la base de datos:
         # - title: Texto indexable y almacenado.
         # - content: Texto indexable y almacenado. Analizador Estándar.
         # - path: ID único, almacenado pero no analizado.
         self.schema = Schema(
-            title=TEXT(stored=True),
+            # sortable: además de almacenados, en columnas que se leen sin
+            # deserializar el documento entero (ver WhooshReader(snippets=False))
+            title=TEXT(stored=True, sortable=True),
             content=TEXT(stored=True, analyzer=NLTKAnalyzer(stopwords_lang='english')),
-            path=ID(stored=True, unique=True),
+            # Contenido en español con su propio analizador. Cada documento se
+            # indexa solo en el campo de su idioma; el texto original se
+            # almacena siempre en `content` (ver WhooshWriter)
+            content_es=TEXT(analyzer=SpanishAnalyzer()),
+            language=ID(stored=True),
+            path=ID(stored=True, unique=True, sortable=True),
+            # Rutas de los casi-duplicados fusionados en este documento
+            aliases=STORED,
+            # Pasajes de documentos largos: documento de origen y posición
+            parent=ID(stored=True, sortable=True),
+            offset=STORED,
+            page=STORED,
         )
 
     def get_index(self) -> Index:
         """
         Devuelve el objeto índice. Si no existe, lo crea.
         """
+        if self.in_memory:
+            # Todos los lectores y escritores deben compartir la misma instancia
+            if self._ram_index is None:
+                self._ram_index = self._load_ram_index()
+            return self._ram_index
+
+        assert self.index_dir is not None
         if not os.path.exists(self.index_dir):
             os.makedirs(self.index_dir)
             return create_in(self.index_dir, self.schema)
@@ -40,7 +90,139 @@ class WhooshAdapter:
         """
         Borra y recrea el índice (útil para re-indexar desde cero).
         """
+        if self.in_memory:
+            self._ram_index = RamStorage().create_index(self.schema)
+            return
+
+        assert self.index_dir is not None
         if os.path.exists(self.index_dir):
             shutil.rmtree(self.index_dir)
         os.makedirs(self.index_dir)
         create_in(self.index_dir, self.schema)
+
+    def get_stats(self) -> IndexStats:
+        """
+        Cuenta segmentos, documentos borrados y tamaño en disco del índice.
+        """
+        ix = self.get_index()
+        # Whoosh no expone la lista de segmentos públicamente; la leemos del TOC
+        segments = ix._segments()  # type: ignore[attr-defined]
+        storage = ix.storage  # type: ignore[attr-defined]
+
+        size_bytes = sum(
+            storage.file_length(name)
+            for segment in segments
+            for name in segment.list_files(storage)
+        )
+        return IndexStats(
+            segment_count=len(segments),
+            doc_count=sum(segment.doc_count() for segment in segments),
+            deleted_count=sum(segment.deleted_count() for segment in segments),
+            size_bytes=size_bytes,
+            generation=ix.latest_generation(),
+        )
+
+    def open_writer(self, lock_timeout: float = 0.0) -> Any:
+        """
+        Abre un escritor de Whoosh esperando como mucho `lock_timeout`
+        segundos por el cerrojo; lanza LockError si no se obtiene.
+
+        En RAM el cerrojo es un threading.Lock y Whoosh llama a acquire()
+        sin argumentos, que bloquea indefinidamente: lo tomamos nosotros
+        con el límite de tiempo y se lo pasamos al escritor, que lo libera
+        en commit() o cancel().
+        """
+        ix = self.get_index()
+        if not self.in_memory:
+            return ix.writer(timeout=lock_timeout)
+
+        lock = ix.lock("WRITELOCK")  # type: ignore[attr-defined]
+        acquired = lock.acquire(timeout=lock_timeout) if lock_timeout > 0 else lock.acquire(blocking=False)
+        if not acquired:
+            raise LockError("El índice en memoria está bloqueado por otro escritor.")
+        try:
+            writer = ix.writer(_lk=False)
+        except Exception:
+            lock.release()
+            raise
+        writer.writelock = lock
+        return writer
+
+    def optimize(self, full: bool = True, lock_timeout: float = 0.0) -> bool:
+        """
+        Fusiona segmentos y purga documentos borrados.
+
+        - full=True: fusiona todo en un único segmento (optimize).
+        - full=False: solo fusiona los segmentos pequeños (política por defecto).
+
+        Los lectores no se bloquean: cada searcher trabaja sobre la generación
+        que abrió y ve la nueva al abrir el siguiente. Retorna False si otro
+        proceso tiene el cerrojo de escritura.
+        """
+        try:
+            writer = self.open_writer(lock_timeout)
+        except LockError:
+            print("Compactación omitida: el índice está bloqueado por otro escritor.")
+            return False
+
+        try:
+            writer.commit(optimize=full, merge=True)
+        except Exception as e:
+            print(f"Error compactando el índice: {e}")
+            writer.cancel()
+            return False
+        return True
+
+    def snapshot(self, target_dir: str | None = None, lock_timeout: float = 5.0) -> str:
+        """
+        Vuelca el índice en RAM a disco (por defecto en `index_dir`) para
+        poder recargarlo al reiniciar. Se toma el cerrojo de escritura para
+        copiar una generación consistente; las búsquedas no se bloquean.
+        Lanza LockError si otro escritor no lo suelta en `lock_timeout` segundos.
+        """
+        if not self.in_memory:
+            raise ValueError("snapshot() solo aplica a índices en memoria.")
+        target_dir = target_dir or self.index_dir
+        if target_dir is None:
+            raise ValueError("Indica target_dir o configura index_dir.")
+
+        ix = self.get_index()
+        writer = self.open_writer(lock_timeout)
+        tmp_dir = f"{target_dir}.tmp"
+        try:
+            if os.path.exists(tmp_dir):
+                shutil.rmtree(tmp_dir)
+            os.makedirs(tmp_dir)
+            _copy_storage(ix.storage, FileStorage(tmp_dir))  # type: ignore[attr-defined]
+        finally:
+            writer.cancel()
+
+        # Sustituimos la instantánea anterior solo cuando la nueva está completa
+        if os.path.exists(target_dir):
+            shutil.rmtree(target_dir)
+        os.rename(tmp_dir, target_dir)
+        return target_dir
+
+    def _load_ram_index(self) -> Index:
+        storage = RamStorage()
+        if self.index_dir is not None and exists_in(self.index_dir):
+            _copy_storage(FileStorage(self.index_dir), storage)
+            return storage.open_index()
+        return storage.create_index(self.schema)
+
+
+def _copy_storage(source: Storage, target: Storage) -> None:
+    """Copia los ficheros del índice entre almacenamientos (sin los cerrojos)."""
+    for name in source.list():
+        if name.endswith("WRITELOCK"):
+            continue
+        src = source.open_file(name)
+        try:
+            data = src.read()
+        finally:
+            src.close()
+        dst = target.create_file(name)
+        try:
+            dst.write(data)
+        finally:
+            dst.close()
@@ -1,30 +1,113 @@
-import nltk
+import re
+from array import array
+from functools import lru_cache
 from nltk.stem import WordNetLemmatizer
 from nltk.corpus import wordnet
-from whoosh.analysis import Filter, RegexTokenizer, LowercaseFilter, StopFilter, Token
+from whoosh.analysis import (
+    CharsetFilter, Filter, RegexTokenizer, LowercaseFilter, StemFilter, StopFilter, Token,
+)
+from whoosh.support.charset import accent_map
 from typing import Iterator, Any, cast # <--- Añadimos Any y cast
 
+# Mismo patrón que RegexTokenizer() (sin grupo de captura para finditer/findall)
+_TOKEN_PATTERN = re.compile(r"\w+(?:\.?\w+)*")
+
+_lemmatizer = WordNetLemmatizer()
+
+
+@lru_cache(maxsize=200000)
+def lemmatize_noun(word: str) -> str:
+    """
+    Lematiza como sustantivo. Memoizado: el vocabulario de un corpus es
+    mucho menor que su número de tokens.
+    """
+    return _lemmatizer.lemmatize(word, pos=wordnet.NOUN)
+
+
 class NLTKLemmatizerFilter(Filter):
-    def __init__(self):
-        self.lemmatizer = WordNetLemmatizer()
+    # Sin estado: Whoosh serializa el schema (y este filtro) en el TOC del índice
 
     def __call__(self, tokens: Iterator[Token]) -> Iterator[Token]:
         for token in tokens:
             # --- SOLUCIÓN ERROR PYLANCE ---
-            # Casteamos el token a 'Any' para que Pylance nos deje 
+            # Casteamos el token a 'Any' para que Pylance nos deje
             # acceder a .text sin quejarse.
             t = cast(Any, token)
-            
+
             # Ahora accedemos a t.text sin problemas
-            lemma = self.lemmatizer.lemmatize(t.text, pos=wordnet.NOUN)
-            
+            lemma = lemmatize_noun(t.text)
+
             if lemma != t.text:
                 t.text = lemma
-            
+
             yield t
 
 def NLTKAnalyzer(stopwords_lang: str = 'english'):
     """
     Analizador personalizado que incluye lematización.
     """
-    return (RegexTokenizer() | LowercaseFilter() | StopFilter(lang=stopwords_lang) | NLTKLemmatizerFilter())
\ No newline at end of file
+    return (RegexTokenizer() | LowercaseFilter() | StopFilter(lang=stopwords_lang) | NLTKLemmatizerFilter())
+
+
+def SpanishAnalyzer():
+    """
+    Analizador para contenido en español. WordNet no lematiza español, así
+    que se usa el stemmer Snowball de Whoosh ("coches", "coche" -> "coch").
+    Los acentos se eliminan antes del stemmer: las consultas a menudo se
+    escriben sin tildes y "camion" debe encontrar "camión".
+    """
+    return (
+        RegexTokenizer()
+        | LowercaseFilter()
+        | StopFilter(lang='spanish')
+        | CharsetFilter(accent_map)
+        | StemFilter(lang='spanish')
+    )
+
+
+class BatchAnalyzer:
+    """
+    Versión por lotes de NLTKAnalyzer para cargas masivas.
+
+    En lugar de pasar cada token de cada documento por la cadena de
+    generadores, tokeniza todo el lote, deduplica el vocabulario, decide
+    stopword/lema una sola vez por término único y reconstruye cada
+    documento con búsquedas en arrays de ids.
+    """
+
+    def __init__(self, stopwords_lang: str = 'english'):
+        # Reutilizamos la configuración exacta del StopFilter del esquema
+        stop_filter = StopFilter(lang=stopwords_lang)
+        self.stops: frozenset[str] = frozenset(stop_filter.stops)
+        self.min_size: int = stop_filter.min
+        self.max_size: int | None = stop_filter.max
+
+    def analyze_batch(self, texts: list[str]) -> list[list[str]]:
+        """
+        Devuelve, para cada texto, la lista de lemas indexables en orden.
+        """
+        # 1. Tokenizar el lote y traducir cada token a un id de vocabulario
+        vocab: dict[str, int] = {}
+        docs_ids: list[array] = []
+        for text in texts:
+            ids = array("I")
+            for token in _TOKEN_PATTERN.findall(text.lower()):
+                token_id = vocab.get(token)
+                if token_id is None:
+                    token_id = vocab[token] = len(vocab)
+                ids.append(token_id)
+            docs_ids.append(ids)
+
+        # 2. Stopwords y lematización: una vez por término único del lote
+        lemmas: list[str | None] = [None] * len(vocab)
+        for token, token_id in vocab.items():
+            if self._is_indexable(token):
+                lemmas[token_id] = lemmatize_noun(token)
+
+        # 3. Reconstruir cada documento a partir de sus ids
+        return [[lemma for lemma in map(lemmas.__getitem__, ids) if lemma] for ids in docs_ids]
+
+    def _is_indexable(self, token: str) -> bool:
+        if token in self.stops or len(token) < self.min_size:
+            return False
+        return self.max_size is None or len(token) <= self.max_size
@@ -0,0 +1,65 @@
+import re
+from collections import Counter
+
+from whoosh.lang import stopwords_for_language
+
+from src.core.interfaces import ILanguageDetector
+
+# Idioma por defecto: el de los índices anteriores al análisis multilingüe
+DEFAULT_LANGUAGE = "english"
+
+# Campo de contenido indexado con el analizador de cada idioma
+LANGUAGE_FIELDS = {
+    "english": "content",
+    "spanish": "content_es",
+}
+
+_WORD = re.compile(r"[^\W\d_]+")
+
+# Caracteres que, por sí solos, delatan el idioma
+_MARKERS = {
+    "spanish": frozenset("ñ¿¡"),
+}
+
+
+class LanguageDetector(ILanguageDetector):
+    """
+    Detecta el idioma de un texto contando las stopwords de cada
+    idioma entre sus primeras palabras: son las palabras más frecuentes de
+    cualquier texto, así que bastan unas pocas para decidir y no hace falta
+    leer el documento entero.
+
+    Retorna None si ningún idioma alcanza `min_hits` aciertos o hay empate
+    (consultas cortas sin palabras vacías, por ejemplo "coche veloz").
+    """
+
+    def __init__(
+        self,
+        languages: tuple[str, ...] = ("english", "spanish"),
+        sample_words: int = 200,
+        min_hits: int = 2,
+    ):
+        self.languages = languages
+        self.sample_words = sample_words
+        self.min_hits = min_hits
+        self._stopwords = {lang: frozenset(stopwords_for_language(lang)) for lang in languages}
+        # Margen generoso por palabra para no recortar la muestra
+        self._sample_chars = sample_words * 12
+
+    def detect(self, text: str) -> str | None:
+        sample = text[:self._sample_chars].lower()
+        words = _WORD.findall(sample)[:self.sample_words]
+
+        hits: Counter[str] = Counter()
+        for lang, stops in self._stopwords.items():
+            hits[lang] = sum(1 for word in words if word in stops)
+            markers = _MARKERS.get(lang)
+            if markers:
+                hits[lang] += sum(1 for ch in sample if ch in markers)
+
+        ranked = hits.most_common(2)
+        if not ranked or ranked[0][1] < self.min_hits:
+            return None
+        if len(ranked) > 1 and ranked[1][1] == ranked[0][1]:
+            return None
+        return ranked[0][0]
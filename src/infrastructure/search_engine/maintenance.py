@@ -0,0 +1,91 @@
+import datetime
+import threading
+from dataclasses import dataclass
+
+from src.infrastructure.search_engine.adapter import IndexStats, WhooshAdapter
+
+
+@dataclass
+class OptimizePolicy:
+    """
+    Reglas para decidir cuándo compactar el índice.
+
+    - max_segments: fusionar si hay más segmentos que este umbral.
+    - max_deleted_ratio: fusionar si la fracción de documentos borrados lo supera.
+    - offpeak_hours: ventana horaria (inicio, fin) en hora local en la que se
+      permite compactar, ej: (2, 5). None = cualquier hora.
+    """
+
+    max_segments: int = 10
+    max_deleted_ratio: float = 0.2
+    offpeak_hours: tuple[int, int] | None = None
+
+    def in_window(self, now: datetime.datetime) -> bool:
+        if self.offpeak_hours is None:
+            return True
+        start, end = self.offpeak_hours
+        if start <= end:
+            return start <= now.hour < end
+        # Ventana que cruza la medianoche, ej: (23, 4)
+        return now.hour >= start or now.hour < end
+
+    def should_optimize(self, stats: IndexStats, now: datetime.datetime) -> bool:
+        if not self.in_window(now):
+            return False
+        return (
+            stats.segment_count > self.max_segments
+            or stats.deleted_ratio > self.max_deleted_ratio
+        )
+
+
+class OptimizeScheduler:
+    """
+    Revisa periódicamente el estado del índice y lo compacta en segundo
+    plano cuando la política lo indica.
+    """
+
+    def __init__(
+        self,
+        adapter: WhooshAdapter,
+        policy: OptimizePolicy | None = None,
+        interval: float = 300.0,
+    ):
+        self.adapter = adapter
+        self.policy = policy or OptimizePolicy()
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def check(self, now: datetime.datetime | None = None) -> bool:
+        """
+        Evalúa la política una vez. Retorna True si se compactó el índice.
+        """
+        stats = self.adapter.get_stats()
+        if not self.policy.should_optimize(stats, now or datetime.datetime.now()):
+            return False
+
+        print(
+            f"Compactando índice: {stats.segment_count} segmentos, "
+            f"{stats.deleted_ratio:.0%} borrados."
+        )
+        return self.adapter.optimize(full=True)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="index-optimizer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Error en el mantenimiento del índice: {e}")
@@ -1,52 +1,170 @@
+import time
 from typing import cast, Any
 from whoosh.qparser import MultifieldParser, OrGroup # <--- CAMBIO AQUÍ
+from whoosh.collectors import TimeLimit, TimeLimitCollector
 from whoosh.highlight import ContextFragmenter
 
+from src.core import metrics
 from src.core.interfaces import IIndexReader
-from src.core.models import SearchResult, ExpandedQuery
+from src.core.models import QueryProfile, SearchResult, ExpandedQuery
 from src.infrastructure.search_engine.adapter import WhooshAdapter
+from src.infrastructure.search_engine.language import LANGUAGE_FIELDS
+
+# Campos que se pueden leer desde columnas, sin cargar el contenido almacenado
+_METADATA_COLUMNS = ("title", "path", "parent")
+
 
 class WhooshReader(IIndexReader):
-    def __init__(self, adapter: WhooshAdapter):
+    """
+    Con `snippets=False` solo se devuelven metadatos (título, ruta, score):
+    se leen de las columnas del índice y nunca se deserializa el contenido
+    almacenado de los documentos.
+    """
+
+    def __init__(self, adapter: WhooshAdapter, limit: int = 20, snippets: bool = True):
         self.adapter = adapter
         self.ix = adapter.get_index()
+        self.limit = limit
+        self.snippets = snippets
 
-    def search(self, query: ExpandedQuery) -> list[SearchResult]:
+    def search(
+        self, query: ExpandedQuery, profile: QueryProfile | None = None
+    ) -> list[SearchResult]:
+        return self.search_within(query, None, profile=profile)[0]
+
+    def search_within(
+        self,
+        query: ExpandedQuery,
+        time_limit: float | None,
+        profile: QueryProfile | None = None,
+    ) -> tuple[list[SearchResult], bool]:
+        """
+        Si la búsqueda supera `time_limit` segundos se corta y se devuelve el
+        top-k de los documentos recorridos hasta entonces, sin resaltado
+        (para no gastar más tiempo en snippets).
+        """
         results_list: list[SearchResult] = []
+        timed_out = False
+        started = time.perf_counter()
         
         query_str = query.to_boolean_query()
         
         with self.ix.searcher() as searcher:
             # --- CAMBIO CRÍTICO: MultifieldParser ---
-            # Busca la query en el Título O en el Contenido
-            parser = MultifieldParser(["title", "content"], self.ix.schema, group=OrGroup) #type: ignore
+            # Busca la query en el Título O en el Contenido (del idioma de la consulta)
+            fields = ["title", *self._content_fields(query.language)]
+            parser = MultifieldParser(fields, self.ix.schema, group=OrGroup) #type: ignore
             
             try:
                 parsed_query = parser.parse(query_str)
+                parsed_at = time.perf_counter()
                 
-                hits = searcher.search(parsed_query, limit=20)
-                
-                # Configuración de snippets (resaltado)
-                hits.fragmenter = ContextFragmenter(maxchars=200, surround=40)
+                # Los pasajes de un mismo documento se agrupan: solo el mejor
+                collapse = "parent" if "parent" in self.ix.schema else None
+                collector = searcher.collector(limit=self.limit, collapse=collapse)
+                if time_limit is not None:
+                    # Temporizador en un hilo (use_alarm=False): las señales
+                    # solo funcionan en el hilo principal
+                    remaining = max(time_limit - (parsed_at - started), 0.001)
+                    collector = TimeLimitCollector(collector, timelimit=remaining, use_alarm=False)
+
+                with metrics.timed("index_search_seconds"):
+                    try:
+                        searcher.search_with_collector(parsed_query, collector)
+                    except TimeLimit:
+                        timed_out = True
+                        metrics.increment("search_timeouts_total")
+                hits = collector.results()
+                searched_at = time.perf_counter()
                 
-                for hit in hits:
-                    # Intentamos sacar el snippet del contenido
-                    snippet = hit.highlights("content") or cast(str, hit.get("content", ""))[:200]
-                    
-                    # Manejo seguro del score
-                    raw_score = hit.score
-                    safe_score: float = float(raw_score) if raw_score is not None else 0.0
-
-                    result = SearchResult(
-                        title=cast(str, hit.get("title", "Sin título")),
-                        path=cast(str, hit.get("path", "")),
-                        score=safe_score,
-                        snippet=snippet
-                    )
-                    results_list.append(result)
+                if self.snippets and not timed_out:
+                    results_list = self._with_snippets(hits)
+                else:
+                    results_list = self._metadata_only(searcher, hits)
+
+                if profile is not None:
+                    profile.parsed_node_count = _count_nodes(parsed_query)
+                    profile.matched_docs = len(hits)
+                    profile.returned_docs = len(results_list)
+                    profile.timings["parse"] = parsed_at - started
+                    profile.timings["index_search"] = searched_at - parsed_at
+                    profile.timings["highlight"] = time.perf_counter() - searched_at
                     
             except Exception as e:
+                metrics.increment("search_errors_total")
                 print(f"Error durante la búsqueda: {e}")
-                return []
+                return [], False
                 
-        return results_list
\ No newline at end of file
+        return results_list, timed_out
+
+    def _content_fields(self, language: str | None) -> list[str]:
+        """
+        Campo de contenido del idioma de la consulta; si el idioma es
+        desconocido, los de todos los idiomas que tenga el esquema.
+        """
+        schema = self.ix.schema
+        fields = [
+            field for lang, field in LANGUAGE_FIELDS.items()
+            if field in schema and language in (None, lang)
+        ]
+        return fields or ["content"]
+
+    def _with_snippets(self, hits: Any) -> list[SearchResult]:
+        # Configuración de snippets (resaltado)
+        hits.fragmenter = ContextFragmenter(maxchars=200, surround=40)
+
+        results_list: list[SearchResult] = []
+        for hit in hits:
+            # Intentamos sacar el snippet del contenido
+            with metrics.timed("highlight_seconds"):
+                # El texto está almacenado en `content`, pero los términos de
+                # la consulta son los del campo del idioma del documento
+                text = cast(str, hit.get("content", ""))
+                field = LANGUAGE_FIELDS.get(hit.get("language") or "", "content")
+                snippet = hit.highlights(field, text=text) or text[:200]
+
+            results_list.append(
+                SearchResult(
+                    title=cast(str, hit.get("title", "Sin título")),
+                    path=cast(str, hit.get("parent") or hit.get("path", "")),
+                    score=_safe_score(hit),
+                    snippet=snippet,
+                    page=hit.get("page"),
+                    offset=hit.get("offset"),
+                )
+            )
+        return results_list
+
+    def _metadata_only(self, searcher: Any, hits: Any) -> list[SearchResult]:
+        reader = searcher.reader()
+        if not all(reader.has_column(name) for name in _METADATA_COLUMNS):
+            # Índice creado con un esquema sin columnas: campos almacenados
+            return [
+                SearchResult(
+                    title=cast(str, hit.get("title", "Sin título")),
+                    path=cast(str, hit.get("parent") or hit.get("path", "")),
+                    score=_safe_score(hit),
+                )
+                for hit in hits
+            ]
+
+        titles, paths, parents = (reader.column_reader(name) for name in _METADATA_COLUMNS)
+        return [
+            SearchResult(
+                title=titles[hit.docnum] or "Sin título",
+                path=parents[hit.docnum] or paths[hit.docnum],
+                score=_safe_score(hit),
+            )
+            for hit in hits
+        ]
+
+
+def _safe_score(hit: Any) -> float:
+    # Manejo seguro del score
+    raw_score = hit.score
+    return float(raw_score) if raw_score is not None else 0.0
+
+
+def _count_nodes(query: Any) -> int:
+    """Número de nodos del árbol de la consulta parseada."""
+    return 1 + sum(_count_nodes(child) for child in query.children())
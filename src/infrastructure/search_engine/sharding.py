@@ -0,0 +1,243 @@
+import heapq
+import os
+import time
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from src.core.interfaces import IIndexReader, IIndexWriter
+from src.core.models import Document, ExpandedQuery, QueryProfile, SearchResult
+from src.infrastructure.search_engine.adapter import IndexStats, WhooshAdapter
+from src.infrastructure.search_engine.reader import WhooshReader
+from src.infrastructure.search_engine.writer import WhooshWriter
+
+
+def shard_for(path: str, num_shards: int) -> int:
+    """Partición estable por `path` (crc32: igual en todos los procesos, a diferencia de hash())."""
+    return zlib.crc32(path.encode("utf-8")) % num_shards
+
+
+class ShardedWhooshAdapter:
+    """
+    Reparte el índice en N directorios Whoosh independientes (shards).
+    Cada shard tiene su propio cerrojo de escritura, así que se escriben
+    y consultan en paralelo.
+    """
+
+    def __init__(self, base_dir: str, num_shards: int):
+        if num_shards < 1:
+            raise ValueError("num_shards debe ser >= 1")
+        self.base_dir = base_dir
+        self.shards = [
+            WhooshAdapter(os.path.join(base_dir, f"shard_{i:02d}")) for i in range(num_shards)
+        ]
+
+    @property
+    def num_shards(self) -> int:
+        return len(self.shards)
+
+    def shard_for(self, path: str) -> WhooshAdapter:
+        return self.shards[shard_for(path, self.num_shards)]
+
+    def reset_index(self) -> None:
+        for shard in self.shards:
+            shard.reset_index()
+
+    def get_stats(self) -> list[IndexStats]:
+        return [shard.get_stats() for shard in self.shards]
+
+
+# --- Funciones de nivel de módulo: se ejecutan en los procesos del pool ---
+
+# Operación pendiente: ("add" | "update", [Document]) o ("delete", [path])
+_ShardOp = tuple[str, list]
+
+
+def _apply_shard_ops(index_dir: str, ops: list[_ShardOp], batch_size: int) -> int:
+    writer = WhooshWriter(WhooshAdapter(index_dir), batch_size=batch_size)
+    for action, items in ops:
+        if action == "add":
+            writer.add_documents(items)
+        elif action == "update":
+            writer.update_documents(items)
+        else:
+            writer.delete_documents(items)
+    writer.commit()
+    return sum(len(items) for _, items in ops)
+
+
+# Un lector por shard y proceso del pool, reutilizado entre consultas
+_shard_readers: dict[str, WhooshReader] = {}
+
+# Segundos extra que se espera a un shard, sobre el presupuesto, para recibir
+# su top-k parcial desde el proceso del pool
+_RESULT_GRACE = 0.05
+
+
+def _search_shard(
+    index_dir: str, query: ExpandedQuery, limit: int, time_limit: float | None = None
+) -> tuple[list[SearchResult], QueryProfile, bool]:
+    reader = _shard_readers.get(index_dir)
+    if reader is None:
+        reader = _shard_readers[index_dir] = WhooshReader(WhooshAdapter(index_dir), limit=limit)
+    profile = QueryProfile(query=query.original_text)
+    results, partial = reader.search_within(query, time_limit, profile=profile)
+    return results, profile, partial
+
+
+class ShardedWhooshWriter(IIndexWriter):
+    """
+    Particiona los documentos por hash de `path` y, en cada commit, escribe
+    todos los shards en paralelo (un proceso por shard).
+    """
+
+    def __init__(
+        self,
+        adapter: ShardedWhooshAdapter,
+        batch_size: int = 0,
+        max_workers: int | None = None,
+    ):
+        self.adapter = adapter
+        self.batch_size = batch_size
+        self.max_workers = max_workers or adapter.num_shards
+        self._pending: list[list[_ShardOp]] = [[] for _ in adapter.shards]
+
+    def add_documents(self, docs: list[Document]) -> None:
+        self._partition("add", docs)
+
+    def update_documents(self, docs: list[Document]) -> None:
+        # El mismo path cae siempre en el mismo shard: el reemplazo es local
+        self._partition("update", docs)
+
+    def delete_documents(self, paths: list[str]) -> None:
+        buckets: list[list[str]] = [[] for _ in self.adapter.shards]
+        for path in paths:
+            buckets[shard_for(path, self.adapter.num_shards)].append(path)
+        self._queue_ops("delete", buckets)
+
+    def _partition(self, action: str, docs: list[Document]) -> None:
+        buckets: list[list[Document]] = [[] for _ in self.adapter.shards]
+        for doc in docs:
+            # Los pasajes van al shard de su documento: así se agrupan y se borran juntos
+            key = doc.metadata.get("parent", doc.path)
+            buckets[shard_for(key, self.adapter.num_shards)].append(doc)
+        self._queue_ops(action, buckets)
+
+    def _queue_ops(self, action: str, buckets: list[list]) -> None:
+        for shard_ops, items in zip(self._pending, buckets):
+            if items:
+                shard_ops.append((action, items))
+
+    def commit(self) -> None:
+        """
+        Confirma cada shard en su propio proceso. Los shards son índices
+        independientes: un fallo en uno no deshace los demás, pero al final
+        se lanza RuntimeError con los shards que no se pudieron confirmar.
+        """
+        jobs = [
+            (shard.index_dir, ops)
+            for shard, ops in zip(self.adapter.shards, self._pending)
+            if ops
+        ]
+        self._pending = [[] for _ in self.adapter.shards]
+        if not jobs:
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+            futures = [
+                pool.submit(_apply_shard_ops, index_dir, ops, self.batch_size)
+                for index_dir, ops in jobs
+            ]
+            failed: list[str] = []
+            for (index_dir, _), future in zip(jobs, futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Error en commit del shard {index_dir}: {e}")
+                    failed.append(index_dir)
+        if failed:
+            raise RuntimeError(f"Falló el commit de {len(failed)} shard(s): {', '.join(failed)}")
+
+    def cancel(self) -> None:
+        self._pending = [[] for _ in self.adapter.shards]
+
+    def generation(self) -> int | None:
+        return max(shard.get_index().latest_generation() for shard in self.adapter.shards)
+
+
+class ShardedWhooshReader(IIndexReader):
+    """
+    Scatter-gather: lanza la consulta a todos los shards en un pool de
+    procesos y fusiona los top-k locales en un top-k global por score.
+
+    Nota: cada shard puntúa BM25 con sus propias estadísticas (IDF local).
+    Con particionado por hash los shards son muestras homogéneas del
+    corpus y los scores resultan comparables.
+    """
+
+    def __init__(
+        self,
+        adapter: ShardedWhooshAdapter,
+        limit: int = 20,
+        executor: Executor | None = None,
+    ):
+        self.adapter = adapter
+        self.limit = limit
+        self._executor = executor or ProcessPoolExecutor(max_workers=adapter.num_shards)
+
+    def search(
+        self, query: ExpandedQuery, profile: QueryProfile | None = None
+    ) -> list[SearchResult]:
+        return self.search_within(query, None, profile=profile)[0]
+
+    def search_within(
+        self,
+        query: ExpandedQuery,
+        time_limit: float | None,
+        profile: QueryProfile | None = None,
+    ) -> tuple[list[SearchResult], bool]:
+        """
+        Cada shard corta su búsqueda al agotar `time_limit`; los shards que
+        ni siquiera responden a tiempo se omiten y el resultado es parcial.
+        """
+        deadline = None if time_limit is None else time.monotonic() + time_limit
+        futures = [
+            self._executor.submit(_search_shard, shard.index_dir, query, self.limit, time_limit)
+            for shard in self.adapter.shards
+        ]
+
+        partials: list[list[SearchResult]] = []
+        partial = False
+        for future in futures:
+            try:
+                wait = None if deadline is None else max(deadline - time.monotonic(), 0.0) + _RESULT_GRACE
+                results, shard_profile, shard_partial = future.result(timeout=wait)
+            except FutureTimeout:
+                future.cancel()
+                partial = True
+                continue
+            except Exception as e:
+                print(f"Error buscando en un shard: {e}")
+                continue
+            partials.append(results)
+            partial = partial or shard_partial
+            if profile is not None:
+                _merge_profile(profile, shard_profile)
+
+        merged = heapq.nlargest(
+            self.limit, (r for results in partials for r in results), key=lambda r: r.score
+        )
+        if profile is not None:
+            profile.returned_docs = len(merged)
+        return merged, partial
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+
+def _merge_profile(target: QueryProfile, shard: QueryProfile) -> None:
+    target.matched_docs += shard.matched_docs
+    target.parsed_node_count = max(target.parsed_node_count, shard.parsed_node_count)
+    # Los shards corren en paralelo: la etapa dura lo que el shard más lento
+    for stage, seconds in shard.timings.items():
+        target.timings[stage] = max(target.timings.get(stage, 0.0), seconds)
@@ -0,0 +1,336 @@
+import heapq
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Any, cast
+
+from src.infrastructure.search_engine.adapter import WhooshAdapter
+from src.infrastructure.search_engine.language import LANGUAGE_FIELDS
+
+# Formato binario del índice de completado (todo en orden de bytes nativo):
+#   cabecera: magic, versión, nº entradas, nº prefijos cacheados, k de la caché
+#   offsets de entradas (n+1) | pesos (n) | offsets de prefijos (m+1)
+#   ids top-k por prefijo (m * k) | blob de entradas | blob de prefijos
+# Cada entrada es "clave\x1ftexto_visible" en UTF-8, ordenadas por clave.
+_MAGIC = b"CSUG"
+_VERSION = 1
+_HEADER = struct.Struct("=4sIIII")
+_SEP = "\x1f"
+_EMPTY_SLOT = 0xFFFFFFFF
+# Centinela para calcular el final del rango de un prefijo con bisect
+_MAX_CHAR = "\U0010ffff"
+
+
+def encode_completions(
+    entries: dict[str, tuple[int, str]], prefix_cache_len: int = 2, cache_k: int = 10
+) -> bytes:
+    """
+    Serializa las entradas {clave: (peso, texto_visible)} al formato binario.
+
+    Los prefijos cortos (hasta `prefix_cache_len` caracteres) abarcan rangos
+    enormes del vocabulario, así que su top-k se precalcula aquí para que
+    la consulta no tenga que recorrerlos.
+    """
+    keys = sorted(entries)
+
+    offsets = array("I", [0])
+    weights = array("I")
+    blob = bytearray()
+    for key in keys:
+        weight, display = entries[key]
+        record = key if display == key else f"{key}{_SEP}{display}"
+        blob += record.encode("utf-8")
+        offsets.append(len(blob))
+        weights.append(min(weight, _EMPTY_SLOT - 1))
+
+    # Top-k de cada prefijo corto: {prefijo: [(peso, id), ...]}
+    tops: dict[str, list[tuple[int, int]]] = {}
+    for idx, key in enumerate(keys):
+        for length in range(1, min(prefix_cache_len, len(key)) + 1):
+            heap = tops.setdefault(key[:length], [])
+            item = (weights[idx], -idx)
+            if len(heap) < cache_k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    prefixes = sorted(tops)
+    prefix_offsets = array("I", [0])
+    prefix_ids = array("I")
+    prefix_blob = bytearray()
+    for prefix in prefixes:
+        prefix_blob += prefix.encode("utf-8")
+        prefix_offsets.append(len(prefix_blob))
+        ranked = [-neg_idx for _, neg_idx in sorted(tops[prefix], reverse=True)]
+        ranked += [_EMPTY_SLOT] * (cache_k - len(ranked))
+        prefix_ids.extend(ranked)
+
+    header = _HEADER.pack(_MAGIC, _VERSION, len(keys), len(prefixes), cache_k)
+    return b"".join(
+        [
+            header,
+            offsets.tobytes(),
+            weights.tobytes(),
+            prefix_offsets.tobytes(),
+            prefix_ids.tobytes(),
+            bytes(blob),
+            bytes(prefix_blob),
+        ]
+    )
+
+
+class _StringTable:
+    """Vista perezosa (indexable) sobre un blob de cadenas con tabla de offsets."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return bytes(self._blob[self._offsets[i] : self._offsets[i + 1]]).decode("utf-8")
+
+
+class _KeyView:
+    """Expone solo la clave de cada entrada para la búsqueda binaria."""
+
+    def __init__(self, table: _StringTable):
+        self._table = table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __getitem__(self, i: int) -> str:
+        return self._table[i].split(_SEP, 1)[0]
+
+
+class CompletionIndex:
+    """
+    Índice de autocompletado de solo lectura.
+
+    Se apoya en un array ordenado con búsqueda binaria. Cuando se abre desde
+    disco el fichero se mapea en memoria (mmap), de modo que varios workers
+    comparten las mismas páginas físicas.
+    """
+
+    def __init__(self, buffer: Any):
+        self._mmap = buffer if isinstance(buffer, mmap.mmap) else None
+        view = memoryview(buffer)
+        magic, version, n, m, cache_k = _HEADER.unpack_from(view, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Formato de índice de completado no reconocido.")
+
+        pos = _HEADER.size
+        sections: list[memoryview] = []
+        for count in (n + 1, n, m + 1, m * cache_k):
+            size = count * 4
+            sections.append(view[pos : pos + size].cast("I"))
+            pos += size
+        offsets, self._weights, prefix_offsets, self._prefix_ids = sections
+
+        entries_end = pos + offsets[n]
+        entries_blob = view[pos:entries_end]
+        prefixes_blob = view[entries_end : entries_end + prefix_offsets[m]]
+        self._entries = _StringTable(offsets, entries_blob)
+        self._keys = _KeyView(self._entries)
+        self._prefixes = _StringTable(prefix_offsets, prefixes_blob)
+        self._cache_k = cache_k
+        self._views = [*sections, entries_blob, prefixes_blob, view]
+
+    @classmethod
+    def from_file(cls, path: str) -> "CompletionIndex":
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mm)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def suggest(self, prefix: str, k: int = 10) -> list[str]:
+        """
+        Devuelve hasta `k` completados para el prefijo, ordenados por peso.
+        """
+        prefix = prefix.lower().lstrip()
+        if not prefix or k <= 0:
+            return []
+
+        if k <= self._cache_k:
+            cached = self._cached_ids(prefix)
+            if cached is not None:
+                return [self._display(i) for i in cached[:k]]
+
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + _MAX_CHAR, lo)
+        if hi - lo <= k:
+            ids = sorted(range(lo, hi), key=lambda i: (-self._weights[i], i))
+        else:
+            ids = heapq.nlargest(k, range(lo, hi), key=self._weights.__getitem__)
+        return [self._display(i) for i in ids]
+
+    def close(self) -> None:
+        """Libera las vistas y el mmap subyacente."""
+        for view in self._views:
+            view.release()
+        self._views = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _cached_ids(self, prefix: str) -> list[int] | None:
+        pos = bisect_left(self._prefixes, prefix)
+        if pos >= len(self._prefixes) or self._prefixes[pos] != prefix:
+            return None
+        start = pos * self._cache_k
+        slots = self._prefix_ids[start : start + self._cache_k]
+        return [i for i in slots if i != _EMPTY_SLOT]
+
+    def _display(self, i: int) -> str:
+        return self._entries[i].split(_SEP, 1)[-1]
+
+
+class CompletionIndexBuilder:
+    """
+    Construye el índice de completado a partir del índice Whoosh:
+    títulos de documentos y términos más frecuentes del contenido (de los
+    campos de todos los idiomas).
+    """
+
+    def __init__(
+        self,
+        adapter: WhooshAdapter,
+        output_path: str,
+        max_terms: int = 20000,
+        title_weight: int = 5,
+        prefix_cache_len: int = 2,
+        cache_k: int = 10,
+    ):
+        self.adapter = adapter
+        self.output_path = output_path
+        self.max_terms = max_terms
+        # Un título cuenta como `title_weight` documentos que contienen el término
+        self.title_weight = title_weight
+        self.prefix_cache_len = prefix_cache_len
+        self.cache_k = cache_k
+
+    def collect(self) -> dict[str, tuple[int, str]]:
+        """Reúne las entradas candidatas con su peso."""
+        entries: dict[str, tuple[int, str]] = {}
+
+        def add(text: str, weight: int) -> None:
+            display = " ".join(text.split())
+            key = display.lower()
+            if not key:
+                return
+            current = entries.get(key)
+            if current is None:
+                entries[key] = (weight, display)
+            else:
+                entries[key] = (current[0] + weight, current[1])
+
+        ix = self.adapter.get_index()
+        with ix.searcher() as searcher:
+            reader = searcher.reader()
+
+            if reader.has_column("title") and reader.has_column("parent"):
+                # Columnas: no se deserializa el contenido almacenado de cada documento
+                titles, parents = reader.column_reader("title"), reader.column_reader("parent")
+                seen_parents: set[str] = set()
+                for docnum in reader.all_doc_ids():
+                    parent = parents[docnum]
+                    # El título de un documento troceado cuenta una sola vez
+                    if parent:
+                        if parent in seen_parents:
+                            continue
+                        seen_parents.add(parent)
+                    add(titles[docnum], self.title_weight)
+            else:
+                # Índice creado con un esquema sin columnas: campos almacenados
+                for fields in reader.all_stored_fields():
+                    if fields.get("offset", 0) > 0:
+                        continue
+                    add(cast(str, fields.get("title", "")), self.title_weight)
+
+            # Cada documento está indexado solo en el campo de su idioma:
+            # las frecuencias de un mismo término en varios campos se suman
+            doc_freq: dict[str, int] = {}
+            for field in LANGUAGE_FIELDS.values():
+                if field not in ix.schema:
+                    continue
+                schema_field = ix.schema[field]
+                for btext, terminfo in reader.iter_prefix(field, ""):
+                    term = schema_field.from_bytes(btext)
+                    doc_freq[term] = doc_freq.get(term, 0) + terminfo.doc_frequency()
+
+            frequent = heapq.nlargest(self.max_terms, doc_freq.items(), key=lambda item: item[1])
+            for term, freq in frequent:
+                add(term, freq)
+
+        return entries
+
+    def build(self) -> int:
+        """
+        Genera el fichero de completado y lo publica de forma atómica
+        (los lectores con el fichero anterior mapeado no se ven afectados).
+        Retorna el número de entradas.
+        """
+        entries = self.collect()
+        data = encode_completions(entries, self.prefix_cache_len, self.cache_k)
+
+        tmp_path = f"{self.output_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.output_path)
+        return len(entries)
+
+
+class CompletionRefresher:
+    """
+    Regenera el índice de completado en su propio hilo. Tras un commit basta
+    con pedirlo (`request`, no bloquea): el escritor no espera a la
+    reconstrucción y los commits seguidos se agrupan en una sola, como
+    mucho cada `min_interval` segundos.
+    """
+
+    def __init__(self, builder: CompletionIndexBuilder, min_interval: float = 60.0):
+        self.builder = builder
+        self.min_interval = min_interval
+        self._pending = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def request(self) -> None:
+        self._pending.set()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="completion-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        # Despierta al hilo si esperaba una petición
+        self._pending.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            self._pending.wait()
+            if self._stop.is_set():
+                return
+            self._pending.clear()
+            try:
+                self.builder.build()
+            except Exception as e:
+                print(f"Error regenerando el autocompletado: {e}")
+            # Las peticiones que lleguen mientras tanto esperan a la siguiente ronda
+            if self._stop.wait(self.min_interval):
+                return
@@ -0,0 +1,349 @@
+import json
+import os
+import shutil
+import time
+from collections import Counter
+from dataclasses import replace
+from typing import Any, cast
+
+import numpy as np
+
+from src.core.interfaces import IReranker
+from src.core.models import ExpandedQuery, SearchResult
+from src.infrastructure.search_engine.adapter import WhooshAdapter
+from src.infrastructure.search_engine.analyzer import NLTKAnalyzer, SpanishAnalyzer
+from src.infrastructure.search_engine.language import LANGUAGE_FIELDS
+
+# Ficheros de cada versión del índice vectorial (en `vector_dir/<versión>/`)
+DOC_VECTORS = "doc_vectors.npy"
+TERM_VECTORS = "term_vectors.npy"
+VOCAB = "vocab.json"
+# Puntero a la versión publicada: se reemplaza de forma atómica cuando la
+# versión nueva está completa, así que nunca se mezclan ficheros de dos builds
+CURRENT = "CURRENT"
+
+
+class VectorIndexBuilder:
+    """
+    Construye vectores semánticos (LSA) a partir del propio índice Whoosh.
+
+    La matriz TF-IDF documento-término se lee de las listas de postings y se
+    reduce con una SVD aleatorizada a `dims` dimensiones. Se guardan:
+      - doc_vectors.npy: un vector normalizado por documento (filas x dims).
+      - term_vectors.npy: la proyección de cada término, ya ponderada por IDF,
+        para convertir una consulta en vector sumando filas.
+      - vocab.json: términos y la ruta de cada fila.
+
+    Cada construcción se escribe en su propio directorio de versión y se
+    publica reemplazando el puntero CURRENT; se conserva la versión anterior
+    para los lectores que la estén abriendo en ese momento.
+
+    Los pasajes de un documento troceado se suman en un único vector. El
+    vocabulario reúne los términos de los campos de contenido de todos los
+    idiomas (cada documento solo está indexado en el de su idioma).
+    """
+
+    def __init__(
+        self,
+        adapter: WhooshAdapter,
+        vector_dir: str,
+        dims: int = 128,
+        max_terms: int = 20000,
+        min_df: int = 2,
+        power_iterations: int = 2,
+        seed: int = 0,
+    ):
+        self.adapter = adapter
+        self.vector_dir = vector_dir
+        self.dims = dims
+        self.max_terms = max_terms
+        self.min_df = min_df
+        self.power_iterations = power_iterations
+        self.seed = seed
+
+    def build(self) -> int:
+        """Genera y publica el índice vectorial. Retorna el nº de documentos."""
+        ix = self.adapter.get_index()
+        with ix.searcher() as searcher:
+            reader = searcher.reader()
+            keys, row_of_docnum = _document_rows(reader)
+            terms, rows, cols, counts = _collect_postings(reader, row_of_docnum, self.max_terms, self.min_df)
+
+        if not keys or not terms:
+            return 0
+
+        n_docs, n_terms = len(keys), len(terms)
+        df = np.bincount(cols, minlength=n_terms)
+        idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+
+        # TF sublineal x IDF, filas normalizadas (L2)
+        vals = (1.0 + np.log(counts)) * idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=vals * vals, minlength=n_docs))
+        vals /= np.maximum(norms, 1e-12)[rows]
+
+        matrix = _SparseMatrix(rows, cols, vals, (n_docs, n_terms))
+        k = min(self.dims, n_docs, n_terms)
+        doc_vectors, term_basis = _randomized_svd(matrix, k, self.power_iterations, self.seed)
+
+        doc_vectors /= np.maximum(np.linalg.norm(doc_vectors, axis=1, keepdims=True), 1e-12)
+        term_vectors = term_basis * idf[:, None]
+
+        version = f"v{time.time_ns()}"
+        version_dir = os.path.join(self.vector_dir, version)
+        os.makedirs(version_dir)
+        np.save(os.path.join(version_dir, DOC_VECTORS), doc_vectors.astype(np.float32))
+        np.save(os.path.join(version_dir, TERM_VECTORS), term_vectors.astype(np.float32))
+        with open(os.path.join(version_dir, VOCAB), "w", encoding="utf-8") as f:
+            json.dump({"terms": terms, "paths": keys}, f, ensure_ascii=False)
+
+        pointer = os.path.join(self.vector_dir, CURRENT)
+        previous = _read_pointer(self.vector_dir)
+        with open(pointer + ".tmp", "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(pointer + ".tmp", pointer)
+        self._remove_old_versions(keep={version, previous})
+
+        return n_docs
+
+    def _remove_old_versions(self, keep: set[str | None]) -> None:
+        for name in os.listdir(self.vector_dir):
+            path = os.path.join(self.vector_dir, name)
+            if name.startswith("v") and name not in keep and os.path.isdir(path):
+                # Los lectores que aún la tengan mapeada conservan sus páginas
+                shutil.rmtree(path, ignore_errors=True)
+
+
+class VectorIndex:
+    """
+    Índice vectorial de solo lectura. Las matrices se abren con
+    `mmap_mode="r"`: los workers comparten las páginas del sistema de
+    ficheros y solo se leen las filas de los candidatos.
+
+    Abre la versión publicada en `vector_dir` (o la indicada en `version`).
+    """
+
+    def __init__(self, vector_dir: str, version: str | None = None):
+        self.version = version or _read_pointer(vector_dir)
+        if self.version is None:
+            raise FileNotFoundError(f"No hay ningún índice vectorial publicado en {vector_dir}")
+        version_dir = os.path.join(vector_dir, self.version)
+        self.doc_vectors = np.load(os.path.join(version_dir, DOC_VECTORS), mmap_mode="r")
+        self.term_vectors = np.load(os.path.join(version_dir, TERM_VECTORS), mmap_mode="r")
+        with open(os.path.join(version_dir, VOCAB), "r", encoding="utf-8") as f:
+            vocab = json.load(f)
+        self.term_ids = {term: i for i, term in enumerate(vocab["terms"])}
+        self.row_of = {path: i for i, path in enumerate(vocab["paths"])}
+
+    def embed(self, terms: list[str]) -> np.ndarray | None:
+        """Vector normalizado de una bolsa de términos (None si ninguno es conocido)."""
+        counts = Counter(t for t in terms if t in self.term_ids)
+        if not counts:
+            return None
+        ids = np.fromiter((self.term_ids[t] for t in counts), dtype=np.int64, count=len(counts))
+        weights = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+        vector = weights @ self.term_vectors[ids]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+
+    def similarities(self, paths: list[str], query_vector: np.ndarray) -> np.ndarray:
+        """Coseno entre la consulta y cada documento (0 si no tiene vector)."""
+        rows = np.fromiter((self.row_of.get(p, -1) for p in paths), dtype=np.int64, count=len(paths))
+        known = rows >= 0
+        scores = np.zeros(len(paths), dtype=np.float32)
+        if known.any():
+            scores[known] = self.doc_vectors[rows[known]] @ query_vector
+        return scores
+
+
+class VectorReranker(IReranker):
+    """
+    Reordena el top-N de BM25 combinando su score (normalizado al máximo)
+    con la similitud coseno del espacio LSA:
+
+        score = alpha * bm25 / max(bm25) + (1 - alpha) * max(coseno, 0)
+
+    El lector debe devolver más candidatos (ej: 100) de los que se muestran:
+    aquí se recortan a `limit` tras reordenar. Recarga el índice vectorial
+    cuando se reconstruye en disco.
+    """
+
+    def __init__(
+        self,
+        vector_dir: str,
+        alpha: float = 0.5,
+        limit: int | None = 20,
+        stopwords_lang: str = "english",
+    ):
+        self.vector_dir = vector_dir
+        self.alpha = alpha
+        self.limit = limit
+        # Mismo análisis que el campo de contenido de cada idioma
+        self._analyzers = {"english": NLTKAnalyzer(stopwords_lang=stopwords_lang), "spanish": SpanishAnalyzer()}
+        self._index: VectorIndex | None = None
+        self._mtime: float | None = None
+
+    def rerank(self, query: ExpandedQuery, results: list[SearchResult]) -> list[SearchResult]:
+        index = self._current_index()
+        if index is None or len(results) < 2:
+            return results[:self.limit]
+
+        # Los términos del vocabulario son lemas: se analiza como el campo
+        # del idioma de la consulta (con todos si es desconocido)
+        analyzers = [
+            analyzer for language, analyzer in self._analyzers.items()
+            if query.language in (None, language)
+        ] or [self._analyzers["english"]]
+        terms = [cast(Any, token).text for analyzer in analyzers for token in analyzer(query.original_text)]
+        query_vector = index.embed(terms)
+        if query_vector is None:
+            return results[:self.limit]
+
+        cosine = np.clip(index.similarities([r.path for r in results], query_vector), 0.0, None)
+        bm25 = np.array([r.score for r in results], dtype=np.float32)
+        top = bm25.max()
+        if top > 0:
+            bm25 /= top
+
+        combined = self.alpha * bm25 + (1.0 - self.alpha) * cosine
+        order = np.argsort(-combined, kind="stable")[:self.limit]
+        return [replace(results[i], score=float(combined[i])) for i in order]
+
+    def _current_index(self) -> VectorIndex | None:
+        try:
+            mtime = os.path.getmtime(os.path.join(self.vector_dir, CURRENT))
+        except OSError:
+            # Aún no se ha construido el índice vectorial
+            return None
+
+        if self._index is None or mtime != self._mtime:
+            version = _read_pointer(self.vector_dir)
+            if version is not None and (self._index is None or version != self._index.version):
+                self._index = VectorIndex(self.vector_dir, version)
+            self._mtime = mtime
+
+        return self._index
+
+
+class _SparseMatrix:
+    """Matriz dispersa en formato COO con los dos productos que necesita la SVD."""
+
+    def __init__(self, rows: np.ndarray, cols: np.ndarray, vals: np.ndarray, shape: tuple[int, int]):
+        self.rows = rows
+        self.cols = cols
+        self.vals = vals
+        self.shape = shape
+
+    def dot(self, dense: np.ndarray) -> np.ndarray:
+        """self @ dense"""
+        out = np.empty((self.shape[0], dense.shape[1]))
+        for j in range(dense.shape[1]):
+            out[:, j] = np.bincount(self.rows, weights=self.vals * dense[self.cols, j], minlength=self.shape[0])
+        return out
+
+    def tdot(self, dense: np.ndarray) -> np.ndarray:
+        """self.T @ dense"""
+        out = np.empty((self.shape[1], dense.shape[1]))
+        for j in range(dense.shape[1]):
+            out[:, j] = np.bincount(self.cols, weights=self.vals * dense[self.rows, j], minlength=self.shape[1])
+        return out
+
+
+def _randomized_svd(
+    matrix: _SparseMatrix, k: int, power_iterations: int, seed: int, oversample: int = 10
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    SVD truncada aleatorizada (Halko et al.). Retorna los vectores de los
+    documentos (U * S) y la base de términos (V), ambos con `k` columnas.
+    """
+    n_docs, n_terms = matrix.shape
+    width = min(k + oversample, n_docs, n_terms)
+    rng = np.random.default_rng(seed)
+
+    sample = matrix.dot(rng.standard_normal((n_terms, width)))
+    for _ in range(power_iterations):
+        basis, _ = np.linalg.qr(sample)
+        term_side, _ = np.linalg.qr(matrix.tdot(basis))
+        sample = matrix.dot(term_side)
+    basis, _ = np.linalg.qr(sample)
+
+    small = matrix.tdot(basis).T  # (width x términos)
+    u_small, singular, vt = np.linalg.svd(small, full_matrices=False)
+    doc_vectors = basis @ (u_small[:, :k] * singular[:k])
+    return doc_vectors, vt[:k].T
+
+
+def _document_rows(reader: Any) -> tuple[list[str], dict[int, int]]:
+    """Asigna una fila a cada documento vivo; los pasajes comparten la de su origen."""
+    if reader.has_column("path") and reader.has_column("parent"):
+        # Columnas: no se deserializa el contenido almacenado de cada documento
+        paths, parents = reader.column_reader("path"), reader.column_reader("parent")
+        docs = ((docnum, parents[docnum] or paths[docnum]) for docnum in reader.all_doc_ids())
+    else:
+        docs = (
+            (docnum, fields.get("parent") or fields.get("path", ""))
+            for docnum, fields in reader.iter_docs()
+        )
+
+    keys: list[str] = []
+    row_of_key: dict[str, int] = {}
+    row_of_docnum: dict[int, int] = {}
+    for docnum, key in docs:
+        row = row_of_key.get(key)
+        if row is None:
+            row = row_of_key[key] = len(keys)
+            keys.append(key)
+        row_of_docnum[docnum] = row
+    return keys, row_of_docnum
+
+
+def _collect_postings(
+    reader: Any, row_of_docnum: dict[int, int], max_terms: int, min_df: int
+) -> tuple[list[str], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vocabulario (términos más frecuentes) y la matriz de frecuencias en COO.
+    Un mismo término en varios campos de contenido ocupa una sola columna.
+    """
+    fields = [field for field in LANGUAGE_FIELDS.values() if field in reader.schema]
+    doc_freq: Counter[str] = Counter()
+    for field in fields:
+        schema_field = reader.schema[field]
+        for btext, terminfo in reader.iter_prefix(field, ""):
+            doc_freq[schema_field.from_bytes(btext)] += terminfo.doc_frequency()
+    candidates = sorted(((df, term) for term, df in doc_freq.items() if df >= min_df), reverse=True)
+
+    terms: list[str] = []
+    rows: list[int] = []
+    cols: list[int] = []
+    counts: list[float] = []
+    for _, term in candidates[:max_terms]:
+        col = len(terms)
+        terms.append(term)
+        # Un mismo documento troceado puede aparecer varias veces: se acumula
+        per_row: Counter[int] = Counter()
+        for field in fields:
+            if not reader.doc_frequency(field, term):
+                continue
+            for docnum, freq in reader.postings(field, term).items_as("frequency"):
+                row = row_of_docnum.get(docnum)
+                if row is not None:
+                    per_row[row] += freq
+        rows.extend(per_row)
+        cols.extend([col] * len(per_row))
+        counts.extend(per_row.values())
+
+    return (
+        terms,
+        np.asarray(rows, dtype=np.int64),
+        np.asarray(cols, dtype=np.int64),
+        np.asarray(counts, dtype=np.float64),
+    )
+
+
+def _read_pointer(vector_dir: str) -> str | None:
+    """Versión publicada en `vector_dir` (None si aún no hay ninguna)."""
+    try:
+        with open(os.path.join(vector_dir, CURRENT), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
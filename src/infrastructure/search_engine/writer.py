@@ -1,38 +1,211 @@
+from typing import Any
+
+from src.core import metrics
 from src.core.interfaces import IIndexWriter
 from src.core.models import Document
 from src.infrastructure.search_engine.adapter import WhooshAdapter
+from src.infrastructure.search_engine.analyzer import BatchAnalyzer
+from src.infrastructure.search_engine.language import (
+    DEFAULT_LANGUAGE, LANGUAGE_FIELDS, LanguageDetector,
+)
 
 ###CAMBIAR DEBUG A LOGGIN
 
 class WhooshWriter(IIndexWriter):
     """
     Implementación de escritura usando Whoosh.
+
+    El cerrojo de escritura de Whoosh solo se toma cuando hay cambios
+    pendientes y se libera en cada commit, para no bloquear a otros escritores.
+
+    El idioma de cada documento (`metadata["language"]` o, si falta, el que
+    detecte `detector`) decide en qué campo de contenido se indexa; los
+    documentos de idioma incierto van al campo por defecto (inglés).
     """
 
-    def __init__(self, adapter: WhooshAdapter):
+    def __init__(
+        self,
+        adapter: WhooshAdapter,
+        batch_size: int = 0,
+        detector: LanguageDetector | None = None,
+    ):
         self.adapter = adapter
         self.ix = adapter.get_index()
-        self._writer = self.ix.writer()
+        self._writer: Any = None
+        # batch_size > 0 activa el análisis por lotes del contenido
+        self.batch_size = batch_size
+        self._batch_analyzer = BatchAnalyzer(stopwords_lang='english') if batch_size > 0 else None
+        self.detector = detector or LanguageDetector()
 
     def add_documents(self, docs: list[Document]) -> None:
         """
         Añade una lista de documentos al buffer de escritura.
         """
-        for doc in docs:
+        self._write(docs, update=False)
+
+    def update_documents(self, docs: list[Document]) -> None:
+        """
+        Reemplaza los documentos con el mismo `path` (campo único del esquema).
+        """
+        self._write(docs, update=True)
+
+    def delete_documents(self, paths: list[str]) -> None:
+        writer = self._get_writer()
+        chunked = "parent" in self.ix.schema
+        for path in paths:
             try:
-                self._writer.add_document(
-                    title=doc.title, content=doc.content, path=doc.path
-                )
+                writer.delete_by_term("path", path)
+                if chunked:
+                    # También los pasajes de un documento troceado
+                    writer.delete_by_term("parent", path)
             except Exception as e:
-                print(f"Error indexando {doc.title}: {e}")
+                print(f"Error borrando {path}: {e}")
+
+    def _write(self, docs: list[Document], update: bool) -> None:
+        if update and "parent" in self.ix.schema:
+            self._remove_passages(docs)
+
+        analyzer = self._batch_analyzer
+        if analyzer is not None:
+            for start in range(0, len(docs), self.batch_size):
+                self._write_batch(analyzer, docs[start:start + self.batch_size], update)
+            return
+
+        writer = self._get_writer()
+        method = writer.update_document if update else writer.add_document
+        with metrics.timed("index_write_seconds", mode="single"):
+            for doc in docs:
+                try:
+                    method(
+                        title=doc.title,
+                        path=doc.path,
+                        **self._content_fields(doc, self._language(doc)),
+                        **self._extra_fields(doc),
+                    )
+                except Exception as e:
+                    metrics.increment("index_write_errors_total")
+                    print(f"Error indexando {doc.title}: {e}")
+        metrics.increment("documents_written_total", len(docs))
+
+    def _write_batch(self, analyzer: BatchAnalyzer, docs: list[Document], update: bool) -> None:
+        """
+        Indexa los lemas ya calculados por BatchAnalyzer y almacena el
+        contenido original (`_stored_content`) para snippets y resaltado.
+        BatchAnalyzer solo conoce el analizador inglés: los documentos en
+        otros idiomas pasan por el analizador de su campo.
+        """
+        languages = [self._language(doc) for doc in docs]
+        english = [i for i, lang in enumerate(languages) if lang == DEFAULT_LANGUAGE]
+        with metrics.timed("batch_analysis_seconds"):
+            analyzed = analyzer.analyze_batch([docs[i].content for i in english])
+        lemmas_by_doc = dict(zip(english, analyzed))
+
+        writer = self._get_writer()
+        method = writer.update_document if update else writer.add_document
+        with metrics.timed("index_write_seconds", mode="batch"):
+            for i, (doc, language) in enumerate(zip(docs, languages)):
+                content = self._content_fields(doc, language)
+                lemmas = lemmas_by_doc.get(i)
+                if lemmas is not None:
+                    # Whoosh indexa una lista de términos tal cual, sin volver a
+                    # pasar el analizador del esquema (ver whoosh.formats.tokens)
+                    content.update(content=lemmas, _stored_content=doc.content)
+                try:
+                    method(title=doc.title, path=doc.path, **content, **self._extra_fields(doc))
+                except Exception as e:
+                    metrics.increment("index_write_errors_total")
+                    print(f"Error indexando {doc.title}: {e}")
+        metrics.increment("documents_written_total", len(docs))
+
+    def _remove_passages(self, docs: list[Document]) -> None:
+        """
+        Antes de reemplazar un documento se borra su versión anterior completa:
+        sus pasajes (si estaba troceado) o el documento entero (si ahora lo
+        está). `update_document` solo reemplaza entradas con el mismo `path`.
+        """
+        writer = self._get_writer()
+        seen: set[str] = set()
+        for doc in docs:
+            parent = doc.metadata.get("parent")
+            key = parent or doc.path
+            if key in seen:
+                continue
+            seen.add(key)
+            writer.delete_by_term("parent", key)
+            if parent:
+                writer.delete_by_term("path", key)
+
+    def _language(self, doc: Document) -> str:
+        language = doc.metadata.get("language") or self.detector.detect(doc.content)
+        if language is None or LANGUAGE_FIELDS.get(language) not in self.ix.schema:
+            return DEFAULT_LANGUAGE
+        return language
+
+    def _content_fields(self, doc: Document, language: str) -> dict[str, Any]:
+        """
+        El texto se indexa solo en el campo de su idioma (sin duplicar
+        postings) y se almacena siempre en `content` para los snippets.
+        """
+        fields: dict[str, Any] = {"content": doc.content}
+        field = LANGUAGE_FIELDS[language]
+        if field != "content":
+            fields.update({"content": "", "_stored_content": doc.content, field: doc.content})
+        if "language" in self.ix.schema:
+            fields["language"] = language
+        return fields
+
+    def _extra_fields(self, doc: Document) -> dict[str, Any]:
+        """
+        Campos almacenados opcionales. Los índices creados con un esquema
+        anterior no los tienen, así que solo se envían si existen.
+        """
+        schema = self.ix.schema
+        fields: dict[str, Any] = {}
+        aliases = doc.metadata.get("aliases")
+        if aliases and "aliases" in schema:
+            fields["aliases"] = list(aliases)
+        if "parent" in schema:
+            # Siempre presente (el propio path si no es un pasaje): la columna
+            # de `parent` debe tener valor en todos los documentos
+            fields["parent"] = doc.metadata.get("parent", doc.path)
+        if "parent" in doc.metadata and "offset" in schema:
+            fields["offset"] = doc.metadata.get("offset", 0)
+            if doc.metadata.get("page") is not None:
+                fields["page"] = doc.metadata["page"]
+        return fields
+
+    def _get_writer(self) -> Any:
+        if self._writer is None:
+            self._writer = self.ix.writer()
+        return self._writer
 
     def commit(self) -> None:
         """
-        Guarda los cambios físicamente en el disco.
+        Guarda los cambios físicamente en el disco. Si el commit falla, los
+        cambios se descartan y la excepción se propaga al llamador.
         """
+        if self._writer is None:
+            return
+
         try:
-            self._writer.commit()
-            self._writer = self.ix.writer()
+            with metrics.timed("commit_seconds"):
+                self._writer.commit()
         except Exception as e:
+            metrics.increment("commit_errors_total")
             print(f"Error en commit: {e}")
             self._writer.cancel()
+            raise
+        finally:
+            self._writer = None
+
+    def cancel(self) -> None:
+        """Descarta los cambios pendientes y libera el cerrojo de escritura."""
+        if self._writer is None:
+            return
+        try:
+            self._writer.cancel()
+        finally:
+            self._writer = None
+
+    def generation(self) -> int | None:
+        return self.ix.latest_generation()
@@ -0,0 +1,282 @@
+import datetime
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Literal
+
+from src.core.interfaces import IIndexWriter
+from src.core.models import Document
+
+JobAction = Literal["add", "update", "delete"]
+
+
+@dataclass
+class IndexJob:
+    """
+    Operación pendiente sobre el índice.
+    Para 'delete' solo se usa `path`; para 'add'/'update', `document`.
+    """
+
+    action: JobAction
+    document: Document | None = None
+    path: str | None = None
+
+
+@dataclass
+class IndexingStatus:
+    """
+    Estado del escritor en segundo plano.
+    """
+
+    running: bool
+    backlog: int
+    processed: int
+    commits: int
+    docs_per_second: float
+    last_commit_generation: int | None
+    last_commit_at: str | None
+    last_error: str | None
+    # Reintentos de lotes fallidos y trabajos apartados tras agotarlos
+    retries: int = 0
+    failed: int = 0
+
+
+class AsyncIndexingService:
+    """
+    Cola de trabajos de indexación consumida por un único hilo escritor.
+
+    Los trabajos se agrupan y se confirman en un solo commit cuando se
+    alcanza `max_batch` trabajos o pasan `max_delay` segundos desde el
+    primero pendiente. Así las peticiones no esperan al disco ni compiten
+    por el cerrojo de escritura de Whoosh.
+
+    Si un lote falla (ej: cerrojo ocupado o error en el commit) se descartan
+    sus cambios y se reintenta entero, con espera exponencial, hasta
+    `max_retries` veces. Después sus trabajos quedan apartados (ver
+    `requeue_failed`) en lugar de perderse.
+    """
+
+    def __init__(
+        self,
+        writer: IIndexWriter,
+        max_batch: int = 500,
+        max_delay: float = 2.0,
+        max_queue: int = 10000,
+        on_commit: Callable[[], None] | None = None,
+        max_retries: int = 5,
+        retry_delay: float = 0.5,
+        max_retry_delay: float = 30.0,
+    ):
+        self.writer = writer
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        # Se ejecuta tras cada commit en el hilo escritor: debe ser rápido
+        # (ej: CompletionRefresher.request, que regenera en su propio hilo)
+        self.on_commit = on_commit
+
+        self._queue: queue.Queue[IndexJob] = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+        # Trabajos encolados o en el lote actual, aún sin confirmar
+        self._outstanding = 0
+        self._processed = 0
+        self._commits = 0
+        self._busy_seconds = 0.0
+        self._last_generation: int | None = None
+        self._last_commit_at: str | None = None
+        self._last_error: str | None = None
+        self._retries = 0
+        self._failed: list[IndexJob] = []
+
+    # --- API de encolado ---
+
+    def submit_add(self, docs: list[Document]) -> None:
+        for doc in docs:
+            self._enqueue(IndexJob(action="add", document=doc))
+
+    def submit_update(self, docs: list[Document]) -> None:
+        for doc in docs:
+            self._enqueue(IndexJob(action="update", document=doc))
+
+    def submit_delete(self, paths: list[str]) -> None:
+        for path in paths:
+            self._enqueue(IndexJob(action="delete", path=path))
+
+    def _enqueue(self, job: IndexJob) -> None:
+        # Lanza queue.Full si la cola está llena: el llamador decide (ej: HTTP 503)
+        with self._lock:
+            self._outstanding += 1
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._outstanding -= 1
+            raise
+
+    # --- Ciclo de vida ---
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="index-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo tras confirmar los trabajos ya encolados."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def requeue_failed(self) -> int:
+        """Vuelve a encolar los trabajos apartados tras agotar los reintentos."""
+        with self._lock:
+            jobs, self._failed = self._failed, []
+        for job in jobs:
+            self._enqueue(job)
+        return len(jobs)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Espera a que la cola quede vacía y confirmada. Los trabajos apartados
+        tras agotar los reintentos no cuentan (ver `status().failed`).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.status().backlog:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def status(self) -> IndexingStatus:
+        with self._lock:
+            rate = self._processed / self._busy_seconds if self._busy_seconds else 0.0
+            return IndexingStatus(
+                running=self._thread is not None and self._thread.is_alive(),
+                backlog=self._outstanding,
+                processed=self._processed,
+                commits=self._commits,
+                docs_per_second=round(rate, 2),
+                last_commit_generation=self._last_generation,
+                last_commit_at=self._last_commit_at,
+                last_error=self._last_error,
+                retries=self._retries,
+                failed=len(self._failed),
+            )
+
+    # --- Hilo escritor ---
+
+    def _run(self) -> None:
+        batch: list[IndexJob] = []
+        first_at = 0.0
+        attempts = 0
+
+        while True:
+            timeout = self.max_delay - (time.monotonic() - first_at) if batch else 0.1
+            try:
+                job = self._queue.get(timeout=max(timeout, 0.0))
+                if not batch:
+                    first_at = time.monotonic()
+                batch.append(job)
+            except queue.Empty:
+                pass
+
+            stopping = self._stop.is_set()
+            due = batch and (
+                len(batch) >= self.max_batch
+                or time.monotonic() - first_at >= self.max_delay
+                or (stopping and self._queue.empty())
+            )
+            if due:
+                if self._apply(batch, retrying=attempts > 0):
+                    batch, attempts = [], 0
+                elif attempts < self.max_retries:
+                    delay = min(self.retry_delay * 2 ** attempts, self.max_retry_delay)
+                    attempts += 1
+                    with self._lock:
+                        self._retries += 1
+                    time.sleep(delay)
+                else:
+                    self._park(batch)
+                    batch, attempts = [], 0
+
+            if stopping and not batch and self._queue.empty():
+                return
+
+    def _apply(self, batch: list[IndexJob], retrying: bool = False) -> bool:
+        """Aplica y confirma el lote. Devuelve False si falló (nada se cuenta)."""
+        started = time.monotonic()
+        generation: int | None = None
+        # Un intento fallido puede haber confirmado parte del lote (ej: algunos
+        # shards): al reintentar, las altas se aplican como reemplazos para no
+        # duplicar documentos.
+        jobs = [_as_update(job) for job in batch] if retrying else batch
+        try:
+            # Respetamos el orden: agrupamos tramos consecutivos de la misma acción
+            run: list[IndexJob] = []
+            for job in jobs:
+                if run and run[-1].action != job.action:
+                    self._apply_run(run)
+                    run = []
+                run.append(job)
+            if run:
+                self._apply_run(run)
+
+            self.writer.commit()
+            generation = self.writer.generation()
+            error = None
+        except Exception as e:
+            print(f"Error en el escritor en segundo plano: {e}")
+            error = str(e)
+            try:
+                self.writer.cancel()
+            except Exception as cancel_error:
+                print(f"Error descartando el lote fallido: {cancel_error}")
+
+        if error is None and self.on_commit is not None:
+            try:
+                self.on_commit()
+            except Exception as e:
+                print(f"Error tras el commit: {e}")
+
+        with self._lock:
+            self._busy_seconds += time.monotonic() - started
+            self._last_error = error
+            if error is None:
+                self._outstanding -= len(batch)
+                self._processed += len(batch)
+                self._commits += 1
+                self._last_generation = generation
+                self._last_commit_at = datetime.datetime.now().isoformat()
+        return error is None
+
+    def _park(self, batch: list[IndexJob]) -> None:
+        print(f"Lote de {len(batch)} trabajos apartado tras {self.max_retries} reintentos.")
+        with self._lock:
+            self._outstanding -= len(batch)
+            self._failed.extend(_as_update(job) for job in batch)
+
+    def _apply_run(self, run: list[IndexJob]) -> None:
+        action = run[0].action
+        if action == "delete":
+            self.writer.delete_documents([job.path for job in run if job.path])
+            return
+
+        docs = [job.document for job in run if job.document is not None]
+        if action == "update":
+            self.writer.update_documents(docs)
+        else:
+            self.writer.add_documents(docs)
+
+
+def _as_update(job: IndexJob) -> IndexJob:
+    if job.action != "add":
+        return job
+    return IndexJob(action="update", document=job.document)
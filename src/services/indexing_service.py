@@ -1,32 +1,97 @@
 from src.core.interfaces import IIndexWriter
+from src.core.models import Document
+from src.infrastructure.fs.chunker import PassageChunker
+from src.infrastructure.fs.dedup import NearDuplicateFilter
 from src.infrastructure.fs.loader import FileDocumentLoader
+from src.infrastructure.search_engine.suggester import CompletionIndexBuilder
+from src.infrastructure.search_engine.vectors import VectorIndexBuilder
 
 class IndexingService:
     """
     Coordina la ingesta y guardado de documentos.
     """
-    def __init__(self, writer: IIndexWriter, loader: FileDocumentLoader):
+    def __init__(
+        self,
+        writer: IIndexWriter,
+        loader: FileDocumentLoader,
+        completion_builder: CompletionIndexBuilder | None = None,
+        dedup: NearDuplicateFilter | None = None,
+        chunker: PassageChunker | None = None,
+        vector_builder: VectorIndexBuilder | None = None,
+    ):
         self.writer = writer
         self.loader = loader
+        self.completion_builder = completion_builder
+        # Descarta copias del mismo documento en distintos formatos
+        self.dedup = dedup
+        # Trocea los documentos largos en pasajes indexados por separado
+        self.chunker = chunker
+        self.vector_builder = vector_builder
 
-    def run_indexing(self) -> int:
+    def run_indexing(self, stream_batch: int = 1000) -> int:
         """
         Ejecuta el proceso completo. Retorna el número de docs indexados.
+
+        Sin deduplicación los documentos se leen y escriben en tandas de
+        `stream_batch`, sin mantener todo el corpus en memoria. La
+        deduplicación necesita ver todos los documentos a la vez.
         """
         # 1. Cargar documentos
         print("Cargando documentos del disco...")
-        docs = self.loader.load_all()
-        
-        if not docs:
+        if self.dedup is None:
+            files = self._index_streaming(stream_batch)
+        else:
+            files = self._index_all()
+
+        if not files:
             print("No se encontraron documentos.")
             return 0
-            
-        # 2. Guardar en índice
-        print(f"Indexando {len(docs)} archivos...")
-        self.writer.add_documents(docs)
         
         # 3. Confirmar cambios
         self.writer.commit()
         print("Cambios guardados correctamente.")
+
+        # 4. Regenerar el índice de autocompletado
+        if self.completion_builder is not None:
+            entries = self.completion_builder.build()
+            print(f"Índice de autocompletado regenerado ({entries} entradas).")
+
+        # 5. Regenerar los vectores semánticos para la reordenación
+        if self.vector_builder is not None:
+            vectors = self.vector_builder.build()
+            print(f"Índice vectorial regenerado ({vectors} documentos).")
         
-        return len(docs)
\ No newline at end of file
+        return files
+
+    def _index_all(self) -> int:
+        docs = self.loader.load_all()
+        if not docs:
+            return 0
+
+        docs = self.dedup.process(docs) if self.dedup is not None else docs
+        self._write(docs)
+        return len(docs)
+
+    def _index_streaming(self, stream_batch: int) -> int:
+        files = 0
+        batch: list[Document] = []
+        for doc in self.loader.iter_documents():
+            batch.append(doc)
+            if len(batch) >= stream_batch:
+                files += len(batch)
+                self._write(batch)
+                batch = []
+        if batch:
+            files += len(batch)
+            self._write(batch)
+        return files
+
+    def _write(self, docs: list[Document]) -> None:
+        # 2. Guardar en índice
+        if self.chunker is not None:
+            entries = self.chunker.process(docs)
+            print(f"Indexando {len(docs)} archivos ({len(entries)} entradas)...")
+        else:
+            entries = docs
+            print(f"Indexando {len(docs)} archivos...")
+        self.writer.add_documents(entries)
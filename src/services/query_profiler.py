@@ -0,0 +1,75 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+from dataclasses import asdict
+from logging.handlers import RotatingFileHandler
+
+from src.core.models import QueryProfile
+
+
+class QueryProfiler:
+    """
+    Perfilado opcional de consultas.
+
+    - Escribe en un log rotativo (JSON por línea) las consultas cuya duración
+      supera `slow_threshold_ms`.
+    - Con `sample_rate` > 0, ejecuta cProfile en esa fracción de peticiones y
+      adjunta las funciones más costosas a la entrada del log.
+    """
+
+    def __init__(
+        self,
+        log_path: str,
+        slow_threshold_ms: float = 500.0,
+        sample_rate: float = 0.0,
+        max_bytes: int = 5 * 1024 * 1024,
+        backup_count: int = 5,
+        top_functions: int = 25,
+    ):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.sample_rate = sample_rate
+        self.top_functions = top_functions
+
+        os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+        # Logger propio por fichero para no mezclarlo con el resto de la app
+        self._logger = logging.getLogger(f"celene.slow_queries.{os.path.abspath(log_path)}")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        if not self._logger.handlers:
+            handler = RotatingFileHandler(
+                log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._logger.addHandler(handler)
+
+    def should_sample(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start_sampling(self) -> cProfile.Profile | None:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Solo puede haber un perfilador activo a la vez (Python 3.12+)
+            return None
+        return profiler
+
+    def stop_sampling(self, profiler: cProfile.Profile) -> str:
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(self.top_functions)
+        return out.getvalue()
+
+    def record(self, profile: QueryProfile) -> bool:
+        """Registra la consulta si es lenta o fue muestreada. Retorna True si se escribió."""
+        is_slow = profile.total_seconds * 1000 >= self.slow_threshold_ms
+        if not is_slow and profile.sampled_profile is None:
+            return False
+
+        entry = {"slow": is_slow, **asdict(profile)}
+        self._logger.info(json.dumps(entry, ensure_ascii=False))
+        return True
@@ -1,26 +1,206 @@
-from src.core.interfaces import IIndexReader
-from src.core.models import SearchResult
-from src.domain_nlp.pipeline import NLPPipeline
+import threading
+import time
+
+from src.core import metrics
+from src.core.interfaces import IIndexReader, IReranker
+from src.core.models import ExpandedQuery, QueryProfile, SearchResponse, SearchResult
+from src.domain_nlp.pipeline import ExpansionMode, MultilingualPipeline, NLPPipeline
+from src.services.query_profiler import QueryProfiler
+
+# Aunque el NLP haya consumido el presupuesto, la búsqueda dispone al menos
+# de esta fracción para devolver algo
+_MIN_SEARCH_SHARE = 0.25
+# Por debajo de estos términos el coste fijo de la búsqueda domina y la
+# estimación de coste por término no sería representativa
+_MIN_TERMS_TO_ESTIMATE = 4
+# Tras este nº de expansiones descartadas seguidas por coste se busca una
+# expandida igualmente (sonda): vuelve a medir el coste real por término
+_PROBE_EVERY = 20
+
+
+def _ema(previous: float | None, sample: float) -> float:
+    """Media móvil exponencial (la primera muestra la inicializa)."""
+    return sample if previous is None else 0.8 * previous + 0.2 * sample
+
 
 class SearchService:
     """
     Coordina el proceso de búsqueda
+
+    Con `time_budget` (segundos por consulta) la búsqueda se degrada en vez
+    de bloquear el worker: si el NLP y el coste previsto de puntuar la
+    expansión (medido en las búsquedas anteriores) superan el presupuesto,
+    se busca la consulta sin expandir con `literal_nlp` (por defecto,
+    `nlp.without_expansion()`); y si el índice no termina a tiempo se
+    devuelve el top-k parcial. `max_expanded_terms` añade, si se indica, un
+    tope fijo de términos. Con `max_in_flight` se rechazan las consultas
+    que excedan ese nº de búsquedas simultáneas.
     """
-    def __init__(self, reader: IIndexReader, nlp: NLPPipeline):
+    def __init__(
+        self,
+        reader: IIndexReader,
+        nlp: NLPPipeline | MultilingualPipeline,
+        profiler: QueryProfiler | None = None,
+        reranker: IReranker | None = None,
+        time_budget: float | None = None,
+        max_in_flight: int | None = None,
+        max_expanded_terms: int | None = None,
+        literal_nlp: NLPPipeline | MultilingualPipeline | None = None,
+    ):
         self.reader = reader
         self.nlp = nlp
+        # Opcional: perfilado por consulta y registro de consultas lentas
+        self.profiler = profiler
+        # Opcional: reordenación semántica del top-N de BM25
+        self.reranker = reranker
+        self.time_budget = time_budget
+        self.max_expanded_terms = max_expanded_terms
+        self._in_flight = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        self._literal_nlp = literal_nlp
+        # Coste de la búsqueda = fijo + por término expandido (medias móviles)
+        self._fixed_seconds: float | None = None
+        self._seconds_per_term: float | None = None
+        self._skipped_in_row = 0
 
     def execute_search(self, raw_query: str) -> list[SearchResult]:
+        """Solo los resultados (ver `search` para los flags de degradación)."""
+        return self.search(raw_query).results
+
+    def search(self, raw_query: str) -> SearchResponse:
         if not raw_query.strip():
-            return []
+            return SearchResponse(results=[])
+
+        if self._in_flight is not None and not self._in_flight.acquire(blocking=False):
+            metrics.increment("queries_shed_total")
+            return SearchResponse(results=[], shed=True)
+
+        try:
+            metrics.increment("queries_total")
+
+            if self.profiler is not None:
+                return self._profiled_search(self.profiler, raw_query)
+
+            return self._search(raw_query)
+        finally:
+            if self._in_flight is not None:
+                self._in_flight.release()
+
+    def _search(self, raw_query: str) -> SearchResponse:
+        started = time.perf_counter()
 
         # 1. Expandir la consulta con NLP (Sinónimos, correcciones, etc.)
-        expanded_query = self.nlp.process(raw_query)
-        
+        with metrics.timed("nlp_seconds"):
+            expanded_query = self.nlp.process(raw_query)
+        expanded_query, skipped = self._within_budget(expanded_query, started)
+
         print(f"DEBUG - Original: '{expanded_query.original_text}'")
         print(f"DEBUG - Expandida: {expanded_query.to_boolean_query()}")
 
         # 2. Ejecutar la búsqueda en el índice
-        results = self.reader.search(expanded_query)
-        
-        return results
\ No newline at end of file
+        with metrics.timed("reader_search_seconds"):
+            results, partial = self._read(expanded_query, started)
+
+        # 3. Reordenar por similitud semántica
+        if self.reranker is not None:
+            with metrics.timed("rerank_seconds"):
+                results = self.reranker.rerank(expanded_query, results)
+
+        return SearchResponse(results=results, partial=partial, expansion_skipped=skipped)
+
+    def _profiled_search(self, profiler: QueryProfiler, raw_query: str) -> SearchResponse:
+        """Mismo flujo que _search, midiendo cada etapa."""
+        profile = QueryProfile(query=raw_query)
+        sampler = profiler.start_sampling() if profiler.should_sample() else None
+        started = time.perf_counter()
+
+        try:
+            expanded_query = self.nlp.process(raw_query)
+            nlp_done = time.perf_counter()
+            profile.timings["nlp"] = nlp_done - started
+            metrics.observe("nlp_seconds", profile.timings["nlp"])
+            expanded_query, skipped = self._within_budget(expanded_query, started)
+            profile.expanded_term_count = len(expanded_query.expanded_terms)
+
+            search_started = time.perf_counter()
+            results, partial = self._read(expanded_query, started, profile=profile)
+            reader_done = time.perf_counter()
+            profile.timings["reader"] = reader_done - search_started
+            metrics.observe("reader_search_seconds", profile.timings["reader"])
+
+            if self.reranker is not None:
+                results = self.reranker.rerank(expanded_query, results)
+                profile.timings["rerank"] = time.perf_counter() - reader_done
+                metrics.observe("rerank_seconds", profile.timings["rerank"])
+                profile.returned_docs = len(results)
+        finally:
+            profile.total_seconds = time.perf_counter() - started
+            if sampler is not None:
+                profile.sampled_profile = profiler.stop_sampling(sampler)
+            profiler.record(profile)
+
+        return SearchResponse(results=results, partial=partial, expansion_skipped=skipped)
+
+    def _within_budget(self, query: ExpandedQuery, started: float) -> tuple[ExpandedQuery, bool]:
+        """
+        Decide si la consulta expandida cabe en el presupuesto. Whoosh
+        construye los matchers de un OR de frases antes de recorrer ningún
+        documento, así que el límite de tiempo del lector no puede cortar
+        esa fase: hay que preverla. Retorna la consulta a buscar y si se
+        descartó la expansión.
+        """
+        if self.time_budget is None or self.nlp.expansion_mode is ExpansionMode.NONE:
+            return query, False
+
+        terms = len(query.expanded_terms)
+        elapsed = time.perf_counter() - started
+        predicted = (self._fixed_seconds or 0.0) + (self._seconds_per_term or 0.0) * terms
+        within_cap = self.max_expanded_terms is None or terms <= self.max_expanded_terms
+        if within_cap and (elapsed + predicted <= self.time_budget or self._skipped_in_row >= _PROBE_EVERY):
+            # La sonda también acaba en el límite de tiempo del lector
+            self._skipped_in_row = 0
+            return query, False
+
+        if within_cap:
+            self._skipped_in_row += 1
+
+        metrics.increment("expansion_fallbacks_total")
+        if self._literal_nlp is None:
+            self._literal_nlp = self.nlp.without_expansion()
+        return self._literal_nlp.process(query.original_text), True
+
+    def _read(
+        self, query: ExpandedQuery, started: float, profile: QueryProfile | None = None
+    ) -> tuple[list[SearchResult], bool]:
+        if self.time_budget is None:
+            return self.reader.search(query, profile=profile), False
+
+        remaining = max(
+            self.time_budget - (time.perf_counter() - started),
+            self.time_budget * _MIN_SEARCH_SHARE,
+        )
+        search_started = time.perf_counter()
+        results, partial = self.reader.search_within(query, remaining, profile=profile)
+
+        # Si se agotó el tiempo, lo medido es una cota inferior del coste: también cuenta
+        self._observe(len(query.expanded_terms), time.perf_counter() - search_started)
+        return results, partial
+
+    def _observe(self, terms: int, seconds: float) -> None:
+        """
+        Actualiza el modelo de coste con cada búsqueda ejecutada, también
+        las literales de los descartes: si no, tras una consulta lenta la
+        estimación no volvería a bajar.
+        """
+        per_term = self._seconds_per_term
+        if terms >= _MIN_TERMS_TO_ESTIMATE:
+            # Lo que excede del coste fijo se reparte entre los términos
+            sample = max(seconds - (self._fixed_seconds or 0.0), 0.0) / terms
+            self._seconds_per_term = _ema(per_term, sample)
+            return
+
+        # Con pocos términos domina el coste fijo
+        self._fixed_seconds = _ema(self._fixed_seconds, max(seconds - (per_term or 0.0) * terms, 0.0))
+        # Y ningún término cuesta más que la búsqueda entera: si el índice
+        # vuelve a ser rápido, la estimación decae hacia lo medido
+        if per_term is not None and terms and per_term * terms > seconds:
+            self._seconds_per_term = _ema(per_term, seconds / terms)
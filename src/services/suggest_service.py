@@ -0,0 +1,40 @@
+import os
+
+from src.infrastructure.search_engine.suggester import CompletionIndex
+
+
+class SuggestService:
+    """
+    Sirve sugerencias de autocompletado (type-ahead) sin pasar por NLP ni BM25.
+    Recarga el índice de completado cuando el fichero cambia en disco.
+    """
+
+    def __init__(self, completion_path: str):
+        self.completion_path = completion_path
+        self._index: CompletionIndex | None = None
+        self._mtime: float | None = None
+
+    def suggest(self, prefix: str, k: int = 10) -> list[str]:
+        if not prefix.strip():
+            return []
+
+        index = self._current_index()
+        if index is None:
+            return []
+
+        return index.suggest(prefix, k)
+
+    def _current_index(self) -> CompletionIndex | None:
+        try:
+            mtime = os.path.getmtime(self.completion_path)
+        except OSError:
+            # Aún no se ha construido el índice de completado
+            return None
+
+        if self._index is None or mtime != self._mtime:
+            # El índice anterior no se cierra explícitamente: una petición
+            # concurrente podría estar usándolo; el GC liberará el mmap.
+            self._index = CompletionIndex.from_file(self.completion_path)
+            self._mtime = mtime
+
+        return self._index
@@ -7,4 +7,33 @@ def create_app():
     from src.web.routes import main_bp
     app.register_blueprint(main_bp)
     
-    return app
\ No newline at end of file
+    return app
+
+def prepare_for_fork():
+    """
+    Modo preload (gunicorn.conf.py): se ejecuta una vez en el proceso
+    maestro, ya cargada la app y antes de crear los workers. Carga los
+    recursos de NLTK, calienta el camino completo de búsqueda y congela el
+    heap para que los workers compartan esas páginas en lugar de copiarlas.
+    """
+    from src.core import metrics
+    from src.domain_nlp.resources import (
+        WARMUP_QUERIES, freeze_heap, preload_nlp_resources, release_file_handles, warm_up,
+    )
+    from src.web.routes import QUERY_LANGUAGES, nlp, search_service
+
+    preload_nlp_resources(QUERY_LANGUAGES)
+
+    # Las consultas de calentamiento no cuentan en /metrics
+    sink = metrics.get_sink()
+    metrics.set_sink(None)
+    try:
+        seconds = warm_up(nlp)
+        for query in WARMUP_QUERIES:
+            search_service.execute_search(query)
+    finally:
+        metrics.set_sink(sink)
+
+    release_file_handles()
+    freeze_heap()
+    print(f"🔥 Recursos NLP precargados (calentamiento del pipeline: {seconds:.2f}s).")
@@ -1,11 +1,24 @@
 import os
-from flask import Blueprint, render_template, request
+import queue
+from dataclasses import asdict
+from flask import Blueprint, Response, abort, jsonify, render_template, request
 
+from src.core import metrics
+from src.core.models import Document
 from src.infrastructure.fs.loader import FileDocumentLoader
 from src.infrastructure.search_engine.adapter import WhooshAdapter
 from src.infrastructure.search_engine.reader import WhooshReader
-from src.domain_nlp.pipeline import NLPPipeline
+from src.infrastructure.search_engine.writer import WhooshWriter
+from src.infrastructure.search_engine.suggester import CompletionIndexBuilder, CompletionRefresher
+from src.infrastructure.search_engine.maintenance import OptimizePolicy, OptimizeScheduler
+from src.infrastructure.search_engine.vectors import VectorReranker
+from src.infrastructure.search_engine.language import LanguageDetector
+from src.infrastructure.observability.metrics_sink import InMemoryMetricsSink
+from src.domain_nlp.pipeline import MultilingualPipeline
 from src.services.search_service import SearchService
+from src.services.suggest_service import SuggestService
+from src.services.async_indexing_service import AsyncIndexingService
+from src.services.query_profiler import QueryProfiler
 
 # Definimos el Blueprint (agrupación de rutas)
 main_bp = Blueprint('main', __name__)
@@ -13,14 +26,83 @@ main_bp = Blueprint('main', __name__)
 # --- CONFIGURACIÓN E INYECCIÓN DE DEPENDENCIAS ---
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 INDEX_DIR = os.path.join(BASE_DIR, 'data', 'index_storage')
+COMPLETION_PATH = os.path.join(INDEX_DIR, 'completions.bin')
+# Expansión semántica de consultas: 'none' | 'light' | 'full'
+EXPANSION_MODE = 'full'
+# Idiomas de las consultas (nombres de NLTK); cada uno con su pipeline
+QUERY_LANGUAGES = ('english', 'spanish')
+# Instrumentación por etapas expuesta en /metrics (sin coste si está desactivada)
+METRICS_ENABLED = True
+# Perfilado opt-in de consultas: registro de lentas y muestreo con cProfile
+PROFILING_ENABLED = False
+SLOW_QUERY_MS = 500.0
+SLOW_QUERY_LOG = os.path.join(BASE_DIR, 'data', 'logs', 'slow_queries.log')
+PROFILE_SAMPLE_RATE = 0.0
+# Reordenación semántica (LSA) del top-N de BM25; requiere haber generado
+# los vectores con seed_index.py o IndexingService(vector_builder=...)
+RERANK_ENABLED = False
+RERANK_CANDIDATES = 100
+VECTOR_DIR = os.path.join(INDEX_DIR, 'vectors')
+# Degradación bajo carga: presupuesto por consulta (segundos) y máximo de
+# búsquedas simultáneas por proceso (None desactiva cada uno)
+QUERY_TIME_BUDGET = 1.0
+MAX_IN_FLIGHT = 32
+# Ingesta web (/documents). Exige un único escritor por índice: con varios
+# workers de gunicorn cada uno tendría el suyo, así que gunicorn.conf.py la
+# desactiva (CELENE_WEB_INGESTION=0) y se indexa desde un único proceso
+WEB_INGESTION = os.environ.get('CELENE_WEB_INGESTION', '1') != '0'
+
+metrics_sink = InMemoryMetricsSink() if METRICS_ENABLED else None
+metrics.set_sink(metrics_sink)
 
 # Instanciamos las dependencias
 adapter = WhooshAdapter(INDEX_DIR)
-reader = WhooshReader(adapter)
-nlp = NLPPipeline()
+reader = WhooshReader(adapter, limit=RERANK_CANDIDATES) if RERANK_ENABLED else WhooshReader(adapter)
+# Las consultas son cortas: basta una palabra vacía para decidir el idioma
+nlp = MultilingualPipeline(
+    LanguageDetector(QUERY_LANGUAGES, min_hits=1),
+    languages=QUERY_LANGUAGES,
+    expansion_mode=EXPANSION_MODE,
+)
 
 # Inyectamos todo en el servicio
-search_service = SearchService(reader, nlp)
+profiler = (
+    QueryProfiler(SLOW_QUERY_LOG, slow_threshold_ms=SLOW_QUERY_MS, sample_rate=PROFILE_SAMPLE_RATE)
+    if PROFILING_ENABLED else None
+)
+reranker = VectorReranker(VECTOR_DIR) if RERANK_ENABLED else None
+search_service = SearchService(
+    reader, nlp, profiler=profiler, reranker=reranker,
+    time_budget=QUERY_TIME_BUDGET, max_in_flight=MAX_IN_FLIGHT,
+)
+suggest_service = SuggestService(COMPLETION_PATH)
+
+# Ingesta desde la web: un único hilo escritor agrupa los trabajos en commits.
+# El autocompletado se regenera en otro hilo (como mucho una vez por minuto):
+# el commit solo lo marca como pendiente y el escritor no lo espera
+completion_refresher = (
+    CompletionRefresher(CompletionIndexBuilder(adapter, COMPLETION_PATH))
+    if WEB_INGESTION else None
+)
+indexing_service = (
+    AsyncIndexingService(WhooshWriter(adapter), on_commit=completion_refresher.request)
+    if completion_refresher is not None else None
+)
+# La compactación corre en su propio hilo (junto al escritor, en el mismo
+# proceso) para no frenar los commits; si coincide con un lote, el lote se
+# reintenta cuando el optimizador suelta el cerrojo
+optimizer = OptimizeScheduler(adapter, OptimizePolicy()) if WEB_INGESTION else None
+
+
+def _start_background_writers():
+    # Se arrancan con la primera petición de ingesta, ya en el worker: los
+    # hilos creados en el maestro no sobreviven al fork
+    assert indexing_service is not None
+    indexing_service.start()
+    if completion_refresher is not None:
+        completion_refresher.start()
+    if optimizer is not None:
+        optimizer.start()
 
 
 @main_bp.route('/')
@@ -37,7 +119,93 @@ def search():
         return render_template('index.html')
         
     # Llamamos a tu lógica de negocio
-    results = search_service.execute_search(query)
+    response = search_service.search(query)
     
     # Enviamos los datos a la vista
-    return render_template('results.html', query=query, results=results)
\ No newline at end of file
+    status = 503 if response.shed else 200
+    return render_template(
+        'results.html', query=query, results=response.results, response=response
+    ), status
+
+@main_bp.route('/suggest')
+def suggest():
+    """Devuelve completados para el prefijo tecleado (JSON)."""
+    prefix = request.args.get('q', '')
+    k = request.args.get('k', 10, type=int)
+
+    suggestions = suggest_service.suggest(prefix, k=max(1, min(k, 50)))
+    return jsonify({'query': prefix, 'suggestions': suggestions})
+
+
+def _ingestion_disabled():
+    return jsonify({
+        'error': 'Ingesta web desactivada en este servidor (varios workers); '
+                 'indexa desde un único proceso.'
+    }), 503
+
+
+def _parse_documents(payload) -> list[Document]:
+    items = payload if isinstance(payload, list) else [payload]
+    return [
+        Document(
+            title=item.get('title') or item['path'],
+            content=item['content'],
+            path=item['path'],
+            metadata=item.get('metadata', {}),
+        )
+        for item in items
+    ]
+
+@main_bp.route('/documents', methods=['POST', 'PUT'])
+def enqueue_documents():
+    """Encola documentos (JSON) para añadir (POST) o reemplazar (PUT)."""
+    if indexing_service is None:
+        return _ingestion_disabled()
+    try:
+        docs = _parse_documents(request.get_json(force=True))
+    except (KeyError, TypeError, AttributeError):
+        return jsonify({'error': 'Se esperaba {path, content[, title, metadata]} o una lista.'}), 400
+
+    _start_background_writers()
+    try:
+        if request.method == 'PUT':
+            indexing_service.submit_update(docs)
+        else:
+            indexing_service.submit_add(docs)
+    except queue.Full:
+        return jsonify({'error': 'Cola de indexación llena, reintenta más tarde.'}), 503
+
+    return jsonify({'queued': len(docs)}), 202
+
+@main_bp.route('/documents', methods=['DELETE'])
+def enqueue_deletions():
+    """Encola el borrado de los documentos indicados por ?path=... (repetible)."""
+    if indexing_service is None:
+        return _ingestion_disabled()
+    paths = request.args.getlist('path')
+    if not paths:
+        return jsonify({'error': 'Falta el parámetro path.'}), 400
+
+    _start_background_writers()
+    try:
+        indexing_service.submit_delete(paths)
+    except queue.Full:
+        return jsonify({'error': 'Cola de indexación llena, reintenta más tarde.'}), 503
+
+    return jsonify({'queued': len(paths)}), 202
+
+@main_bp.route('/index/status')
+def index_status():
+    """Estado del escritor en segundo plano y del índice."""
+    stats = adapter.get_stats()
+    return jsonify({
+        'indexing': asdict(indexing_service.status()) if indexing_service else None,
+        'index': {**asdict(stats), 'deleted_ratio': stats.deleted_ratio},
+    })
+
+@main_bp.route('/metrics')
+def metrics_endpoint():
+    """Métricas del proceso en formato de texto de Prometheus."""
+    if metrics_sink is None:
+        abort(404)
+    return Response(metrics_sink.render_prometheus(), mimetype='text/plain; version=0.0.4')
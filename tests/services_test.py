@@ -14,15 +14,17 @@ from src.domain_nlp.pipeline import NLPPipeline
 from src.services.indexing_service import IndexingService
 from src.services.search_service import SearchService
 
-# Carpetas temporales para el test
+# Carpeta temporal para el test
 TEST_DOCS_DIR = os.path.join(project_root, 'data', 'temp_test_docs')
-TEST_INDEX_DIR = os.path.join(project_root, 'data', 'temp_test_index')
+
+# Índice en RAM compartido por ambos tests: sin E/S de disco ni cerrojos
+adapter = WhooshAdapter(None, in_memory=True)
 
 def setup_environment():
     """Crea carpetas y un archivo de prueba."""
     # 1. Limpiar entornos previos
     if os.path.exists(TEST_DOCS_DIR): shutil.rmtree(TEST_DOCS_DIR)
-    if os.path.exists(TEST_INDEX_DIR): shutil.rmtree(TEST_INDEX_DIR)
+    adapter.reset_index()
     
     os.makedirs(TEST_DOCS_DIR)
     
@@ -39,7 +41,6 @@ def test_indexing_service():
     print("\n--- 1. Probando IndexingService ---")
     
     # Instanciamos dependencias
-    adapter = WhooshAdapter(TEST_INDEX_DIR)
     writer = WhooshWriter(adapter)
     loader = FileDocumentLoader(TEST_DOCS_DIR)
     
@@ -59,7 +60,6 @@ def test_search_service():
     print("\n--- 2. Probando SearchService (con NLP) ---")
     
     # Instanciamos dependencias
-    adapter = WhooshAdapter(TEST_INDEX_DIR)
     reader = WhooshReader(adapter)
     nlp = NLPPipeline() # Esto cargará NLTK
     
@@ -83,7 +83,6 @@ def test_search_service():
 def cleanup():
     """Borra las carpetas temporales."""
     if os.path.exists(TEST_DOCS_DIR): shutil.rmtree(TEST_DOCS_DIR)
-    if os.path.exists(TEST_INDEX_DIR): shutil.rmtree(TEST_INDEX_DIR)
     print("\n🧹 Limpieza completada.")
 
 if __name__ == "__main__":
@@ -0,0 +1,71 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from whoosh.index import LockError
+
+from src.core.models import Document
+from src.infrastructure.search_engine.adapter import WhooshAdapter
+from src.infrastructure.search_engine.writer import WhooshWriter
+
+
+def _pending_writer(adapter: WhooshAdapter) -> WhooshWriter:
+    """Escritor con cambios sin confirmar (tiene el cerrojo del índice)."""
+    writer = WhooshWriter(adapter)
+    writer.add_documents([Document(title="pendiente", content="", path="pendiente.txt")])
+    return writer
+
+
+def _finishes_within(fn, seconds: float) -> threading.Thread:
+    thread = threading.Thread(target=fn, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "la llamada se quedó bloqueada"
+    return thread
+
+
+def test_snapshot_fails_fast_while_a_writer_holds_the_lock():
+    with tempfile.TemporaryDirectory() as tmp:
+        adapter = WhooshAdapter(os.path.join(tmp, "snap"), in_memory=True)
+        writer = _pending_writer(adapter)
+        errors: list[Exception] = []
+
+        def snapshot():
+            try:
+                adapter.snapshot(lock_timeout=0.1)
+            except LockError as e:
+                errors.append(e)
+
+        _finishes_within(snapshot, 5)
+        assert len(errors) == 1 and not os.path.exists(os.path.join(tmp, "snap"))
+
+        # Al confirmar se libera el cerrojo y la instantánea se puede recargar
+        writer.commit()
+        adapter.snapshot()
+        reloaded = WhooshAdapter(os.path.join(tmp, "snap"), in_memory=True)
+        with reloaded.get_index().searcher() as searcher:
+            assert searcher.document(path="pendiente.txt") is not None
+
+
+def test_optimize_returns_false_when_locked():
+    adapter = WhooshAdapter(None, in_memory=True)
+    writer = _pending_writer(adapter)
+    outcome: list[bool] = []
+
+    started = time.perf_counter()
+    _finishes_within(lambda: outcome.append(adapter.optimize(lock_timeout=0)), 5)
+    assert outcome == [False] and time.perf_counter() - started < 1
+
+    writer.commit()
+    assert adapter.optimize(lock_timeout=0) is True
+
+
+if __name__ == "__main__":
+    test_snapshot_fails_fast_while_a_writer_holds_the_lock()
+    test_optimize_returns_false_when_locked()
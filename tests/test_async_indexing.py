@@ -0,0 +1,141 @@
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from src.core.interfaces import IIndexWriter
+from src.core.models import Document
+from src.services.async_indexing_service import AsyncIndexingService
+
+
+class RecordingWriter(IIndexWriter):
+    """Escritor en memoria que registra las operaciones en orden."""
+
+    def __init__(self):
+        self.ops: list[tuple[str, str]] = []
+        self.commits = 0
+
+    def add_documents(self, docs):
+        self.ops += [("add", d.path) for d in docs]
+
+    def update_documents(self, docs):
+        self.ops += [("update", d.path) for d in docs]
+
+    def delete_documents(self, paths):
+        self.ops += [("delete", p) for p in paths]
+
+    def commit(self):
+        self.commits += 1
+
+    def generation(self):
+        return self.commits
+
+
+class FlakyWriter(RecordingWriter):
+    """Falla en los primeros `failures` commits, como un cerrojo ocupado."""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+        self.committed: list[tuple[str, str]] = []
+
+    def commit(self):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("cerrojo ocupado")
+        super().commit()
+        self.committed += self.ops
+        self.ops = []
+
+    def cancel(self):
+        self.ops = []
+
+
+def doc(path):
+    return Document(title=path, content="text", path=path)
+
+
+def test_jobs_are_batched_in_order():
+    writer = RecordingWriter()
+    service = AsyncIndexingService(writer, max_batch=100, max_delay=0.2)
+
+    service.submit_add([doc("a"), doc("b")])
+    service.submit_delete(["a"])
+    service.submit_update([doc("b")])
+    service.start()
+
+    assert service.flush(timeout=5)
+    service.stop()
+
+    assert writer.ops == [("add", "a"), ("add", "b"), ("delete", "a"), ("update", "b")]
+    # Todo el lote entra en un único commit
+    assert writer.commits == 1
+
+    status = service.status()
+    assert status.backlog == 0
+    assert status.processed == 4
+    assert status.last_commit_generation == 1
+
+
+def test_batch_size_threshold_triggers_commit():
+    writer = RecordingWriter()
+    service = AsyncIndexingService(writer, max_batch=2, max_delay=60)
+
+    service.submit_add([doc(str(i)) for i in range(4)])
+    service.start()
+
+    assert service.flush(timeout=5)
+    service.stop()
+    assert writer.commits == 2
+
+
+def test_failed_batch_is_retried_without_counting_it():
+    writer = FlakyWriter(failures=2)
+    service = AsyncIndexingService(writer, max_batch=100, max_delay=0.05, retry_delay=0.01)
+
+    service.submit_add([doc("a"), doc("b")])
+    service.submit_delete(["c"])
+    service.start()
+
+    assert service.flush(timeout=5)
+    service.stop()
+
+    # Los intentos fallidos se descartan; el reintento reemplaza en vez de añadir
+    assert writer.committed == [("update", "a"), ("update", "b"), ("delete", "c")]
+    status = service.status()
+    assert status.retries == 2 and status.commits == 1
+    assert status.processed == 3 and status.failed == 0
+    assert status.last_error is None
+
+
+def test_batch_is_parked_after_exhausting_retries():
+    writer = FlakyWriter(failures=3)
+    service = AsyncIndexingService(
+        writer, max_batch=100, max_delay=0.05, max_retries=2, retry_delay=0.01
+    )
+
+    service.submit_add([doc("a")])
+    service.start()
+    assert service.flush(timeout=5)
+
+    status = service.status()
+    assert status.processed == 0 and status.commits == 0
+    assert status.failed == 1 and status.last_error == "cerrojo ocupado"
+    assert writer.committed == []
+
+    # Los trabajos apartados no se pierden: se pueden volver a encolar
+    assert service.requeue_failed() == 1
+    assert service.flush(timeout=5)
+    service.stop()
+    assert writer.committed == [("update", "a")]
+    assert service.status().processed == 1 and service.status().failed == 0
+
+
+if __name__ == "__main__":
+    test_jobs_are_batched_in_order()
+    test_batch_size_threshold_triggers_commit()
+    test_failed_batch_is_retried_without_counting_it()
+    test_batch_is_parked_after_exhausting_retries()
+    print("✅ Indexación asíncrona OK")
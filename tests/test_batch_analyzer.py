@@ -0,0 +1,79 @@
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from src.core.models import Document
+from src.infrastructure.search_engine import analyzer as analyzer_module
+from src.infrastructure.search_engine.adapter import WhooshAdapter
+from src.infrastructure.search_engine.analyzer import BatchAnalyzer, NLTKAnalyzer
+from src.infrastructure.search_engine.writer import WhooshWriter
+
+TEXTS = [
+    "The red cars are racing on the track; a driver's car.",
+    "Dogs and puppies: 3 loyal companions, e.g. in the U.S.A. 2024",
+    "",
+    "I am an A to Z guide of running, geese and children",
+]
+
+
+def _plural_lemma(word: str) -> str:
+    return word[:-1] if word.endswith("s") and len(word) > 3 else word
+
+
+def _with_fake_lemmatizer(test):
+    """
+    Ambos analizadores usan la misma función de lematización; se sustituye
+    por una regla fija para comparar el resto (tokenización, stopwords,
+    longitudes) sin depender del corpus de WordNet.
+    """
+    def run():
+        original = analyzer_module.lemmatize_noun
+        analyzer_module.lemmatize_noun = _plural_lemma
+        try:
+            test()
+        finally:
+            analyzer_module.lemmatize_noun = original
+    run.__name__ = test.__name__
+    return run
+
+
+@_with_fake_lemmatizer
+def test_batch_output_matches_nltk_analyzer():
+    reference = NLTKAnalyzer()
+    expected = [[t.text for t in reference(text)] for text in TEXTS]
+
+    assert BatchAnalyzer().analyze_batch(TEXTS) == expected
+
+
+@_with_fake_lemmatizer
+def test_batch_writer_indexes_same_postings():
+    docs = [Document(title=f"t{i}", content=text, path=f"d{i}.txt") for i, text in enumerate(TEXTS)]
+    postings = []
+    for batch_size in (0, 2):
+        adapter = WhooshAdapter(None, in_memory=True)
+        writer = WhooshWriter(adapter, batch_size=batch_size)
+        writer.add_documents(docs)
+        writer.commit()
+        with adapter.get_index().searcher() as searcher:
+            reader = searcher.reader()
+            # Secuencia de términos de cada documento según sus posiciones.
+            # El offset absoluto puede variar (StopFilter conserva la posición
+            # del primer término no vacío); el orden relativo, que es lo que
+            # usan las búsquedas de frases, debe ser el mismo.
+            by_doc: dict[int, list[tuple[int, str]]] = {}
+            for term in reader.field_terms("content"):
+                for docnum, positions in reader.postings("content", term).items_as("positions"):
+                    by_doc.setdefault(docnum, []).extend((pos, term) for pos in positions)
+            postings.append({docnum: [t for _, t in sorted(terms)] for docnum, terms in by_doc.items()})
+            # El contenido almacenado es el original, no los lemas
+            assert searcher.document(path="d0.txt")["content"] == TEXTS[0]
+
+    assert postings[0] == postings[1]
+
+
+if __name__ == "__main__":
+    test_batch_output_matches_nltk_analyzer()
+    test_batch_writer_indexes_same_postings()
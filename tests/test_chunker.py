@@ -0,0 +1,58 @@
+import os
+import sys
+import tempfile
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from pypdf import PdfWriter
+
+from src.core.models import Document
+from src.infrastructure.fs.chunker import PassageChunker
+from src.infrastructure.fs.extractors import PDFExtractor
+
+
+def test_short_documents_pass_through():
+    doc = Document(title="nota", content="texto corto", path="nota.txt")
+    assert PassageChunker(max_words=10, overlap=2).process([doc]) == [doc]
+
+
+def test_overlapping_passages_with_pages():
+    words = [f"w{i}" for i in range(25)]
+    # Dos páginas separadas por salto de página, como las produce PDFExtractor
+    content = " ".join(words[:12]) + "\f" + " ".join(words[12:])
+    doc = Document(title="informe", content=content, path="informe.pdf", metadata={"type": ".pdf"})
+
+    passages = PassageChunker(max_words=10, overlap=3).split(doc)
+
+    assert [p.path for p in passages] == ["informe.pdf#p0", "informe.pdf#p1", "informe.pdf#p2", "informe.pdf#p3"]
+    assert passages[0].content.split() == words[:10]
+    # Cada pasaje repite las últimas `overlap` palabras del anterior
+    assert passages[1].content.split()[:3] == words[7:10]
+    assert passages[-1].content.split()[-1] == "w24"
+
+    for p in passages:
+        assert p.metadata["parent"] == "informe.pdf"
+        assert p.metadata["type"] == ".pdf"
+        assert content[p.metadata["offset"]:].startswith(p.content)
+    assert [p.metadata["page"] for p in passages] == [1, 1, 2, 2]
+
+
+def test_pdf_without_text_is_skipped():
+    # PDF escaneado: páginas sin texto extraíble
+    writer = PdfWriter()
+    for _ in range(2):
+        writer.add_blank_page(width=200, height=200)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "escaneado.pdf")
+        with open(path, "wb") as f:
+            writer.write(f)
+        assert PDFExtractor().get_text(path) is None
+
+
+if __name__ == "__main__":
+    test_short_documents_pass_through()
+    test_overlapping_passages_with_pages()
+    test_pdf_without_text_is_skipped()
+    print("✅ Troceado OK")
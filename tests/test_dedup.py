@@ -0,0 +1,67 @@
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from src.core.models import Document
+from src.infrastructure.fs.dedup import MinHasher, NearDuplicateFilter, estimate_similarity
+
+REPORT = (
+    "The quarterly report shows that revenue grew by twelve percent while "
+    "operating costs remained stable across all regions. The board approved "
+    "the new investment plan for renewable energy and the expansion of the "
+    "logistics network in the northern districts during the next fiscal year."
+)
+
+
+def test_signature_similarity():
+    hasher = MinHasher(num_perm=128)
+    same = hasher.signature(REPORT)
+    # La misma extracción con otro formato de espacios y mayúsculas
+    reformatted = hasher.signature(REPORT.upper().replace(" ", "\n"))
+    other = hasher.signature("A completely different text about dogs, cats and the weather in spring.")
+
+    assert estimate_similarity(same, reformatted) == 1.0
+    assert estimate_similarity(same, other) < 0.2
+
+
+def test_keeps_longest_as_canonical():
+    docs = [
+        Document(title="report", content=REPORT, path="report.pdf"),
+        Document(title="report", content=REPORT + " Page 2.", path="report.docx"),
+        Document(title="notes", content="Meeting notes about the office party and the menu.", path="notes.txt"),
+        Document(title="report", content=REPORT.replace("twelve", "12"), path="report.html"),
+    ]
+
+    kept = NearDuplicateFilter(threshold=0.7).process(docs)
+
+    assert [doc.path for doc in kept] == ["report.docx", "notes.txt"]
+    assert sorted(kept[0].metadata["aliases"]) == ["report.html", "report.pdf"]
+    assert "aliases" not in kept[1].metadata
+    # Los documentos de entrada no se modifican
+    assert all("aliases" not in doc.metadata for doc in docs)
+    assert kept[1] is docs[2]
+
+
+def test_documents_without_words_are_not_grouped():
+    docs = [
+        Document(title="escaneado", content="", path="scan1.pdf"),
+        Document(title="escaneado", content="  \n\t ", path="scan2.pdf"),
+        Document(title="simbolos", content="--- ... ***", path="rule.txt"),
+        Document(title="report", content=REPORT, path="report.pdf"),
+    ]
+
+    assert MinHasher().signature("   ") is None
+    kept = NearDuplicateFilter().process(docs)
+
+    assert [doc.path for doc in kept] == ["scan1.pdf", "scan2.pdf", "rule.txt", "report.pdf"]
+    assert all("aliases" not in doc.metadata for doc in kept)
+
+
+if __name__ == "__main__":
+    test_signature_similarity()
+    test_keeps_longest_as_canonical()
+    test_documents_without_words_are_not_grouped()
+    print("✅ Deduplicación OK")
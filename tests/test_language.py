@@ -0,0 +1,56 @@
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from src.core.models import Document, ExpandedQuery
+from src.infrastructure.search_engine.adapter import WhooshAdapter
+from src.infrastructure.search_engine.language import LanguageDetector
+from src.infrastructure.search_engine.reader import WhooshReader
+from src.infrastructure.search_engine.writer import WhooshWriter
+
+
+def test_detects_language_by_stopwords():
+    detector = LanguageDetector()
+
+    assert detector.detect("El coche rojo es el más rápido de la carrera.") == "spanish"
+    assert detector.detect("The red car is the fastest on the track.") == "english"
+    # Sin palabras vacías no hay forma de decidir
+    assert detector.detect("coche veloz") is None
+    assert LanguageDetector(min_hits=1).detect("¿coche veloz?") == "spanish"
+
+
+def test_spanish_documents_use_their_own_field():
+    adapter = WhooshAdapter(None, in_memory=True)
+    writer = WhooshWriter(adapter)
+    writer.add_documents([
+        Document(
+            title="Camiones",
+            content="Los camiones de la empresa transportan la información por el país.",
+            path="es/camiones.txt",
+        ),
+    ])
+    writer.commit()
+
+    with adapter.get_index().searcher() as searcher:
+        stored = searcher.document(path="es/camiones.txt")
+        assert stored["language"] == "spanish"
+        # El texto original se guarda en `content`, pero solo se indexa en content_es
+        assert stored["content"].startswith("Los camiones")
+        assert list(searcher.lexicon("content")) == []
+        assert b"camion" in list(searcher.lexicon("content_es"))
+
+    # Singular y sin tilde: el stemmer y el plegado de acentos lo igualan
+    reader = WhooshReader(adapter)
+    results = reader.search(
+        ExpandedQuery(original_text="camion", expanded_terms=["camion"], language="spanish")
+    )
+    assert [r.path for r in results] == ["es/camiones.txt"]
+    assert "<b" in results[0].snippet
+
+
+if __name__ == "__main__":
+    test_detects_language_by_stopwords()
+    test_spanish_documents_use_their_own_field()
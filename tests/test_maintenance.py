@@ -0,0 +1,77 @@
+import datetime
+import os
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from src.infrastructure.search_engine.adapter import IndexStats, WhooshAdapter
+from src.infrastructure.search_engine.maintenance import OptimizePolicy, OptimizeScheduler
+
+
+def at(hour):
+    return datetime.datetime(2024, 1, 1, hour, 30)
+
+
+def stats(segments=1, docs=100, deleted=0):
+    return IndexStats(segment_count=segments, doc_count=docs, deleted_count=deleted, size_bytes=0, generation=1)
+
+
+def test_deleted_ratio():
+    assert stats(docs=75, deleted=25).deleted_ratio == 0.25
+    assert stats(docs=0, deleted=0).deleted_ratio == 0.0
+
+
+def test_offpeak_window():
+    assert OptimizePolicy().in_window(at(14))
+
+    night = OptimizePolicy(offpeak_hours=(2, 5))
+    assert [night.in_window(at(h)) for h in (1, 2, 4, 5)] == [False, True, True, False]
+
+    # Ventana que cruza la medianoche
+    late = OptimizePolicy(offpeak_hours=(23, 4))
+    assert [late.in_window(at(h)) for h in (22, 23, 0, 3, 4)] == [False, True, True, True, False]
+
+
+def test_should_optimize_thresholds():
+    policy = OptimizePolicy(max_segments=10, max_deleted_ratio=0.2, offpeak_hours=(2, 5))
+
+    assert not policy.should_optimize(stats(segments=10, deleted=20), at(3))
+    assert policy.should_optimize(stats(segments=11), at(3))
+    assert policy.should_optimize(stats(docs=70, deleted=30), at(3))
+    # Fuera de la ventana nunca se compacta
+    assert not policy.should_optimize(stats(segments=50, deleted=90), at(12))
+
+
+def test_scheduler_compacts_in_background():
+    adapter = WhooshAdapter(None, in_memory=True)
+    ix = adapter.get_index()
+    for i in range(3):
+        writer = ix.writer()
+        writer.add_document(title=f"t{i}", content="", path=f"d{i}.txt")
+        # Sin fusionar: un segmento por commit
+        writer.commit(merge=False)
+    assert adapter.get_stats().segment_count == 3
+
+    scheduler = OptimizeScheduler(adapter, OptimizePolicy(max_segments=1), interval=0.01)
+    scheduler.start()
+    try:
+        deadline = time.monotonic() + 5
+        while adapter.get_stats().segment_count > 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        scheduler.stop()
+
+    assert adapter.get_stats().segment_count == 1
+    assert adapter.get_stats().doc_count == 3
+    # Ya compactado: la política no vuelve a actuar
+    assert scheduler.check() is False
+
+
+if __name__ == "__main__":
+    test_deleted_ratio()
+    test_offpeak_window()
+    test_should_optimize_thresholds()
+    test_scheduler_compacts_in_background()
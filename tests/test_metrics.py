@@ -0,0 +1,44 @@
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from src.core import metrics
+from src.infrastructure.observability.metrics_sink import InMemoryMetricsSink
+
+
+def test_disabled_metrics_are_noops():
+    metrics.set_sink(None)
+    with metrics.timed("anything"):
+        pass
+    metrics.increment("anything")
+
+
+def test_sink_collects_and_exports():
+    sink = InMemoryMetricsSink(buckets=(0.1, 1.0))
+    metrics.set_sink(sink)
+    try:
+        metrics.increment("documents_loaded_total", format=".pdf")
+        metrics.increment("documents_loaded_total", format=".pdf")
+        metrics.observe("extraction_seconds", 0.5, format=".pdf")
+        with metrics.timed("commit_seconds"):
+            pass
+    finally:
+        metrics.set_sink(None)
+
+    snapshot = sink.snapshot()
+    assert snapshot["documents_loaded_total"] == {'{format=".pdf"}': 2.0}
+    assert snapshot["commit_seconds"][""]["count"] == 1
+
+    text = sink.render_prometheus()
+    assert 'celene_extraction_seconds_bucket{format=".pdf",le="0.1"} 0' in text
+    assert 'celene_extraction_seconds_bucket{format=".pdf",le="1.0"} 1' in text
+    assert 'celene_extraction_seconds_count{format=".pdf"} 1' in text
+
+
+if __name__ == "__main__":
+    test_disabled_metrics_are_noops()
+    test_sink_collects_and_exports()
+    print("✅ Métricas OK")
@@ -0,0 +1,88 @@
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from src.core.interfaces import INLPComponent
+from src.domain_nlp.pipeline import ExpansionMode, NLPPipeline
+
+
+# Componentes de prueba: no necesitan los corpus de NLTK
+class SplitTokenizer(INLPComponent):
+    def process(self, text: str) -> list[str]:
+        return text.lower().split()
+
+
+class RecordingTagger(INLPComponent):
+    skippable = True
+
+    def __init__(self):
+        self.calls = 0
+
+    def process(self, tokens: list[str]) -> list[tuple[str, str]]:
+        self.calls += 1
+        return [(t, "NN") for t in tokens]
+
+
+class SuffixExpander(INLPComponent):
+    skippable = True
+
+    def process(self, tagged: list[tuple[str, str]]) -> list[str]:
+        return [w for word, _ in tagged for w in (word, f"{word}_syn")]
+
+
+def build(mode=ExpansionMode.FULL, max_expand_tokens=8):
+    tagger = RecordingTagger()
+    pipeline = NLPPipeline(
+        components=[SplitTokenizer(), tagger, SuffixExpander()],
+        expansion_mode=mode,
+        max_expand_tokens=max_expand_tokens,
+    )
+    return pipeline, tagger
+
+
+def test_full_expansion_runs_every_stage():
+    pipeline, tagger = build()
+    result = pipeline.process("Car")
+    assert sorted(result.expanded_terms) == ["car", "car_syn"]
+    assert tagger.calls == 1
+
+
+def test_mode_none_skips_enrichment():
+    pipeline, tagger = build(mode="none")
+    assert pipeline.process("fast car").expanded_terms == ["fast", "car"]
+    assert tagger.calls == 0
+
+
+def test_long_query_skips_enrichment():
+    pipeline, tagger = build(max_expand_tokens=2)
+    assert pipeline.process("a b c").expanded_terms == ["a", "b", "c"]
+    assert tagger.calls == 0
+
+
+def test_quoted_phrase_is_not_processed():
+    pipeline, tagger = build()
+    result = pipeline.process('"red car"')
+    assert result.expanded_terms == ["red car"]
+    assert result.to_boolean_query() == '"red car"'
+    assert tagger.calls == 0
+
+
+def test_numeric_tokens_pass_through():
+    pipeline, tagger = build()
+    result = pipeline.process("2024 f1 report")
+    assert sorted(result.expanded_terms) == ["2024", "f1", "report", "report_syn"]
+
+    pipeline.process("2024")
+    assert tagger.calls == 1
+
+
+if __name__ == "__main__":
+    test_full_expansion_runs_every_stage()
+    test_mode_none_skips_enrichment()
+    test_long_query_skips_enrichment()
+    test_quoted_phrase_is_not_processed()
+    test_numeric_tokens_pass_through()
+    print("✅ Pipeline configurable OK")
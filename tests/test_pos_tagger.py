@@ -0,0 +1,132 @@
+import os
+import sys
+import tempfile
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from src.domain_nlp import components
+from src.domain_nlp.components import LexiconPOSTagger, WordNetExpander
+
+
+class FakeLemma:
+    def __init__(self, name, count=0):
+        self._name, self._count = name, count
+
+    def name(self):
+        return self._name
+
+    def count(self):
+        return self._count
+
+
+class FakeSynset:
+    def __init__(self, pos, *lemmas):
+        self._pos, self._lemmas = pos, [FakeLemma(name) for name in lemmas]
+
+    def pos(self):
+        return self._pos
+
+    def lemmas(self, lang="eng"):
+        return self._lemmas
+
+
+class FakeWordNet:
+    """WordNet mínimo: registra las palabras consultadas."""
+
+    ADJ, VERB, NOUN, ADV = "a", "v", "n", "r"
+
+    def __init__(self, senses):
+        self.senses = senses
+        self.queried: list[str] = []
+
+    def synsets(self, word, pos=None, lang="eng"):
+        self.queried.append(word)
+        return [s for s in self.senses.get(word, []) if pos is None or s.pos() == pos]
+
+
+def _with_fakes(senses, tagged=None):
+    """Sustituye WordNet y pos_tag del módulo mientras dura la prueba."""
+    def decorator(test):
+        def run():
+            wordnet = FakeWordNet(senses)
+            perceptron_calls: list[list[str]] = []
+
+            def pos_tag(tokens):
+                perceptron_calls.append(tokens)
+                return [(t, (tagged or {}).get(t, "NN")) for t in tokens]
+
+            originals = components.wordnet, components.nltk.pos_tag
+            components.wordnet, components.nltk.pos_tag = wordnet, pos_tag
+            try:
+                test(wordnet, perceptron_calls)
+            finally:
+                components.wordnet, components.nltk.pos_tag = originals
+        run.__name__ = test.__name__
+        return run
+    return decorator
+
+
+@_with_fakes({})
+def test_lexicon_hits_skip_wordnet_and_perceptron(wordnet, perceptron_calls):
+    tagger = LexiconPOSTagger(lexicon={"may": "MD", "among": "IN"})
+
+    assert tagger.process(["may", "among", "2024"]) == [("may", "MD"), ("among", "IN"), ("2024", "CD")]
+    assert wordnet.queried == [] and perceptron_calls == []
+
+
+@_with_fakes(
+    {"run": [FakeSynset("v", "run"), FakeSynset("v", "run"), FakeSynset("n", "run")]},
+    tagged={"blorp": "VB"},
+)
+def test_unknown_words_fall_back_to_wordnet_then_perceptron(wordnet, perceptron_calls):
+    tagger = LexiconPOSTagger(lexicon={"fast": "JJ"})
+
+    # "run": categoría más frecuente en WordNet; "blorp": la del perceptrón,
+    # que recibe la consulta completa para conservar el contexto
+    assert tagger.process(["fast", "run", "blorp"]) == [("fast", "JJ"), ("run", "VB"), ("blorp", "VB")]
+    assert perceptron_calls == [["fast", "run", "blorp"]]
+
+    # Memoizado: repetir la consulta no vuelve a consultar nada
+    tagger.process(["fast", "run", "blorp"])
+    assert wordnet.queried == ["run", "blorp"] and len(perceptron_calls) == 1
+
+    # Sin respaldo, las desconocidas quedan como sustantivo
+    assert LexiconPOSTagger(use_fallback=False).process(["blorp"]) == [("blorp", "NN")]
+
+
+def test_save_and_load_round_trip():
+    tagger = LexiconPOSTagger.from_tagged_corpus(
+        [("The", "DT"), ("may", "MD"), ("May", "NNP"), ("may", "MD"), ("rare", "JJ")], min_count=2
+    )
+    assert tagger.lexicon == {"may": "MD"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "lexicon.json")
+        tagger.save(path)
+        assert LexiconPOSTagger.load(path, use_fallback=False).lexicon == tagger.lexicon
+
+
+def test_default_pipeline_lexicon_is_shipped():
+    lexicon = LexiconPOSTagger.load().lexicon
+
+    assert lexicon["may"] == "MD" and lexicon["among"] == "IN" and lexicon["one"] == "CD"
+    # Mismo diccionario para todos los pipelines del proceso
+    assert LexiconPOSTagger.load().lexicon is lexicon
+
+
+@_with_fakes({"may": [FakeSynset("n", "May", "Maying")], "car": [FakeSynset("n", "car", "auto")]})
+def test_closed_class_words_are_not_expanded(wordnet, perceptron_calls):
+    expanded = WordNetExpander().process([("may", "MD"), ("car", "NN")])
+
+    assert sorted(expanded) == ["auto", "car", "may"]
+    assert wordnet.queried == ["car"]
+
+
+if __name__ == "__main__":
+    test_lexicon_hits_skip_wordnet_and_perceptron()
+    test_unknown_words_fall_back_to_wordnet_then_perceptron()
+    test_save_and_load_round_trip()
+    test_default_pipeline_lexicon_is_shipped()
+    test_closed_class_words_are_not_expanded()
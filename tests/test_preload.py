@@ -0,0 +1,116 @@
+import io
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from src.core import metrics
+from src.domain_nlp import resources
+from src.domain_nlp.resources import WARMUP_QUERIES, release_file_handles, warm_up
+
+
+class RecordingPipeline:
+    def __init__(self):
+        self.queries: list[str] = []
+
+    def process(self, raw_query):
+        self.queries.append(raw_query)
+
+
+class FakeWordNet:
+    """Imita los descriptores que WordNetCorpusReader deja abiertos."""
+
+    def __init__(self):
+        self._data_file_map = {"noun": io.BytesIO(b"n"), "verb": io.BytesIO(b"v")}
+        self._key_count_file = io.BytesIO(b"k")
+
+
+def test_warm_up_runs_every_query():
+    pipeline = RecordingPipeline()
+    assert warm_up(pipeline) >= 0  # type: ignore[arg-type]
+    assert pipeline.queries == WARMUP_QUERIES
+
+    pipeline = RecordingPipeline()
+    warm_up(pipeline, ["uno", "dos"])  # type: ignore[arg-type]
+    assert pipeline.queries == ["uno", "dos"]
+
+
+def test_release_file_handles_closes_wordnet_files():
+    fake = FakeWordNet()
+    handles = list(fake._data_file_map.values())
+    count_file = fake._key_count_file
+
+    original = resources.wordnet
+    resources.wordnet = fake  # type: ignore[assignment]
+    try:
+        release_file_handles()
+        # Sin ficheros abiertos es un no-op
+        release_file_handles()
+    finally:
+        resources.wordnet = original
+
+    assert all(handle.closed for handle in handles) and count_file.closed
+    assert fake._data_file_map == {} and fake._key_count_file is None
+
+
+def test_prepare_for_fork_warms_up_without_metrics_or_writer():
+    from src.web import prepare_for_fork, routes
+
+    calls: list[str] = []
+    sinks_seen: list[object] = []
+    patches = {
+        "preload_nlp_resources": lambda languages: calls.append(f"preload {','.join(languages)}"),
+        "warm_up": lambda pipeline: calls.append("warm_up") or 0.0,
+        "release_file_handles": lambda: calls.append("release"),
+        "freeze_heap": lambda: calls.append("freeze"),
+    }
+    originals = {name: getattr(resources, name) for name in patches}
+    original_search = routes.search_service.execute_search
+
+    def search(query):
+        sinks_seen.append(metrics.get_sink())
+        return []
+
+    for name, fn in patches.items():
+        setattr(resources, name, fn)
+    routes.search_service.execute_search = search  # type: ignore[method-assign]
+    try:
+        sink = metrics.get_sink()
+        prepare_for_fork()
+    finally:
+        for name, fn in originals.items():
+            setattr(resources, name, fn)
+        del routes.search_service.execute_search
+
+    # Los descriptores se cierran y el heap se congela al final, tras calentar
+    assert calls == ["preload english,spanish", "warm_up", "release", "freeze"]
+    assert len(sinks_seen) == len(WARMUP_QUERIES) and set(sinks_seen) == {None}
+    assert metrics.get_sink() is sink
+    # El maestro no arranca el hilo escritor: lo heredaría cada worker
+    service = routes.indexing_service
+    assert service is None or not service.status().running
+    assert routes.search_service.execute_search == original_search
+
+
+def test_web_ingestion_can_be_disabled():
+    from src.web import create_app, routes
+
+    client = create_app().test_client()
+    original = routes.indexing_service
+    routes.indexing_service = None
+    try:
+        response = client.post("/documents", json={"path": "a.txt", "content": "texto"})
+        assert response.status_code == 503
+        assert client.delete("/documents?path=a.txt").status_code == 503
+        assert client.get("/index/status").get_json()["indexing"] is None
+    finally:
+        routes.indexing_service = original
+
+
+if __name__ == "__main__":
+    test_warm_up_runs_every_query()
+    test_release_file_handles_closes_wordnet_files()
+    test_prepare_for_fork_warms_up_without_metrics_or_writer()
+    test_web_ingestion_can_be_disabled()
@@ -0,0 +1,137 @@
+import json
+import os
+import sys
+import tempfile
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from src.core.interfaces import IIndexReader
+from src.core.models import ExpandedQuery, QueryProfile, SearchResult
+from src.domain_nlp.pipeline import ExpansionMode
+from src.services import search_service
+from src.services.query_profiler import QueryProfiler
+from src.services.search_service import SearchService
+
+
+class FakeClock:
+    """Sustituye al módulo `time` de search_service: el tiempo solo avanza a mano."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self):
+        return self.now
+
+
+class SlowNLP:
+    expansion_mode = ExpansionMode.FULL
+
+    def __init__(self, clock, seconds):
+        self.clock, self.seconds = clock, seconds
+
+    def process(self, text):
+        self.clock.now += self.seconds
+        return ExpandedQuery(original_text=text, expanded_terms=text.split())
+
+
+class SlowReader(IIndexReader):
+    def __init__(self, clock, seconds):
+        self.clock, self.seconds = clock, seconds
+
+    def search(self, query, profile=None):
+        self.clock.now += self.seconds
+        if profile is not None:
+            profile.matched_docs = 7
+            profile.returned_docs = 1
+        return [SearchResult(title="doc", path="doc.txt", score=1.0)]
+
+
+def _profiler(tmp, **kwargs):
+    return QueryProfiler(os.path.join(tmp, "logs", "slow.log"), **kwargs)
+
+
+def _entries(tmp, profiler):
+    for handler in profiler._logger.handlers:
+        handler.flush()
+    path = os.path.join(tmp, "logs", "slow.log")
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _close(profiler):
+    for handler in list(profiler._logger.handlers):
+        handler.close()
+        profiler._logger.removeHandler(handler)
+
+
+def test_record_writes_slow_or_sampled_queries():
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = _profiler(tmp, slow_threshold_ms=100)
+        try:
+            assert not profiler.record(QueryProfile(query="rápida", total_seconds=0.05))
+            assert profiler.record(QueryProfile(query="lenta", total_seconds=0.1))
+            assert profiler.record(QueryProfile(query="muestreada", total_seconds=0.01, sampled_profile="stats"))
+
+            entries = _entries(tmp, profiler)
+        finally:
+            _close(profiler)
+
+    assert [(e["query"], e["slow"]) for e in entries] == [("lenta", True), ("muestreada", False)]
+    assert entries[1]["sampled_profile"] == "stats"
+
+
+def test_slow_queries_are_logged_with_stage_timings():
+    clock = FakeClock()
+    original_time = search_service.time
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = _profiler(tmp, slow_threshold_ms=300)
+        reader = SlowReader(clock, seconds=0.25)
+        service = SearchService(reader, SlowNLP(clock, seconds=0.125), profiler=profiler)  # type: ignore[arg-type]
+        search_service.time = clock  # type: ignore[assignment]
+        try:
+            service.search("red car")
+            reader.seconds = 0.01
+            service.search("blue car")
+            entries = _entries(tmp, profiler)
+        finally:
+            search_service.time = original_time
+            _close(profiler)
+
+    # Solo la primera (375 ms) supera el umbral
+    assert len(entries) == 1
+    entry = entries[0]
+    assert entry["query"] == "red car" and entry["slow"]
+    assert entry["total_seconds"] == 0.375
+    assert entry["timings"] == {"nlp": 0.125, "reader": 0.25}
+    assert entry["expanded_term_count"] == 2 and entry["matched_docs"] == 7
+    assert entry["sampled_profile"] is None
+
+
+def test_sampled_queries_carry_cprofile_stats():
+    with tempfile.TemporaryDirectory() as tmp:
+        never = QueryProfiler(os.path.join(tmp, "never.log"), sample_rate=0.0)
+        always = _profiler(tmp, slow_threshold_ms=10_000, sample_rate=1.0)
+        try:
+            assert not never.should_sample()
+            assert always.should_sample()
+
+            service = SearchService(SlowReader(FakeClock(), 0), SlowNLP(FakeClock(), 0), profiler=always)  # type: ignore[arg-type]
+            service.search("red car")
+            entries = _entries(tmp, always)
+        finally:
+            _close(never)
+            _close(always)
+
+    # Rápida, pero muestreada: se registra con las funciones más costosas
+    assert len(entries) == 1 and not entries[0]["slow"]
+    assert "function calls" in entries[0]["sampled_profile"]
+
+
+if __name__ == "__main__":
+    test_record_writes_slow_or_sampled_queries()
+    test_slow_queries_are_logged_with_stage_timings()
+    test_sampled_queries_carry_cprofile_stats()
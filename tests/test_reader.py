@@ -0,0 +1,69 @@
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from whoosh.searching import Hit
+
+from src.core.models import Document, ExpandedQuery
+from src.infrastructure.search_engine.adapter import WhooshAdapter
+from src.infrastructure.search_engine.reader import WhooshReader
+from src.infrastructure.search_engine.writer import WhooshWriter
+
+
+def spanish(path, content, **metadata):
+    return Document(title=path.upper(), content=content, path=path, metadata={"language": "spanish", **metadata})
+
+
+def build_index():
+    adapter = WhooshAdapter(None, in_memory=True)
+    writer = WhooshWriter(adapter)
+    writer.add_documents([
+        spanish("camiones.txt", "los camiones de la empresa recorren el país"),
+        spanish("coches.txt", "coches y camiones en la autopista, camiones lentos"),
+        # Pasajes de un documento troceado: se agrupan por `parent`
+        spanish("informe.pdf#p0", "informe anual de la flota de camiones", parent="informe.pdf", offset=0, page=1),
+        spanish("informe.pdf#p1", "camiones nuevos y camiones viejos del informe", parent="informe.pdf", offset=40, page=2),
+        spanish("barcos.txt", "barcos en el puerto"),
+    ])
+    writer.commit()
+    return adapter
+
+
+def query(text):
+    return ExpandedQuery(original_text=text, expanded_terms=[text], language="spanish")
+
+
+def test_metadata_only_reads_columns_without_stored_fields():
+    adapter = build_index()
+    loaded: list[int] = []
+    original = Hit.fields
+
+    def fields(self):
+        loaded.append(self.docnum)
+        return original(self)
+
+    Hit.fields = fields  # type: ignore[method-assign]
+    try:
+        metadata_only = WhooshReader(adapter, snippets=False).search(query("camion"))
+        # Nunca se deserializa el documento almacenado (ni su contenido)
+        assert loaded == []
+        with_snippets = WhooshReader(adapter).search(query("camion"))
+        assert loaded
+    finally:
+        Hit.fields = original  # type: ignore[method-assign]
+
+    # Mismo ranking y scores; los pasajes se resuelven a su documento de origen
+    assert [(r.title, r.path, r.score) for r in metadata_only] == [
+        (r.title, r.path, r.score) for r in with_snippets
+    ]
+    assert sorted(r.path for r in metadata_only) == ["camiones.txt", "coches.txt", "informe.pdf"]
+    # Sin snippets ni posición del pasaje (son campos almacenados)
+    assert all(r.snippet == "" and r.page is None for r in metadata_only)
+    assert all(r.snippet for r in with_snippets)
+
+
+if __name__ == "__main__":
+    test_metadata_only_reads_columns_without_stored_fields()
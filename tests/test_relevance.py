@@ -0,0 +1,39 @@
+import math
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from benchmarks.relevance import average_precision, evaluate_run, ndcg_at_k, recall_at_k
+
+
+def test_ranking_metrics():
+    judgments = {"a": 2, "b": 1, "c": 0, "d": 1}
+    ranking = ["c", "a", "x", "b"]
+
+    # Relevantes en las posiciones 2 y 4 de 3 relevantes en total
+    assert math.isclose(average_precision(ranking, judgments), (1 / 2 + 2 / 4) / 3)
+    assert recall_at_k(ranking, judgments, k=2) == 1 / 3
+    assert recall_at_k(ranking, judgments, k=10) == 2 / 3
+
+    ideal = 2 + 1 / math.log2(3) + 1 / math.log2(4)
+    actual = 2 / math.log2(3) + 1 / math.log2(5)
+    assert math.isclose(ndcg_at_k(ranking, judgments, k=10), actual / ideal)
+    assert ndcg_at_k(["a", "b", "d"], judgments, k=3) == 1.0
+
+
+def test_unanswered_queries_count_as_zero():
+    qrels = {"q1": {"a": 1}, "q2": {"b": 1}, "q3": {"c": 0}}
+    metrics = evaluate_run({"q1": ["a"]}, qrels, k=5)
+
+    # q3 no tiene relevantes: no entra en la media
+    assert metrics["judged_queries"] == 2
+    assert metrics["map"] == 0.5
+    assert metrics["recall@5"] == 0.5
+
+
+if __name__ == "__main__":
+    test_ranking_metrics()
+    test_unanswered_queries_count_as_zero()
@@ -0,0 +1,139 @@
+import os
+import sys
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from src.core.interfaces import IIndexReader
+from src.core.models import ExpandedQuery, SearchResult
+from src.domain_nlp.pipeline import ExpansionMode
+from src.services.search_service import SearchService
+
+
+class FakeNLP:
+    """Expande cada palabra en `synonyms` variantes."""
+
+    def __init__(self, synonyms: int, expansion_mode=ExpansionMode.FULL):
+        self.synonyms = synonyms
+        self.expansion_mode = expansion_mode
+
+    def process(self, text: str) -> ExpandedQuery:
+        words = text.split()
+        if self.expansion_mode is ExpansionMode.NONE:
+            return ExpandedQuery(original_text=text, expanded_terms=words)
+        terms = [f"{w}{i}" for w in words for i in range(self.synonyms)]
+        return ExpandedQuery(original_text=text, expanded_terms=terms)
+
+
+class FakeReader(IIndexReader):
+    def __init__(
+        self, partial: bool = False, gate: threading.Event | None = None, seconds_per_term: float = 0.0
+    ):
+        self.partial = partial
+        self.gate = gate
+        self.seconds_per_term = seconds_per_term
+        self.queries: list[ExpandedQuery] = []
+        self.entered = threading.Event()
+
+    def search(self, query, profile=None):
+        return self.search_within(query, None, profile)[0]
+
+    def search_within(self, query, time_limit, profile=None):
+        self.queries.append(query)
+        self.entered.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        time.sleep(self.seconds_per_term * len(query.expanded_terms))
+        return [SearchResult(title="doc", path="doc.txt", score=1.0)], self.partial
+
+
+def test_oversized_expansion_falls_back_to_literal():
+    reader = FakeReader()
+    service = SearchService(
+        reader, FakeNLP(synonyms=10), time_budget=1.0, max_expanded_terms=8,
+        literal_nlp=FakeNLP(synonyms=1, expansion_mode=ExpansionMode.NONE),
+    )
+
+    response = service.search("red car")
+
+    assert response.expansion_skipped and response.degraded
+    assert reader.queries[-1].expanded_terms == ["red", "car"]
+    assert response.results
+
+
+def test_expansion_is_skipped_by_measured_cost():
+    reader = FakeReader(seconds_per_term=0.01)
+    service = SearchService(
+        reader, FakeNLP(synonyms=10), time_budget=0.15,
+        literal_nlp=FakeNLP(synonyms=1, expansion_mode=ExpansionMode.NONE),
+    )
+
+    # Sin tope fijo ni coste medido, la primera consulta se expande entera
+    assert not service.search("red car").expansion_skipped
+    assert len(reader.queries[-1].expanded_terms) == 20
+
+    # Medido ~0.01 s por término: 20 términos ya no caben en 0.15 s
+    response = service.search("red car")
+    assert response.expansion_skipped
+    assert reader.queries[-1].expanded_terms == ["red", "car"]
+
+
+def test_cost_estimate_recovers_when_the_index_is_fast_again():
+    reader = FakeReader()
+    service = SearchService(
+        reader, FakeNLP(synonyms=10), time_budget=0.15,
+        literal_nlp=FakeNLP(synonyms=1, expansion_mode=ExpansionMode.NONE),
+    )
+    assert not service.search("red car").expansion_skipped
+
+    # El índice se vuelve lento (~0.01 s por término): en pocas búsquedas
+    # la estimación sube y se descarta la expansión
+    reader.seconds_per_term = 0.01
+    skipped = [service.search("red car").expansion_skipped for _ in range(8)]
+    assert skipped[-1]
+
+    # Vuelve a ser rápido: las búsquedas literales también actualizan la
+    # estimación, que decae hasta que la expansión vuelve a caber
+    reader.seconds_per_term = 0.0001
+    skipped = [service.search("red car").expansion_skipped for _ in range(10)]
+    assert not skipped[-1]
+    assert len(reader.queries[-1].expanded_terms) == 20
+    assert service._seconds_per_term is not None and service._seconds_per_term < 0.005
+
+
+def test_partial_results_are_flagged():
+    service = SearchService(FakeReader(partial=True), FakeNLP(synonyms=1), time_budget=1.0)
+
+    response = service.search("red car")
+
+    assert response.partial and not response.expansion_skipped
+    assert len(response.results) == 1
+
+
+def test_excess_concurrency_is_shed():
+    gate = threading.Event()
+    reader = FakeReader(gate=gate)
+    service = SearchService(reader, FakeNLP(synonyms=1), max_in_flight=1)
+    busy = threading.Thread(target=service.search, args=("red car",))
+    busy.start()
+    try:
+        # Esperamos a que la primera consulta ocupe el único hueco
+        assert reader.entered.wait(5)
+        response = service.search("blue car")
+        assert response.shed and response.results == []
+    finally:
+        gate.set()
+        busy.join()
+
+    assert not service.search("blue car").shed
+
+
+if __name__ == "__main__":
+    test_oversized_expansion_falls_back_to_literal()
+    test_expansion_is_skipped_by_measured_cost()
+    test_cost_estimate_recovers_when_the_index_is_fast_again()
+    test_partial_results_are_flagged()
+    test_excess_concurrency_is_shed()
@@ -0,0 +1,150 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from src.core.models import Document, ExpandedQuery, QueryProfile
+from src.infrastructure.search_engine import sharding
+from src.infrastructure.search_engine.reader import WhooshReader
+from src.infrastructure.search_engine.sharding import (
+    ShardedWhooshAdapter, ShardedWhooshReader, ShardedWhooshWriter, shard_for,
+)
+
+NUM_SHARDS = 3
+
+
+def spanish(path, content, **metadata):
+    # Texto en español: su analizador no necesita los corpus de NLTK
+    return Document(title=path, content=content, path=path, metadata={"language": "spanish", **metadata})
+
+
+def query(text):
+    return ExpandedQuery(original_text=text, expanded_terms=[text], language="spanish")
+
+
+def stored_paths(adapter):
+    with adapter.get_index().searcher() as searcher:
+        return sorted(fields["path"] for fields in searcher.all_stored_fields())
+
+
+def indexed(tmp, docs):
+    adapter = ShardedWhooshAdapter(tmp, NUM_SHARDS)
+    writer = ShardedWhooshWriter(adapter)
+    writer.add_documents(docs)
+    writer.commit()
+    return adapter, writer
+
+
+def test_passages_go_to_their_parent_shard():
+    docs = []
+    for n in range(6):
+        parent = f"informes/{n}.pdf"
+        docs += [
+            spanish(f"{parent}#p{i}", f"pasaje {i} del informe {n}", parent=parent, offset=i * 10)
+            for i in range(3)
+        ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        adapter, _ = indexed(tmp, docs)
+
+        used = 0
+        for number, shard in enumerate(adapter.shards):
+            paths = stored_paths(shard)
+            used += bool(paths)
+            for path in paths:
+                assert shard_for(path.split("#")[0], NUM_SHARDS) == number
+        # El reparto usa más de un shard y no pierde ningún pasaje
+        assert used > 1
+        assert sum(len(stored_paths(s)) for s in adapter.shards) == len(docs)
+
+
+def test_deletes_are_routed_to_the_owning_shard():
+    docs = [spanish(f"doc{i}.txt", f"camiones y coches {i}") for i in range(8)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        adapter, writer = indexed(tmp, docs)
+        removed = ["doc1.txt", "doc4.txt", "doc6.txt"]
+
+        writer.delete_documents(removed)
+        for number, ops in enumerate(writer._pending):
+            for action, paths in ops:
+                assert action == "delete"
+                assert all(shard_for(p, NUM_SHARDS) == number for p in paths)
+        writer.commit()
+
+        remaining = sorted(p for shard in adapter.shards for p in stored_paths(shard))
+        assert remaining == sorted(d.path for d in docs if d.path not in removed)
+
+
+def test_search_merges_top_k_across_shards():
+    # Cuantas más repeticiones de "camion", más puntuación
+    docs = [spanish(f"doc{i}.txt", " ".join(["camion"] * (i + 1) + ["ruta"] * (8 - i))) for i in range(8)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        adapter, _ = indexed(tmp, docs)
+
+        everything = [
+            result
+            for shard in adapter.shards
+            for result in WhooshReader(shard, limit=100).search(query("camion"))
+        ]
+        expected = sorted(everything, key=lambda r: r.score, reverse=True)[:3]
+
+        reader = ShardedWhooshReader(adapter, limit=3, executor=ThreadPoolExecutor(NUM_SHARDS))
+        try:
+            profile = QueryProfile(query="camion")
+            results = reader.search(query("camion"), profile=profile)
+        finally:
+            reader.close()
+            sharding._shard_readers.clear()
+
+        assert [r.path for r in results] == [r.path for r in expected]
+        assert profile.matched_docs == len(docs) and profile.returned_docs == 3
+
+
+def test_search_within_skips_shards_that_miss_the_budget():
+    release = threading.Event()
+    original = sharding._search_shard
+
+    def search_shard(index_dir, query, limit, time_limit=None):
+        if index_dir.endswith("shard_01"):
+            # Shard atascado (ej: disco lento): no responde a tiempo
+            release.wait(5)
+        return original(index_dir, query, limit, time_limit)
+
+    docs = [spanish(f"doc{i}.txt", f"camion numero {i}") for i in range(12)]
+    with tempfile.TemporaryDirectory() as tmp:
+        adapter, _ = indexed(tmp, docs)
+        slow = set(stored_paths(adapter.shards[1]))
+        assert slow
+
+        sharding._search_shard = search_shard
+        reader = ShardedWhooshReader(adapter, limit=50, executor=ThreadPoolExecutor(NUM_SHARDS))
+        try:
+            started = time.perf_counter()
+            results, partial = reader.search_within(query("camion"), time_limit=0.2)
+            elapsed = time.perf_counter() - started
+        finally:
+            sharding._search_shard = original
+            release.set()
+            reader.close()
+            sharding._shard_readers.clear()
+
+        assert partial
+        assert elapsed < 2
+        paths = {r.path for r in results}
+        # Llegan los resultados de los shards que respondieron, no los del lento
+        assert paths == {d.path for d in docs} - slow
+
+
+if __name__ == "__main__":
+    test_passages_go_to_their_parent_shard()
+    test_deletes_are_routed_to_the_owning_shard()
+    test_search_merges_top_k_across_shards()
+    test_search_within_skips_shards_that_miss_the_budget()
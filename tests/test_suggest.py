@@ -0,0 +1,144 @@
+import os
+import sys
+import tempfile
+import threading
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from whoosh.reading import SegmentReader
+
+from src.core.models import Document
+from src.infrastructure.search_engine.adapter import WhooshAdapter
+from src.infrastructure.search_engine.suggester import (
+    CompletionIndex, CompletionIndexBuilder, CompletionRefresher, encode_completions,
+)
+from src.infrastructure.search_engine.writer import WhooshWriter
+from src.services.suggest_service import SuggestService
+
+ENTRIES = {
+    "car": (12, "car"),
+    "carbon": (3, "carbon"),
+    "card": (7, "card"),
+    "cat": (5, "cat"),
+    "the joy of painting": (5, "The Joy of Painting"),
+}
+
+
+def test_prefix_ranking():
+    index = CompletionIndex(encode_completions(ENTRIES, prefix_cache_len=2, cache_k=3))
+
+    # Prefijo corto: se resuelve con la caché de top-k
+    assert index.suggest("c", k=3) == ["car", "card", "cat"]
+    # Prefijo largo: búsqueda binaria sobre el array ordenado
+    assert index.suggest("car", k=10) == ["car", "card", "carbon"]
+    assert index.suggest("CAR", k=1) == ["car"]
+    # Se devuelve el texto original, no la clave normalizada
+    assert index.suggest("the j") == ["The Joy of Painting"]
+    assert index.suggest("zz") == []
+
+
+def test_service_reads_mmap_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "completions.bin")
+        service = SuggestService(path)
+
+        # Sin fichero todavía: no hay sugerencias pero tampoco errores
+        assert service.suggest("ca") == []
+
+        with open(path, "wb") as f:
+            f.write(encode_completions(ENTRIES))
+
+        assert service.suggest("ca", k=2) == ["car", "card"]
+
+        index = service._index
+        assert index is not None
+        index.close()
+
+
+def test_builder_collects_spanish_content_terms():
+    adapter = WhooshAdapter(None, in_memory=True)
+    writer = WhooshWriter(adapter)
+    writer.add_documents([
+        Document(title=f"Informe {i}", content=f"camiones por la carretera {i}", path=f"es{i}.txt",
+                 metadata={"language": "spanish"})
+        for i in range(3)
+    ])
+    writer.commit()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        builder = CompletionIndexBuilder(adapter, os.path.join(tmp, "completions.bin"))
+        entries = builder.collect()
+
+    # Los términos del cuerpo se indexan en `content_es`, no en `content`
+    assert entries["camion"] == (3, "camion")
+    assert entries["informe 0"] == (builder.title_weight, "Informe 0")
+
+
+def test_builder_reads_titles_from_columns():
+    adapter = WhooshAdapter(None, in_memory=True)
+    writer = WhooshWriter(adapter)
+    writer.add_documents([
+        Document(title="Flota", content="camiones", path="flota.txt", metadata={"language": "spanish"}),
+        *[
+            Document(title="Manual", content=f"pasaje {i}", path=f"manual.pdf#p{i}",
+                     metadata={"language": "spanish", "parent": "manual.pdf", "offset": i * 10})
+            for i in range(3)
+        ],
+    ])
+    writer.commit()
+
+    def no_stored_fields(self):
+        raise AssertionError("se cargaron los campos almacenados")
+
+    original = SegmentReader.all_stored_fields
+    SegmentReader.all_stored_fields = no_stored_fields  # type: ignore[method-assign]
+    try:
+        entries = CompletionIndexBuilder(adapter, "unused.bin", title_weight=5).collect()
+    finally:
+        SegmentReader.all_stored_fields = original  # type: ignore[method-assign]
+
+    # El título de un documento troceado cuenta una sola vez
+    assert entries["flota"] == (5, "Flota")
+    assert entries["manual"] == (5, "Manual")
+
+
+class CountingBuilder:
+    def __init__(self):
+        self.builds = 0
+        self.built = threading.Event()
+
+    def build(self):
+        self.builds += 1
+        self.built.set()
+        return 0
+
+
+def test_refresher_coalesces_requests_off_the_caller_thread():
+    builder = CountingBuilder()
+    refresher = CompletionRefresher(builder, min_interval=0.5)  # type: ignore[arg-type]
+    refresher.start()
+    try:
+        refresher.request()
+        assert builder.built.wait(5)
+        builder.built.clear()
+
+        # Durante el intervalo mínimo las peticiones se agrupan en una sola reconstrucción
+        for _ in range(10):
+            refresher.request()
+        assert builder.builds == 1
+        assert builder.built.wait(5)
+    finally:
+        refresher.stop()
+
+    assert builder.builds == 2
+
+
+if __name__ == "__main__":
+    test_prefix_ranking()
+    test_service_reads_mmap_file()
+    test_builder_collects_spanish_content_terms()
+    test_builder_reads_titles_from_columns()
+    test_refresher_coalesces_requests_off_the_caller_thread()
+    print("✅ Autocompletado OK")
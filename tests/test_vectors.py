@@ -0,0 +1,216 @@
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from whoosh.reading import SegmentReader
+
+from src.core.models import Document, ExpandedQuery, SearchResult
+from src.infrastructure.search_engine import analyzer as analyzer_module
+from src.infrastructure.search_engine.adapter import WhooshAdapter
+from src.infrastructure.search_engine.vectors import (
+    CURRENT, VectorIndex, VectorIndexBuilder, VectorReranker, _SparseMatrix, _randomized_svd,
+)
+from src.infrastructure.search_engine.writer import WhooshWriter
+
+VEHICLES = [
+    "car engine fuel road driver",
+    "truck engine road fuel wheel",
+    "car wheel driver road traffic",
+    "truck driver traffic fuel engine",
+]
+ANIMALS = [
+    "dog cat pet food fur",
+    "cat kitten pet fur milk",
+    "dog puppy pet food bark",
+    "kitten puppy fur milk food",
+]
+
+
+def _with_fake_lemmatizer(test):
+    """El campo `content` lematiza con WordNet: se sustituye por la identidad."""
+    def run():
+        original = analyzer_module.lemmatize_noun
+        analyzer_module.lemmatize_noun = lambda word: word
+        try:
+            test()
+        finally:
+            analyzer_module.lemmatize_noun = original
+    run.__name__ = test.__name__
+    return run
+
+
+def build_index(texts, passages=()):
+    adapter = WhooshAdapter(None, in_memory=True)
+    writer = WhooshWriter(adapter)
+    docs = [Document(title=f"d{i}", content=text, path=f"d{i}.txt") for i, text in enumerate(texts)]
+    docs += [
+        Document(title="manual", content=text, path=f"manual.pdf#p{i}", metadata={"parent": "manual.pdf", "offset": i})
+        for i, text in enumerate(passages)
+    ]
+    writer.add_documents(docs)
+    writer.commit()
+    return adapter
+
+
+def test_randomized_svd_matches_dense():
+    rng = np.random.default_rng(7)
+    # Matriz documento-término de rango 3, con la mayoría de celdas vacías
+    docs = rng.random((40, 3)) * (rng.random((40, 3)) < 0.5)
+    terms = rng.random((3, 60)) * (rng.random((3, 60)) < 0.5)
+    dense = docs @ terms
+    rows, cols = np.nonzero(dense)
+    matrix = _SparseMatrix(rows, cols, dense[rows, cols], dense.shape)
+
+    doc_vectors, term_basis = _randomized_svd(matrix, k=3, power_iterations=3, seed=0)
+
+    expected = np.linalg.svd(dense, compute_uv=False)[:3]
+    assert np.allclose(np.linalg.norm(doc_vectors, axis=0), expected, rtol=1e-3)
+    # Los vectores de documento son la proyección de sus filas sobre la base de términos
+    assert np.allclose(doc_vectors, dense @ term_basis, atol=1e-6)
+
+
+@_with_fake_lemmatizer
+def test_build_and_reload_memory_mapped_index():
+    adapter = build_index(VEHICLES + ANIMALS, passages=["car engine manual", "engine fuel road"])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assert VectorIndexBuilder(adapter, tmp, dims=4).build() == 9
+
+        index = VectorIndex(tmp)
+        # Las matrices se sirven mapeadas desde disco, no copiadas en memoria
+        assert isinstance(index.doc_vectors, np.memmap) and isinstance(index.term_vectors, np.memmap)
+        assert index.doc_vectors.shape == (9, 4)
+        assert np.allclose(np.linalg.norm(index.doc_vectors, axis=1), 1.0, atol=1e-5)
+        # Los pasajes comparten la fila de su documento de origen
+        assert "manual.pdf" in index.row_of and "manual.pdf#p0" not in index.row_of
+        # min_df=2: los términos de un solo documento no entran en el vocabulario
+        assert "engine" in index.term_ids and "bark" not in index.term_ids
+
+        # El reranker recarga el índice cuando se reconstruye en disco
+        reranker = VectorReranker(tmp)
+        first = reranker._current_index()
+        assert first is not None and reranker._current_index() is first
+
+        writer = WhooshWriter(adapter)
+        writer.add_documents([Document(title="bus", content="bus driver road traffic", path="bus.txt")])
+        writer.commit()
+        VectorIndexBuilder(adapter, tmp, dims=4).build()
+        # Algunos sistemas de ficheros tienen resolución de segundos en el mtime
+        pointer = os.path.join(tmp, CURRENT)
+        stamp = os.path.getmtime(pointer) + 10
+        os.utime(pointer, (stamp, stamp))
+
+        reloaded = reranker._current_index()
+        assert reloaded is not first and "bus.txt" in reloaded.row_of
+        assert reloaded.doc_vectors.shape[0] == len(reloaded.row_of)
+
+
+@_with_fake_lemmatizer
+def test_rebuilds_publish_complete_versions():
+    adapter = build_index(VEHICLES + ANIMALS)
+
+    def no_stored_fields(self, *args, **kwargs):
+        raise AssertionError("se cargaron los campos almacenados")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        original = SegmentReader.iter_docs
+        # Las filas se asignan leyendo las columnas path/parent
+        SegmentReader.iter_docs = no_stored_fields  # type: ignore[method-assign]
+        try:
+            VectorIndexBuilder(adapter, tmp, dims=2).build()
+        finally:
+            SegmentReader.iter_docs = original  # type: ignore[method-assign]
+        first = VectorIndex(tmp)
+
+        for n in range(3):
+            writer = WhooshWriter(adapter)
+            writer.add_documents([Document(title="bus", content=f"bus driver road {n}", path=f"bus{n}.txt")])
+            writer.commit()
+            VectorIndexBuilder(adapter, tmp, dims=2).build()
+
+        # Cada versión es coherente: tantas filas como rutas en su vocabulario
+        current = VectorIndex(tmp)
+        assert current.version != first.version
+        assert current.doc_vectors.shape[0] == len(current.row_of) == 11
+        # Solo se conservan la versión publicada y la anterior
+        versions = sorted(name for name in os.listdir(tmp) if name != CURRENT)
+        assert len(versions) == 2 and current.version in versions
+
+
+@_with_fake_lemmatizer
+def test_similarity_query_path():
+    adapter = build_index(VEHICLES + ANIMALS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        VectorIndexBuilder(adapter, tmp, dims=2).build()
+        index = VectorIndex(tmp)
+
+        query_vector = index.embed(["car", "engine", "unknown"])
+        assert query_vector is not None and np.isclose(np.linalg.norm(query_vector), 1.0)
+        assert index.embed(["unknown"]) is None
+
+        scores = index.similarities(["d0.txt", "d1.txt", "d4.txt", "d5.txt", "missing.txt"], query_vector)
+        assert min(scores[:2]) > max(scores[2:4])
+        assert scores[4] == 0.0
+
+        # BM25 favorece por poco al documento de animales; el coseno lo corrige
+        results = [
+            SearchResult(title="d4", path="d4.txt", score=1.0),
+            SearchResult(title="d1", path="d1.txt", score=0.9),
+            SearchResult(title="d5", path="d5.txt", score=0.8),
+        ]
+        query = ExpandedQuery(original_text="car engine", expanded_terms=["car", "engine"])
+        reranked = VectorReranker(tmp, alpha=0.5, limit=2).rerank(query, results)
+
+        assert [r.path for r in reranked] == ["d1.txt", "d4.txt"]
+        assert reranked[0].score > reranked[1].score
+        # Con un solo candidato no hay nada que reordenar
+        assert VectorReranker(tmp).rerank(query, results[:1]) == results[:1]
+
+
+@_with_fake_lemmatizer
+def test_spanish_documents_get_vectors():
+    adapter = build_index(VEHICLES)
+    writer = WhooshWriter(adapter)
+    writer.add_documents([
+        Document(title=f"es{i}", content=text, path=f"es{i}.txt", metadata={"language": "spanish"})
+        for i, text in enumerate([
+            "camiones en la carretera con el conductor",
+            "el conductor del camion y la carretera",
+            "recetas de cocina con tomate y aceite",
+        ])
+    ])
+    writer.commit()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        VectorIndexBuilder(adapter, tmp, dims=4).build()
+        index = VectorIndex(tmp)
+
+        # Sus términos salen de `content_es` (en `content` solo se almacena el texto)
+        assert "conductor" in index.term_ids and "camion" in index.term_ids
+        rows = [index.row_of[f"es{i}.txt"] for i in range(2)]
+        assert np.allclose(np.linalg.norm(index.doc_vectors[rows], axis=1), 1.0, atol=1e-5)
+
+        # La consulta en español se analiza como su campo
+        results = [
+            SearchResult(title="es2", path="es2.txt", score=1.0),
+            SearchResult(title="es0", path="es0.txt", score=0.9),
+        ]
+        query = ExpandedQuery(original_text="conductor de camiones", expanded_terms=[], language="spanish")
+        reranked = VectorReranker(tmp, alpha=0.5).rerank(query, results)
+        assert [r.path for r in reranked] == ["es0.txt", "es2.txt"]
+
+
+if __name__ == "__main__":
+    test_randomized_svd_matches_dense()
+    test_build_and_reload_memory_mapped_index()
+    test_rebuilds_publish_complete_versions()
+    test_similarity_query_path()
+    test_spanish_documents_get_vectors()
+    print("✅ Vectores OK")